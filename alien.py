@@ -1,13 +1,19 @@
-import pygame
 import random
 
+import pygame
+
+import assets
+
 class Alien(pygame.sprite.Sprite):
     """
     Represents an alien in a space-invaders style game.
 
+    Aliens do not move themselves: the Formation they belong to positions them.
+
     Attributes:
         type (str): The type of alien.
         image (Surface): The image surface for the alien.
+        mask (Mask): The opaque pixels of the image, shared by every alien of the type.
         rect (Rect): The rectangle defining the position of the alien.
     """
 
@@ -22,23 +28,10 @@ class Alien(pygame.sprite.Sprite):
         """
         super().__init__()
         self.type = type
-        path = f"Graphics/alien_{type}.png"
-        self.image = pygame.image.load(path)
+        self.image = assets.image(f"alien_{type}")
+        self.mask = assets.mask(self.image)
         self.rect = self.image.get_rect(topleft = (x, y))
 
-    def update(self, direction):
-        """
-        Updates the alien's position based on the given direction.
-
-        Args:
-            direction (int): The direction to move the alien (positive for right, negative for left).
-        """
-        # Checks if the rect attribute has been set before moving the alien
-        if self.rect is not None:
-            self.rect.x += direction
-        else:
-            print('Error: self.rect is None')
-
 class MysteryShip(pygame.sprite.Sprite):
     """
     Represents a mysterious ship that appears randomly on the screen.
@@ -47,28 +40,33 @@ class MysteryShip(pygame.sprite.Sprite):
         screen_width (int): Width of the game screen.
         offset (int): Offset used in positioning and determining speed.
         image (Surface): The image surface for the mystery ship.
+        mask (Mask): The opaque pixels of the image.
         rect (Rect): The rectangle defining the position of the mystery ship.
         speed (int): The speed at which the ship moves.
     """
 
-    def __init__(self, screen_width, offset):
+    def __init__(self, screen_width, offset, rng=random, speed=3, y=90):
         """
         Initialize the mystery ship sprite.
 
         Args:
             screen_width (int): Width of the game screen.
             offset (int): Offset for positioning at start and determining speed and movement limits.
+            rng (random.Random): Random number generator used to pick the starting side.
+            speed (int): Pixels the ship moves per tick.
+            y (int): The y-coordinate of the top of the ship.
         """
         super().__init__()
         self.screen_width = screen_width
         self.offset = offset
-        self.image = pygame.image.load('Graphics/mystery.png')
+        self.image = assets.image('mystery')
+        self.mask = assets.mask(self.image)
 
         # Randomly decide the starting side of the mystery ship (left or right)
-        x = random.choice([self.offset/2, self.screen_width + self.offset - self.image.get_width()])
+        x = rng.choice([self.offset/2, self.screen_width + self.offset - self.image.get_width()])
         # Set speed direction based on starting side (positive for right start, negative for left start)
-        self.speed = 3 if x == self.offset/2 else -3
-        self.rect = self.image.get_rect(topleft = (x, 90))
+        self.speed = speed if x == self.offset/2 else -speed
+        self.rect = self.image.get_rect(topleft = (x, y))
 
     def update(self):
         """
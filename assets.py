@@ -0,0 +1,204 @@
+import os
+
+import pygame
+
+import audio
+
+# Directory holding the Graphics, Sounds and Font folders.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Images drawn by the game instead of loaded from a file, with their size and color.
+GENERATED = {
+    'laser': ((4, 15), (243, 216, 63)),
+}
+
+# Color marking the transparent pixels of the atlas, never used by an image.
+COLORKEY = (255, 0, 255)
+
+_atlas = None
+_regions = {}
+_images = {}
+_masks = {}
+_sounds = {}
+_fonts = {}
+
+
+def path(*parts):
+    """
+    Returns the absolute path of a game resource.
+
+    Args:
+        *parts (str): Path components relative to the game directory, e.g. 'Sounds', 'music.ogg'.
+
+    Returns:
+        str: The absolute path.
+    """
+    return os.path.join(ROOT, *parts)
+
+
+def _to_display_format(surface, alpha):
+    """Converts a surface to the pixel format of the display, when there is one."""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha() if alpha else surface.convert()
+    return surface
+
+
+def atlas():
+    """
+    Returns the texture atlas holding every image of the game.
+
+    The images of the Graphics folder and the GENERATED ones are packed side
+    by side, one pixel apart, into a single surface built the first time an
+    image is needed. An atlas built after the display mode is set is
+    converted to its pixel format, which makes blitting from it faster.
+    When every pixel is either opaque or fully transparent, as with the
+    game's images, transparency is kept as a colorkey instead of per-pixel
+    alpha: the same pixels are drawn, several times faster.
+
+    Returns:
+        pygame.Surface: The atlas. It is shared and must not be drawn on.
+    """
+    global _atlas
+    if _atlas is None:
+        sources = {}
+        for file_name in sorted(os.listdir(path('Graphics'))):
+            name, extension = os.path.splitext(file_name)
+            if extension == '.png':
+                sources[name] = pygame.image.load(path('Graphics', file_name))
+        for name, (size, color) in GENERATED.items():
+            sources[name] = pygame.Surface(size, pygame.SRCALPHA)
+            sources[name].fill(color)
+
+        width = sum(source.get_width() + 1 for source in sources.values())
+        height = max(source.get_height() for source in sources.values())
+        packed = pygame.Surface((width, height), pygame.SRCALPHA)
+        x = 0
+        for name, source in sources.items():
+            # Copy the pixels and their alpha as they are, rather than blending them onto the empty atlas.
+            _regions[name] = packed.blit(source, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += source.get_width() + 1
+
+        alpha = True
+        if pygame.mask.from_surface(packed, 0).count() == pygame.mask.from_surface(packed, 254).count():
+            keyed = pygame.Surface(packed.get_size())
+            keyed.fill(COLORKEY)
+            keyed.blit(packed, (0, 0))
+            keyed.set_colorkey(COLORKEY)
+            packed, alpha = keyed, False
+        _atlas = _to_display_format(packed, alpha)
+    return _atlas
+
+
+def region(name):
+    """
+    Returns the area of an image in the atlas.
+
+    Args:
+        name (str): Name of the image, e.g. 'alien_1' or 'laser'.
+
+    Returns:
+        pygame.Rect: The area of the image in the surface returned by atlas.
+    """
+    atlas()
+    return _regions[name]
+
+
+def image(name):
+    """
+    Returns the shared surface of an image from the Graphics folder or a GENERATED one.
+
+    Images are subsurfaces of the atlas: they share its pixels, so drawing one
+    is the same as drawing its region of the atlas.
+
+    Args:
+        name (str): File name without extension, e.g. 'alien_1', or a GENERATED name such as 'laser'.
+
+    Returns:
+        pygame.Surface: The image. It is shared and must not be drawn on.
+    """
+    surface = _images.get(name)
+    if surface is None:
+        surface = _images[name] = atlas().subsurface(region(name))
+    return surface
+
+
+def mask(surface):
+    """
+    Returns the collision mask of a shared image.
+
+    Masks are computed once per asset rather than once per sprite, so every
+    alien of a type shares the same mask.
+
+    Args:
+        surface (pygame.Surface): A surface returned by image.
+
+    Returns:
+        pygame.mask.Mask: One bit per opaque pixel. It is shared and must not be modified.
+    """
+    shape = _masks.get(surface)
+    if shape is None:
+        shape = _masks[surface] = pygame.mask.from_surface(surface)
+    return shape
+
+
+def sound(name):
+    """
+    Returns the shared sound effect of a file from the Sounds folder.
+
+    Args:
+        name (str): File name without extension, e.g. 'laser'.
+
+    Returns:
+        pygame.mixer.Sound: The sound.
+    """
+    effect = _sounds.get(name)
+    if effect is None:
+        effect = _sounds[name] = pygame.mixer.Sound(path('Sounds', f'{name}.ogg'))
+    return effect
+
+
+def font(name, size):
+    """
+    Returns the shared font of a file from the Font folder.
+
+    Args:
+        name (str): File name without extension, e.g. 'monogram'.
+        size (int): Font size.
+
+    Returns:
+        pygame.font.Font: The font.
+    """
+    key = (name, size)
+    loaded = _fonts.get(key)
+    if loaded is None:
+        loaded = _fonts[key] = pygame.font.Font(path('Font', f'{name}.ttf'), size)
+    return loaded
+
+
+def preload(sounds=True):
+    """
+    Builds the atlas, and loads the sound effects when audio is enabled, ahead of time.
+
+    Call it after setting the display mode so the atlas is converted to the
+    display format before any sprite uses it.
+
+    Args:
+        sounds (bool): Whether to load the sound effects too.
+    """
+    atlas()
+    for name in _regions:
+        image(name)
+    if sounds:
+        for name in audio.EFFECTS:
+            sound(name)
+
+
+def clear():
+    """Forgets every loaded asset, e.g. after the display mode changed."""
+    global _atlas
+    _atlas = None
+    _regions.clear()
+    _images.clear()
+    _masks.clear()
+    _sounds.clear()
+    _fonts.clear()
@@ -0,0 +1,145 @@
+import time
+from collections import Counter, namedtuple
+
+import pygame
+
+import assets
+
+Effect = namedtuple('Effect', 'category interval')
+Effect.__doc__ = """
+How a sound effect is played.
+
+Attributes:
+    category (str): The channels the effect is played on, a key of CHANNELS.
+    interval (float): Seconds during which further requests are coalesced into the voice already started.
+"""
+
+# Sound effects of the Sounds folder.
+EFFECTS = {
+    'laser': Effect('player', interval=0.05),
+    'explosion': Effect('explosions', interval=0.06),
+}
+
+# Mixer channels reserved for each category of effects.
+CHANNELS = {
+    'player': 2,
+    'explosions': 3,
+}
+
+
+class VoiceManager:
+    """
+    Plays the sound effects of the game on a fixed budget of mixer channels.
+
+    Every category of effects owns a few reserved channels, so a burst of
+    explosions never cuts off the player's laser, and the number of voices
+    mixed at once is bounded however busy the game gets. Requests for an
+    effect that arrive within its interval are coalesced into the voice
+    already started, e.g. several aliens hit on the same frame make a single
+    explosion. When every channel of a category is busy, its oldest voice is
+    stolen.
+
+    The effects are loaded once, when the manager is created.
+
+    Attributes:
+        effects (dict): The Effect of each sound, by name.
+        stats (collections.Counter): Requests 'played', 'coalesced' and 'stolen' (played on a stolen
+            channel).
+    """
+
+    def __init__(self, effects=EFFECTS, channels=CHANNELS, clock=time.monotonic):
+        """
+        Reserve the channels and load the effects, initializing the mixer if needed.
+
+        Args:
+            effects (dict): The Effect of each sound, by file name without extension.
+            channels (dict): Number of channels reserved for each category.
+            clock (callable): Returns the current time in seconds.
+        """
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self.effects = effects
+        self.clock = clock
+        self.stats = Counter()
+        total = sum(channels.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        # Reserved channels are never picked by Sound.play, only handed out here.
+        pygame.mixer.set_reserved(total)
+        self._channels = {}
+        self._voices = {}
+        index = 0
+        for category, count in channels.items():
+            self._channels[category] = [pygame.mixer.Channel(index + offset) for offset in range(count)]
+            index += count
+        self._sounds = {name: assets.sound(name) for name in effects}
+        self._last = dict.fromkeys(effects, float('-inf'))
+
+    def play(self, name):
+        """
+        Requests a sound effect.
+
+        Args:
+            name (str): Name of the effect, a key of effects.
+
+        Returns:
+            bool: Whether a voice was started for the request.
+        """
+        effect = self.effects[name]
+        now = self.clock()
+        if now - self._last[name] < effect.interval:
+            self.stats['coalesced'] += 1
+            return False
+        channels = self._channels[effect.category]
+        channel = next((channel for channel in channels if not channel.get_busy()), None)
+        if channel is None:
+            channel = min(channels, key=lambda channel: self._voices.get(channel, 0.0))
+            self.stats['stolen'] += 1
+        channel.play(self._sounds[name])
+        self._voices[channel] = now
+        self._last[name] = now
+        self.stats['played'] += 1
+        return True
+
+    def play_music(self, path, loops=-1):
+        """
+        Streams a music file, looping forever by default.
+
+        Args:
+            path (str): The music file.
+            loops (int): Number of repeats after the first play, -1 to loop forever.
+        """
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play(loops)
+
+    def stop(self):
+        """Stops every voice and the music."""
+        for channels in self._channels.values():
+            for channel in channels:
+                channel.stop()
+        self._voices.clear()
+        pygame.mixer.music.stop()
+
+
+class NullVoiceManager:
+    """
+    Stand-in for VoiceManager used when audio is disabled.
+
+    It never touches pygame.mixer, so headless runs need no audio device.
+
+    Attributes:
+        stats (collections.Counter): Always empty.
+    """
+
+    def __init__(self):
+        """Create a manager that plays nothing."""
+        self.stats = Counter()
+
+    def play(self, name):
+        """Ignores the request to play an effect."""
+        return False
+
+    def play_music(self, path, loops=-1):
+        """Ignores the request to play music."""
+
+    def stop(self):
+        """Nothing to stop."""
@@ -0,0 +1,539 @@
+import numpy as np
+
+from config import DEFAULT_CONFIG
+from game import MYSTERY_SHIP_DELAY, Game
+from waves import WAVES, Wave
+
+# Index of each control in the actions array passed to BatchSimulation.step.
+LEFT, RIGHT, FIRE = 0, 1, 2
+
+
+def _mask_table(mask, shape=None):
+    """
+    Returns the summed-area table of a sprite mask.
+
+    Entry [y, x] counts the set pixels above and left of pixel (x, y), so the
+    pixels set inside any rectangle are counted with four lookups.
+
+    Args:
+        mask (pygame.mask.Mask): The mask.
+        shape (tuple): Height and width of the mask area to cover, at least its size.
+            Entries past the mask repeat its edge.
+
+    Returns:
+        numpy.ndarray: The table, shaped (height + 1, width + 1).
+    """
+    width, height = mask.get_size()
+    bits = np.array([[mask.get_at((x, y)) for x in range(width)] for y in range(height)], np.int32)
+    table = np.zeros((height + 1, width + 1), np.int32)
+    table[1:, 1:] = bits.cumsum(axis=0).cumsum(axis=1)
+    if shape is not None:
+        table = np.pad(table, ((0, shape[0] - height), (0, shape[1] - width)), mode='edge')
+    return table
+
+
+def _covered(table, left, top, right, bottom, layer=None):
+    """
+    Tells whether a mask has set pixels inside rectangles given relative to its top-left corner.
+
+    Args:
+        table (numpy.ndarray): A table from _mask_table, or a stack of them.
+        left, top, right, bottom (numpy.ndarray): Edges of the rectangles, broadcast together.
+        layer (numpy.ndarray): Index of the table of each rectangle in a stack.
+
+    Returns:
+        numpy.ndarray: Whether each rectangle holds a set pixel.
+    """
+    height, width = table.shape[-2] - 1, table.shape[-1] - 1
+    left, right = np.clip(left, 0, width), np.clip(right, 0, width)
+    top, bottom = np.clip(top, 0, height), np.clip(bottom, 0, height)
+
+    def lookup(y, x):
+        return table[y, x] if layer is None else table[layer, y, x]
+
+    return lookup(bottom, right) - lookup(top, right) - lookup(bottom, left) + lookup(top, left) > 0
+
+
+def _contact_table(fixed, moving, shape):
+    """
+    Tells, for every offset of a mask against another, whether their set pixels overlap.
+
+    Args:
+        fixed (pygame.mask.Mask): The mask the offsets are measured from.
+        moving (pygame.mask.Mask): The mask placed at each offset.
+        shape (tuple): Largest height and width of the moving masks sharing the layout.
+
+    Returns:
+        numpy.ndarray: Entry [dy + height - 1, dx + width - 1] is True when moving, with its
+        top-left corner at (dx, dy) from the one of fixed, overlaps it.
+    """
+    height, width = shape
+    fixed_w, fixed_h = fixed.get_size()
+    moving_w, moving_h = moving.get_size()
+    table = np.zeros((height + fixed_h - 1, width + fixed_w - 1), bool)
+    for dy in range(1 - moving_h, fixed_h):
+        for dx in range(1 - moving_w, fixed_w):
+            table[dy + height - 1, dx + width - 1] = fixed.overlap(moving, (dx, dy)) is not None
+    return table
+
+
+class BatchSimulation:
+    """
+    Advances many independent games in lockstep with NumPy array operations.
+
+    The rules are those of Game and its sprites, but the state of every game is
+    kept in arrays whose first axis is the game index: spaceship position and
+    laser cooldown, formation origin, direction and liveness, laser slots,
+    mystery ship and bunker cells. Every phase of a frame (movement, alien fire,
+    collisions, scoring and wave changes) is computed for all games at once.
+
+    Geometry is read from a template Game, so sizes and positions always match
+    the scalar game. Collisions are pixel accurate like the scalar game's: the
+    sprite masks are turned into summed-area tables, and a table of contacts
+    by offset is used for aliens reaching the spaceship. Random decisions use a seeded NumPy generator: for a given
+    seed the batch is reproducible and its outcome distribution matches the
+    scalar Simulation, although individual games do not replay the same random
+    sequence as a Simulation with the same seed.
+
+    Attributes:
+        n (int): Number of games in the batch.
+        seed (int): Seed of the random number generator.
+        rng (numpy.random.Generator): The random number generator.
+        tick (int): Number of steps since the last reset.
+        score (numpy.ndarray): Score of each game.
+        lives (numpy.ndarray): Remaining lives of each game.
+        wave (numpy.ndarray): Current wave of each game, starting at 1.
+        run (numpy.ndarray): Whether each game is still running.
+        alive (numpy.ndarray): Liveness of each alien, shaped (n, rows, columns).
+        cells (numpy.ndarray): Bunker cells, shaped (n, bunkers, cell rows, cell columns).
+    """
+
+    def __init__(self, n, seed=None, config=DEFAULT_CONFIG,
+                 player_laser_slots=16, alien_laser_slots=16, waves=WAVES):
+        """
+        Create a batch of games.
+
+        Args:
+            n (int): Number of games to simulate.
+            seed (int): Seed of the random number generator.
+            config (Config): The layout and tuning of the games, see the config module.
+            player_laser_slots (int): Maximum number of player lasers per game.
+            alien_laser_slots (int): Maximum number of alien lasers per game.
+            waves (tuple): The Wave definitions, see the waves module.
+        """
+        self.n = n
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2**32)
+        self.rng = np.random.default_rng(self.seed)
+        self.screen_width = config.screen_width
+        self.screen_height = config.screen_height
+        self.offset = config.offset
+        self.laser_speed = config.laser_speed
+        self.alien_laser_speed = config.alien_laser_speed
+        self.mystery_ship_speed = config.mystery_ship_speed
+        # One array per field of the wave definitions, indexed by wave number minus one.
+        self._waves = {field: np.array(values) for field, values in zip(Wave._fields, zip(*waves))}
+        self._read_geometry(Game(config, audio=False, highscore_file=None))
+
+        self.ship_x = np.zeros(n, np.int32)
+        self.laser_ready = np.zeros(n, bool)
+        self.laser_tick = np.zeros(n, np.int64)
+        self.origin_x = np.zeros(n, np.int32)
+        self.origin_y = np.zeros(n, np.int32)
+        self.direction = np.zeros(n, np.int32)
+        self.wave = np.zeros(n, np.int32)
+        self.next_alien_shot = np.zeros(n, np.int64)
+        self.alive = np.zeros((n, self.rows, self.columns), bool)
+        self.player_lasers = _LaserSlots(n, player_laser_slots)
+        self.alien_lasers = _LaserSlots(n, alien_laser_slots)
+        self.mystery_active = np.zeros(n, bool)
+        self.mystery_x = np.zeros(n, np.int32)
+        self.mystery_speed = np.zeros(n, np.int32)
+        self.next_mystery_ship = np.zeros(n)
+        self.cells = np.zeros((n,) + self.bunker_cells.shape, bool)
+        self.score = np.zeros(n, np.int64)
+        self.lives = np.zeros(n, np.int32)
+        self.run = np.zeros(n, bool)
+        self.reset()
+
+    def _read_geometry(self, game):
+        """Copies sizes and start positions from a scalar game."""
+        formation = game.formation
+        self.rows, self.columns, self.spacing = formation.rows, formation.columns, formation.spacing
+        self.start = formation.start
+        first_column = [row[0] for row in formation.aliens]
+        self.alien_w = np.array([alien.rect.width for alien in first_column])[:, None]
+        self.alien_h = np.array([alien.rect.height for alien in first_column])[:, None]
+        self.alien_points = np.array([alien.type * 100 for alien in first_column])[:, None]
+        # Opaque pixels of the alien of every row, padded to the largest alien.
+        shape = (int(self.alien_h.max()), int(self.alien_w.max()))
+        self.alien_masks = np.stack([_mask_table(alien.mask, shape) for alien in first_column])
+        self.row_index = np.arange(self.rows)[:, None]
+        self.slot_x = np.arange(self.columns) * self.spacing
+        self.slot_y = np.arange(self.rows)[:, None] * self.spacing
+
+        spaceship = game.spaceship_group.sprite
+        self.ship_start_x = spaceship.rect.x
+        self.ship_y = spaceship.rect.y
+        self.ship_w, self.ship_h = spaceship.rect.size
+        self.ship_mask = _mask_table(spaceship.mask)
+        # Whether the alien of every row touches the spaceship, by offset from it.
+        self.ship_contact = np.stack([_contact_table(spaceship.mask, alien.mask, shape) for alien in first_column])
+        self.contact_origin = (shape[0] - 1, shape[1] - 1)
+        self.ship_speed = spaceship.speed
+        self.laser_delay = spaceship.laser_delay
+        self.lives_start = game.lives
+
+        # Read from the configuration rather than the first bunker, as a game may have none.
+        config = game.config
+        self.bunker_x = np.array([obstacle.rect.x for obstacle in game.obstacles], int)
+        self.bunker_y = game.screen_height - config.bunker_height
+        self.bunker_rows, self.bunker_columns = len(config.bunker_grid), len(config.bunker_grid[0])
+        self.bunker_cells = np.array([
+            [[obstacle.cells.get_at((column, row)) for column in range(self.bunker_columns)]
+             for row in range(self.bunker_rows)]
+            for obstacle in game.obstacles], bool).reshape(-1, self.bunker_rows, self.bunker_columns)
+        self.block_size = config.block_size
+
+        game.create_mystery_ship()
+        self.mystery_w, self.mystery_h = game.mystery_ship_group.sprite.rect.size
+        self.mystery_mask = _mask_table(game.mystery_ship_group.sprite.mask)
+        self.mystery_y = game.mystery_ship_group.sprite.rect.y
+
+    def reset(self):
+        """Restart every game of the batch from the initial state."""
+        self.rng = np.random.default_rng(self.seed)
+        self.tick = 0
+        self.ship_x[:] = self.ship_start_x
+        self.laser_ready[:] = True
+        self.laser_tick[:] = 0
+        self.wave[:] = 1
+        self.origin_x[:] = self.start[0]
+        self.origin_y[:] = self._waves['start_y'][0]
+        self.direction[:] = 1
+        self.alive[:] = True
+        self.next_alien_shot[:] = self.tick + self._wave_value('shot_interval', 'min_shot_interval')
+        self.player_lasers.clear()
+        self.alien_lasers.clear()
+        self.mystery_active[:] = False
+        self.next_mystery_ship[:] = self._mystery_delay()
+        self.cells[:] = self.bunker_cells
+        self.score[:] = 0
+        self.lives[:] = self.lives_start
+        self.run[:] = True
+
+    def _wave_value(self, start, limit):
+        """
+        Scales a field of the wave definitions for every game, like waves.scale.
+
+        Args:
+            start (str): Field holding the value for the full formation.
+            limit (str): Field holding the value reached by the last alien.
+
+        Returns:
+            numpy.ndarray: The value of each game.
+        """
+        index = np.minimum(self.wave, len(self._waves[start])) - 1
+        start, limit = self._waves[start][index], self._waves[limit][index]
+        killed = 1 - self.alive.sum(axis=(1, 2)) / (self.rows * self.columns)
+        steps = np.abs(limit - start)
+        step = np.minimum(((steps + 1) * killed).astype(np.int64), steps)
+        return np.where(limit >= start, start + step, start - step)
+
+    def _mystery_delay(self):
+        """Draws the number of ticks before the next mystery ship of every game."""
+        low, high = MYSTERY_SHIP_DELAY
+        return self.rng.integers(low, high + 1, self.n)
+
+    def step(self, actions):
+        """
+        Advance every game by one frame.
+
+        Timed events are handled in ticks, in the order the scalar game's
+        scheduler runs them, before the games are updated.
+
+        Args:
+            actions (numpy.ndarray): Boolean array shaped (n, 3) holding the left, right
+                and fire controls of each game.
+
+        Returns:
+            numpy.ndarray: Whether each game is still running.
+        """
+        actions = np.asarray(actions, bool)
+        self.tick += 1
+
+        due = self.run & (self.tick >= self.next_alien_shot)
+        if due.any():
+            self.alien_shoot_laser(due)
+            interval = self._wave_value('shot_interval', 'min_shot_interval')
+            self.next_alien_shot[due] = self.tick + interval[due]
+        self._update_mystery_timer()
+        self.laser_ready |= self.run & (self.tick - self.laser_tick >= self.laser_delay)
+
+        run = self.run.copy()
+        self._update_spaceship(actions, run)
+        self._move_aliens(run)
+        self.alien_lasers.move(-self.alien_laser_speed, self.screen_height, run)
+        self._update_mystery_ship(run)
+        self._check_for_collisions(run)
+        self._next_wave()
+        return self.run
+
+    def alien_shoot_laser(self, games=None):
+        """
+        Makes a random live alien of every running game fire a laser.
+
+        Args:
+            games (numpy.ndarray): Boolean mask of the games that fire, every game when omitted.
+        """
+        count = self.alive.sum(axis=(1, 2))
+        firing = self.run & (count > 0)
+        if games is not None:
+            firing &= games
+        games = np.flatnonzero(firing)
+        if not games.size:
+            return
+        # Pick the k-th live alien in row-major order, like choosing from the sprite group.
+        k = (self.rng.random(games.size) * count[games]).astype(np.int64)
+        flat = self.alive[games].reshape(games.size, -1)
+        slot = np.argmax(np.cumsum(flat, axis=1) > k[:, None], axis=1)
+        row, column = np.divmod(slot, self.columns)
+        w, h = self.alien_w[row, 0], self.alien_h[row, 0]
+        center_x = self.origin_x[games] + column * self.spacing + w // 2
+        center_y = self.origin_y[games] + row * self.spacing + h // 2
+        self.alien_lasers.spawn(games, center_x, center_y)
+
+    def _next_wave(self):
+        """Starts the next wave of the running games whose formation was cleared."""
+        cleared = self.run & ~self.alive.any(axis=(1, 2))
+        if not cleared.any():
+            return
+        self.wave[cleared] += 1
+        index = np.minimum(self.wave[cleared], len(self._waves['start_y'])) - 1
+        self.alive[cleared] = True
+        self.origin_x[cleared] = self.start[0]
+        self.origin_y[cleared] = self._waves['start_y'][index]
+        self.direction[cleared] = 1
+        self.alien_lasers.active[cleared] = False
+        self.cells[cleared] = self.bunker_cells
+
+    def _update_mystery_timer(self):
+        """Spawns the mystery ships that are due and schedules the next ones."""
+        due = self.tick >= self.next_mystery_ship
+        if not due.any():
+            return
+        self.next_mystery_ship[due] = self.tick + self._mystery_delay()[due]
+        spawn = due & self.run
+        left_side = self.rng.random(self.n) < 0.5
+        start_right = self.screen_width + self.offset - self.mystery_w
+        self.mystery_active[spawn] = True
+        self.mystery_x[spawn] = np.where(left_side, int(self.offset / 2 + 0.5), start_right)[spawn]
+        speed = self.mystery_ship_speed
+        self.mystery_speed[spawn] = np.where(left_side, speed, -speed)[spawn]
+
+    def _update_spaceship(self, actions, run):
+        """Moves the spaceships and fires their lasers."""
+        move = (actions[:, RIGHT].astype(np.int32) - actions[:, LEFT]) * self.ship_speed
+        self.ship_x += np.where(run, move, 0)
+
+        fire = run & actions[:, FIRE] & self.laser_ready
+        games = np.flatnonzero(fire)
+        if games.size:
+            self.laser_ready[games] = False
+            self.player_lasers.spawn(games, self.ship_x[games] + self.ship_w // 2,
+                                     np.full(games.size, self.ship_y + self.ship_h // 2))
+            self.laser_tick[games] = self.tick
+
+        self.ship_x[:] = np.clip(self.ship_x, self.offset, self.screen_width - self.ship_w)
+        self.player_lasers.move(self.laser_speed, self.screen_height, run)
+
+    def _move_aliens(self, run):
+        """Moves every formation and turns it around at the screen edges."""
+        moving = run & self.alive.any(axis=(1, 2))
+        speed = self._wave_value('speed', 'max_speed')
+        self.origin_x += np.where(moving, self.direction * speed, 0).astype(np.int32)
+
+        column_w = (self.alive * self.alien_w).max(axis=1)
+        live = column_w > 0
+        left = self.origin_x + np.argmax(live, axis=1) * self.spacing
+        right = self.origin_x + np.where(live, self.slot_x + column_w, 0).max(axis=1)
+
+        hit_right = moving & (right >= self.screen_width + self.offset)
+        hit_left = moving & ~hit_right & (left <= self.offset / 2)
+        self.direction[hit_right] = -1
+        self.direction[hit_left] = 1
+        self.origin_y += np.where(hit_right | hit_left, 2, 0)
+
+    def _update_mystery_ship(self, run):
+        """Moves the mystery ships and removes the ones leaving the screen."""
+        moving = run & self.mystery_active
+        self.mystery_x += np.where(moving, self.mystery_speed, 0)
+        gone = ((self.mystery_x + self.mystery_w > self.screen_width + self.offset / 2)
+                | (self.mystery_x < self.offset / 2))
+        self.mystery_active &= ~(moving & gone)
+
+    def _alien_rects(self):
+        """Returns the left, top, right and bottom edges of every alien slot, shaped (n, rows, columns)."""
+        shape = self.alive.shape
+        left = self.origin_x[:, None, None] + self.slot_x
+        top = self.origin_y[:, None, None] + self.slot_y
+        return tuple(np.broadcast_to(edge, shape)
+                     for edge in (left, top, left + self.alien_w, top + self.alien_h))
+
+    def _erode_bunkers(self, games, left, top, right, bottom, mask=None):
+        """
+        Erodes the bunker cells touched by one rectangle per game.
+
+        Args:
+            games (numpy.ndarray): Indices of the games to test, without duplicates.
+            left, top, right, bottom (numpy.ndarray): Edges of the rectangle of each game.
+            mask (numpy.ndarray): Summed-area table of the sprite in the rectangles, whose
+                opaque pixels erode the cells they touch. The whole rectangle erodes when omitted.
+
+        Returns:
+            numpy.ndarray: Whether any cell was hit, for each of the given games.
+        """
+        hits = np.zeros(games.size, bool)
+        block_size = self.block_size
+        width = self.bunker_columns * block_size
+        height = self.bunker_rows * block_size
+        columns = np.arange(self.bunker_columns)
+        rows = np.arange(self.bunker_rows)
+        for bunker, bunker_x in enumerate(self.bunker_x):
+            touching = np.flatnonzero(
+                (bunker_x < right) & (left < bunker_x + width)
+                & (self.bunker_y < bottom) & (top < self.bunker_y + height))
+            if not touching.size:
+                continue
+            first_column = (left[touching] - bunker_x) // block_size
+            last_column = (right[touching] - 1 - bunker_x) // block_size
+            first_row = (top[touching] - self.bunker_y) // block_size
+            last_row = (bottom[touching] - 1 - self.bunker_y) // block_size
+            if mask is None:
+                region = (
+                    ((rows >= first_row[:, None]) & (rows <= last_row[:, None]))[:, :, None]
+                    & ((columns >= first_column[:, None]) & (columns <= last_column[:, None]))[:, None, :])
+            else:
+                # Cell edges relative to the sprite of each game.
+                cell_left = (bunker_x + columns * block_size - left[touching][:, None])[:, None, :]
+                cell_top = (self.bunker_y + rows * block_size - top[touching][:, None])[:, :, None]
+                region = _covered(mask, cell_left, cell_top, cell_left + block_size, cell_top + block_size)
+            cells = self.cells[games[touching], bunker]
+            hits[touching] |= (cells & region).any(axis=(1, 2))
+            self.cells[games[touching], bunker] = cells & ~region
+        return hits
+
+    def _check_for_collisions(self, run):
+        """Resolves every collision of the frame, in the same order as Game.check_for_collisions."""
+        alien_left, alien_top, alien_right, alien_bottom = self._alien_rects()
+        lasers = self.player_lasers
+        for slot in range(lasers.slots):
+            games = np.flatnonzero(run & lasers.active[:, slot])
+            if not games.size:
+                continue
+            left, top = lasers.x[games, slot], lasers.y[games, slot]
+            right, bottom = left + _LaserSlots.WIDTH, top + _LaserSlots.HEIGHT
+
+            # Lasers are opaque rectangles: they hit an alien when its mask has a pixel under them.
+            hit = (self.alive[games]
+                   & (alien_left[games] < right[:, None, None])
+                   & (left[:, None, None] < alien_right[games])
+                   & (alien_top[games] < bottom[:, None, None])
+                   & (top[:, None, None] < alien_bottom[games]))
+            hit &= _covered(self.alien_masks,
+                            left[:, None, None] - alien_left[games], top[:, None, None] - alien_top[games],
+                            right[:, None, None] - alien_left[games], bottom[:, None, None] - alien_top[games],
+                            self.row_index)
+            self.alive[games] &= ~hit
+            self.score[games] += (hit * self.alien_points).sum(axis=(1, 2))
+            killed = hit.any(axis=(1, 2))
+
+            mystery_x = self.mystery_x[games]
+            mystery_hit = (self.mystery_active[games]
+                           & (mystery_x < right) & (left < mystery_x + self.mystery_w)
+                           & (self.mystery_y < bottom) & (top < self.mystery_y + self.mystery_h)
+                           & _covered(self.mystery_mask, left - mystery_x, top - self.mystery_y,
+                                      right - mystery_x, bottom - self.mystery_y))
+            self.mystery_active[games[mystery_hit]] = False
+            self.score[games[mystery_hit]] += 500
+
+            blocked = self._erode_bunkers(games, left, top, right, bottom)
+            lasers.active[games[killed | mystery_hit | blocked], slot] = False
+
+        lasers = self.alien_lasers
+        for slot in range(lasers.slots):
+            games = np.flatnonzero(run & lasers.active[:, slot])
+            if not games.size:
+                continue
+            left, top = lasers.x[games, slot], lasers.y[games, slot]
+            right, bottom = left + _LaserSlots.WIDTH, top + _LaserSlots.HEIGHT
+
+            ship_x = self.ship_x[games]
+            ship_hit = ((ship_x < right) & (left < ship_x + self.ship_w)
+                        & (self.ship_y < bottom) & (top < self.ship_y + self.ship_h)
+                        & _covered(self.ship_mask, left - ship_x, top - self.ship_y,
+                                   right - ship_x, bottom - self.ship_y))
+            self.lives[games[ship_hit]] -= 1
+            self.run[games[ship_hit & (self.lives[games] == 0)]] = False
+
+            blocked = self._erode_bunkers(games, left, top, right, bottom)
+            lasers.active[games[ship_hit | blocked], slot] = False
+
+        # Aliens only reach the bunkers and the spaceship late in a game, so
+        # only games whose formation is low enough are checked slot by slot.
+        low = np.flatnonzero(
+            run & ((self.alive & (alien_bottom > self.bunker_y)).any(axis=(1, 2))))
+        for row in range(self.rows):
+            for column in range(self.columns):
+                games = low[self.alive[low, row, column]]
+                if not games.size:
+                    continue
+                left = alien_left[games, row, column]
+                top = alien_top[games, row, column]
+                right = alien_right[games, row, column]
+                bottom = alien_bottom[games, row, column]
+                self._erode_bunkers(games, left, top, right, bottom, self.alien_masks[row])
+                ship_x = self.ship_x[games]
+                touching = ((ship_x < right) & (left < ship_x + self.ship_w)
+                            & (self.ship_y < bottom) & (top < self.ship_y + self.ship_h))
+                origin_y, origin_x = self.contact_origin
+                touching[touching] = self.ship_contact[
+                    row, top[touching] - self.ship_y + origin_y, left[touching] - ship_x[touching] + origin_x]
+                self.run[games[touching]] = False
+
+
+class _LaserSlots:
+    """Fixed-capacity storage for the lasers of every game of a batch."""
+
+    WIDTH = 4
+    HEIGHT = 15
+
+    def __init__(self, n, slots):
+        self.slots = slots
+        self.x = np.zeros((n, slots), np.int32)
+        self.y = np.zeros((n, slots), np.int32)
+        self.active = np.zeros((n, slots), bool)
+
+    def clear(self):
+        """Removes every laser."""
+        self.active[:] = False
+
+    def spawn(self, games, center_x, center_y):
+        """
+        Adds one laser to each of the given games, dropping it when the game has no free slot.
+
+        Args:
+            games (numpy.ndarray): Indices of the games, without duplicates.
+            center_x, center_y (numpy.ndarray): Center of each new laser.
+        """
+        free = ~self.active[games]
+        slot = np.argmax(free, axis=1)
+        has_room = free[np.arange(games.size), slot]
+        games, slot = games[has_room], slot[has_room]
+        self.x[games, slot] = center_x[has_room] - self.WIDTH // 2
+        self.y[games, slot] = center_y[has_room] - self.HEIGHT // 2
+        self.active[games, slot] = True
+
+    def move(self, speed, screen_height, run):
+        """Moves the lasers of the running games and removes the ones leaving the screen."""
+        self.y -= np.where(run[:, None] & self.active, speed, 0).astype(np.int32)
+        self.active &= ~((self.y > screen_height + 15) | (self.y < 0))
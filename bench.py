@@ -0,0 +1,307 @@
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from config import DEFAULT_CONFIG  # noqa: E402
+from game import Game  # noqa: E402
+from obstacle import Obstacle  # noqa: E402
+from renderer import Renderer  # noqa: E402
+
+SCREEN_WIDTH = DEFAULT_CONFIG.screen_width
+SCREEN_HEIGHT = DEFAULT_CONFIG.screen_height
+OFFSET = DEFAULT_CONFIG.offset
+
+# Results stored with the sources, refresh it with --output when a slowdown is intended.
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+
+def create_game(seed=0, settings=DEFAULT_CONFIG):
+    """Creates a headless game with a fixed seed."""
+    return Game(settings, rng=random.Random(seed), audio=False, highscore_file=None, quiet=True)
+
+
+def add_lasers(game, count, seed=0):
+    """Adds player and alien lasers spread over the play area, half of each."""
+    rng = random.Random(seed)
+    for index in range(count):
+        position = (rng.randint(OFFSET, SCREEN_WIDTH), rng.randint(100, SCREEN_HEIGHT - 20))
+        if index % 2:
+            game.alien_lasers_group.add(game.laser_pool.acquire(position, -6, SCREEN_HEIGHT))
+        else:
+            game.spaceship_group.sprite.lasers_group.add(game.laser_pool.acquire(position, 5, SCREEN_HEIGHT))
+
+
+def replace_lasers(game, count):
+    """Puts back the lasers of add_lasers, releasing the ones still in flight."""
+    game.laser_pool.release_group(game.spaceship_group.sprite.lasers_group)
+    game.laser_pool.release_group(game.alien_lasers_group)
+    add_lasers(game, count)
+
+
+def bench_move_aliens(columns):
+    """Moves a formation of 5 rows of the given number of columns for 100 frames."""
+    # Keep wide formations on screen by giving them a wider playfield.
+    game = create_game(settings=DEFAULT_CONFIG._replace(
+        formation_columns=columns, screen_width=max(SCREEN_WIDTH, columns * 55 + 150)))
+
+    def run():
+        for _ in range(100):
+            game.move_aliens()
+        game.formation.sync()
+    return None, run
+
+
+def bench_collisions(lasers):
+    """Resolves the collisions of the given number of lasers against intact bunkers and formation."""
+    game = create_game()
+
+    def prepare():
+        replace_lasers(game, lasers)
+        game.formation.reset()
+        for obstacle in game.obstacles:
+            obstacle.reset()
+    return prepare, game.check_for_collisions
+
+
+def bench_obstacles(count):
+    """Builds the given number of bunkers."""
+    def run():
+        for index in range(count):
+            Obstacle(index * 80, 600)
+    return None, run
+
+
+def bench_reset(lasers):
+    """Resets a game with a third of the aliens killed and the given number of lasers in flight."""
+    game = create_game()
+
+    def prepare():
+        add_lasers(game, lasers)
+        for alien in game.aliens_group.sprites()[::3]:
+            alien.kill()
+    return prepare, game.reset
+
+
+def bench_render(lasers):
+    """Draws a full frame with the given number of lasers into an offscreen surface."""
+    game = create_game()
+    add_lasers(game, lasers)
+    renderer = Renderer(pygame.Surface(pygame.display.get_surface().get_size()), OFFSET)
+
+    def run():
+        renderer.invalidate()
+        renderer.draw(game)
+    return None, run
+
+
+def bench_render_incremental(lasers):
+    """Draws a frame after one step of the game, redrawing only what changed."""
+    game = create_game()
+    renderer = Renderer(pygame.Surface(pygame.display.get_surface().get_size()), OFFSET)
+    renderer.draw(game)
+
+    def prepare():
+        # Lasers leave the screen after enough steps, keep the given number in flight.
+        if len(game.alien_lasers_group) + len(game.spaceship_group.sprite.lasers_group) < lasers:
+            replace_lasers(game, lasers)
+
+    def run():
+        game.move_aliens()
+        game.alien_lasers_group.update()
+        renderer.draw(game)
+    return prepare, run
+
+
+def bench_reference(iterations):
+    """Fixed rect tests and blits, like the work of the game, to gauge how fast the machine runs."""
+    rect = pygame.Rect(0, 0, 10, 10)
+    others = [pygame.Rect(index * 12, 0, 10, 10) for index in range(20)]
+    target = pygame.Surface((240, 240))
+    image = pygame.Surface((40, 40), pygame.SRCALPHA)
+    image.fill((200, 80, 40, 128))
+
+    def run():
+        hits = 0
+        for _ in range(iterations):
+            rect.x = (rect.x + 7) % 240
+            for other in others:
+                if rect.colliderect(other):
+                    hits += 1
+            target.blit(image, rect.topleft)
+        return hits
+    return None, run
+
+
+# Measured in every run, compare scales the baseline by how fast it ran.
+REFERENCE = 'reference'
+
+# Each scenario maps to its setup function and the entity counts it is measured with.
+# A setup function builds fresh state and returns a function that puts the state back
+# before every timed call, or None when calls can follow each other, and the callable that is timed.
+SCENARIOS = {
+    'move_aliens': (bench_move_aliens, (11, 22, 44)),
+    'collisions': (bench_collisions, (0, 12, 48)),
+    'obstacles': (bench_obstacles, (4, 16)),
+    'reset': (bench_reset, (0, 12, 48)),
+    'render_full': (bench_render, (0, 48)),
+    'render_incremental': (bench_render_incremental, (0, 48)),
+    REFERENCE: (bench_reference, (50,)),
+}
+
+
+def sample(setup, param, sample_time=0.005):
+    """
+    Times one sample of a scenario on fresh state.
+
+    A single call lasts about 100 microseconds, too short to time reliably, so
+    the call is repeated until the calls add up to sample_time. Only the calls
+    are timed, not the preparation of the state before each of them, and the
+    garbage collector is disabled while they run.
+
+    Args:
+        setup (callable): Setup function of the scenario.
+        param (int): Entity count passed to the setup function.
+        sample_time (float): Seconds of timed calls.
+
+    Returns:
+        float: Mean duration of a call in microseconds.
+    """
+    prepare, run = setup(param)
+    elapsed = 0.0
+    calls = 0
+    # Like timeit, keep the garbage collector from running in the middle of a call.
+    gc.collect()
+    gc.disable()
+    try:
+        while elapsed < sample_time:
+            if prepare is not None:
+                prepare()
+            start = time.perf_counter()
+            run()
+            elapsed += time.perf_counter() - start
+            calls += 1
+    finally:
+        gc.enable()
+    return elapsed / calls * 1e6
+
+
+def run_benchmarks(names=None, samples=40):
+    """
+    Runs the selected scenarios for each of their entity counts.
+
+    The samples are taken in rounds, one sample of every measurement per round,
+    so a stretch of time when the machine is busy with something else slows
+    down a round of every measurement instead of all the samples of a few.
+
+    Args:
+        names (list): Scenario names, all of them when omitted. The reference is always run.
+        samples (int): Number of samples per scenario and entity count.
+
+    Returns:
+        dict: Results keyed by scenario name, then entity count: median, minimum and maximum
+            duration of a call in microseconds, and the number of samples.
+    """
+    names = list(names or SCENARIOS)
+    if REFERENCE not in names:
+        names.append(REFERENCE)
+    measurements = [(name, param) for name in names for param in SCENARIOS[name][1]]
+    durations = {measurement: [] for measurement in measurements}
+    for _ in range(samples):
+        for name, param in measurements:
+            durations[name, param].append(sample(SCENARIOS[name][0], param))
+    results = {}
+    for (name, param), values in durations.items():
+        results.setdefault(name, {})[str(param)] = {
+            'median_us': statistics.median(values),
+            'min_us': min(values),
+            'max_us': max(values),
+            'samples': samples,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Finds the measurements that got slower than the baseline.
+
+    The median of each measurement is compared. Its samples are short and
+    spread over the whole run, so the median stays put when other processes
+    slow the machine down for a while, while the fastest sample depends on
+    catching a lucky moment. When the machine as a whole runs slower or
+    faster than when the baseline was recorded, which the reference scenario
+    tells, the baseline is scaled by the same factor.
+
+    Args:
+        results (dict): Results of run_benchmarks.
+        baseline (dict): Stored results to compare with.
+        threshold (float): Relative slowdown that is tolerated, e.g. 0.2 for 20%.
+
+    Returns:
+        list: (scenario, entity count, scaled baseline median, current median) of every regression.
+    """
+    speed = 1.0
+    (param, current), = results[REFERENCE].items()
+    recorded = baseline.get(REFERENCE, {}).get(param)
+    if recorded:
+        speed = current['median_us'] / recorded['median_us']
+    regressions = []
+    for name, by_param in results.items():
+        if name == REFERENCE:
+            continue
+        for param, result in by_param.items():
+            reference = baseline.get(name, {}).get(param)
+            if reference and result['median_us'] > reference['median_us'] * speed * (1 + threshold):
+                regressions.append((name, param, reference['median_us'] * speed, result['median_us']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to run, all by default ({', '.join(SCENARIOS)})")
+    parser.add_argument('--samples', type=int, default=40, help='samples per measurement, each averaging many calls')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', nargs='?', const=BASELINE,
+                        help='compare with the results stored in this JSON file (default: bench_baseline.json)')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression (default: 0.2)')
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((SCREEN_WIDTH + OFFSET, SCREEN_HEIGHT + 2 * OFFSET))
+
+    results = run_benchmarks(args.scenarios, args.samples)
+    for name, by_param in results.items():
+        for param, result in by_param.items():
+            print(f"{name:<20} n={param:<4} median {result['median_us']:>10.1f} us   min {result['min_us']:>10.1f} us")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for name, param, before, after in regressions:
+            print(f'REGRESSION {name} n={param}: {before:.1f} us -> {after:.1f} us ({after / before - 1:+.0%})')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
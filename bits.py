@@ -0,0 +1,33 @@
+def pack_bits(matrix):
+    """
+    Packs a matrix of booleans into bytes, one bit per cell in row-major order.
+
+    Args:
+        matrix (list): Rows of booleans, all of the same length.
+
+    Returns:
+        bytes: The bits, the first cell in the lowest bit of the first byte.
+    """
+    bits = 0
+    for index, value in enumerate(value for row in matrix for value in row):
+        if value:
+            bits |= 1 << index
+    count = sum(len(row) for row in matrix)
+    return bits.to_bytes((count + 7) // 8, 'little')
+
+
+def unpack_bits(data, rows, columns):
+    """
+    Unpacks bytes written by pack_bits into a matrix of booleans.
+
+    Args:
+        data (bytes): The packed bits.
+        rows (int): Number of rows of the matrix.
+        columns (int): Number of columns of the matrix.
+
+    Returns:
+        list: Rows of booleans.
+    """
+    bits = int.from_bytes(data, 'little')
+    return [[bool(bits >> (row * columns + column) & 1) for column in range(columns)]
+            for row in range(rows)]
@@ -0,0 +1,194 @@
+import json
+from collections import namedtuple
+
+from obstacle import BLOCK_SIZE, grid
+
+Config = namedtuple('Config', [
+    'screen_width', 'screen_height', 'offset',
+    'formation_rows', 'formation_columns', 'formation_spacing', 'formation_x',
+    'bunker_count', 'bunker_height', 'bunker_grid', 'block_size',
+    'lives', 'spaceship_speed', 'laser_speed', 'laser_delay',
+    'alien_laser_speed', 'mystery_ship_speed', 'mystery_ship_y',
+    'font_size',
+])
+Config.__doc__ = """
+The layout and tuning of a game.
+
+Scaled up configurations, such as a 20x40 formation on a 4K screen, are
+how the engine is stress tested, so nothing about the size of the game is
+fixed elsewhere.
+
+Attributes:
+    screen_width (int): Width of the game area.
+    screen_height (int): Height of the game area.
+    offset (int): Margin around the game area, the window is offset wider and 2 * offset taller.
+    formation_rows (int): Number of rows of aliens.
+    formation_columns (int): Number of columns of aliens.
+    formation_spacing (int): Distance in pixels between two neighbouring aliens.
+    formation_x (int): The x-coordinate of the formation's left column, from offset / 2.
+    bunker_count (int): Number of bunkers, spread evenly across the screen.
+    bunker_height (int): Distance from the bottom of the game area to the top of the bunkers.
+    bunker_grid (tuple): Rows of the bunker pattern, 1 for a cell and 0 for a hole.
+    block_size (int): Size in pixels of a bunker cell.
+    lives (int): Lives at the start of a game.
+    spaceship_speed (int): Pixels the spaceship moves per tick.
+    laser_speed (int): Pixels a player laser moves up per tick.
+    laser_delay (int): Ticks before the spaceship can fire again.
+    alien_laser_speed (int): Pixels an alien laser moves down per tick.
+    mystery_ship_speed (int): Pixels the mystery ship moves per tick.
+    mystery_ship_y (int): The y-coordinate of the top of the mystery ship.
+    font_size (int): Size of the HUD font, the HUD is laid out from it and the screen size.
+"""
+
+DEFAULT_CONFIG = Config(
+    screen_width=750, screen_height=700, offset=50,
+    formation_rows=5, formation_columns=11, formation_spacing=55, formation_x=75,
+    bunker_count=4, bunker_height=100, bunker_grid=tuple(tuple(row) for row in grid), block_size=BLOCK_SIZE,
+    lives=3, spaceship_speed=6, laser_speed=5, laser_delay=18,
+    alien_laser_speed=6, mystery_ship_speed=3, mystery_ship_y=90,
+    font_size=40,
+)
+
+# Smallest value of every integer field: sizes, counts and speeds must be positive,
+# margins and positions may be zero.
+MINIMUMS = {
+    'screen_width': 1, 'screen_height': 1, 'offset': 0,
+    'formation_rows': 1, 'formation_columns': 1, 'formation_spacing': 1, 'formation_x': 0,
+    'bunker_count': 0, 'bunker_height': 0, 'block_size': 1,
+    'lives': 1, 'spaceship_speed': 1, 'laser_speed': 1, 'laser_delay': 1,
+    'alien_laser_speed': 1, 'mystery_ship_speed': 1, 'mystery_ship_y': 0,
+    'font_size': 1,
+}
+
+# Largest value of the fields stored in fixed-size fields of snapshots and telemetry
+# messages: lives in a signed byte, formation and bunker counts in 16 bits.
+MAXIMUMS = {
+    'lives': 127,
+    'formation_rows': 65535, 'formation_columns': 65535, 'bunker_count': 65535,
+}
+
+
+def override(config, values):
+    """
+    Returns a copy of a configuration with some values replaced.
+
+    Args:
+        config (Config): The configuration to start from.
+        values (dict): New values by field name.
+
+    Returns:
+        Config: The new configuration.
+
+    Raises:
+        ValueError: If a field is unknown, or a value has the wrong type or is out of range.
+    """
+    changes = {}
+    for name, value in values.items():
+        if name not in Config._fields:
+            raise ValueError(f'unknown configuration field {name!r}')
+        if name == 'bunker_grid':
+            try:
+                value = tuple(tuple(cell for cell in row) for row in value)
+            except TypeError:
+                raise ValueError('bunker_grid must be a list of rows of 0 and 1') from None
+            if any(cell not in (0, 1) or isinstance(cell, (bool, float)) for row in value for cell in row):
+                raise ValueError('bunker_grid must be a list of rows of 0 and 1')
+            if not value or not value[0] or len({len(row) for row in value}) != 1:
+                raise ValueError('bunker_grid must be a non-empty list of rows of the same length')
+        elif isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f'{name} must be an integer, not {value!r}')
+        elif value < MINIMUMS[name]:
+            raise ValueError(f'{name} must be at least {MINIMUMS[name]}, not {value}')
+        elif value > MAXIMUMS.get(name, value):
+            raise ValueError(f'{name} must be at most {MAXIMUMS[name]}, not {value}')
+        changes[name] = value
+    return config._replace(**changes)
+
+
+def load(path, config=DEFAULT_CONFIG):
+    """
+    Reads a configuration file.
+
+    The file is a JSON object holding the fields to change, every other
+    field keeps its value from config.
+
+    Args:
+        path (str): The JSON file.
+        config (Config): The configuration the file overrides.
+
+    Returns:
+        Config: The configuration.
+    """
+    with open(path, 'r') as file:
+        values = json.load(file)
+    if not isinstance(values, dict):
+        raise ValueError(f'{path} must hold a JSON object')
+    return override(config, values)
+
+
+def dumps(config):
+    """
+    Serializes a configuration, e.g. to store it with a replay.
+
+    Args:
+        config (Config): The configuration.
+
+    Returns:
+        str: A JSON object holding every field, accepted by loads.
+    """
+    return json.dumps(config._asdict(), separators=(',', ':'))
+
+
+def loads(text):
+    """
+    Parses a configuration serialized by dumps.
+
+    Args:
+        text (str): The JSON object.
+
+    Returns:
+        Config: The configuration.
+    """
+    return override(DEFAULT_CONFIG, json.loads(text))
+
+
+def add_arguments(parser):
+    """
+    Adds the --config and --set options to a command line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser.add_argument('--config', metavar='PATH', help='JSON file overriding the default layout and tuning')
+    parser.add_argument('--set', metavar='FIELD=VALUE', action='append', default=[],
+                        help='override one configuration field, e.g. formation_rows=20, can be repeated')
+
+
+def from_args(parser, args):
+    """
+    Builds the configuration selected by the options added by add_arguments.
+
+    Values given with --set are applied on top of the --config file. Errors are
+    reported through the parser, which exits.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser, used to report errors.
+        args (argparse.Namespace): The parsed options.
+
+    Returns:
+        Config: The configuration.
+    """
+    try:
+        config = load(args.config) if args.config else DEFAULT_CONFIG
+        values = {}
+        for item in args.set:
+            name, separator, value = item.partition('=')
+            if not separator:
+                raise ValueError(f'--set expects FIELD=VALUE, not {item!r}')
+            try:
+                values[name] = json.loads(value)
+            except json.JSONDecodeError:
+                raise ValueError(f'invalid value for {name}: {value!r}') from None
+        return override(config, values)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
@@ -0,0 +1,243 @@
+import os
+
+import numpy as np
+import pygame
+
+from config import DEFAULT_CONFIG
+from renderer import Renderer
+from simulation import Simulation
+from spaceship import Inputs
+
+# The actions are the bit masks of the replay logs: every combination of left, right and fire.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+ACTIONS = tuple(Inputs(bool(action & LEFT), bool(action & RIGHT), bool(action & FIRE)) for action in range(8))
+
+# Laser slots of the feature vector, further lasers are left out.
+PLAYER_LASER_SLOTS = 4
+ALIEN_LASER_SLOTS = 8
+
+
+class SpaceInvadersEnv:
+    """
+    Reinforcement learning environment around a headless game.
+
+    The interface follows Gymnasium: reset returns an observation and an
+    info dict, step returns an observation, a reward, whether the game is
+    over, whether the tick budget ran out and an info dict. The reward is the
+    score gained during the step.
+
+    Observations are written into arrays allocated once, and the same array
+    is returned by every call: copy it to keep an observation past the next
+    step. Feature observations are a float32 vector describing the spaceship,
+    formation, lasers, mystery ship and bunker health. Pixel observations are
+    the frame drawn by the dirty-rect renderer on an offscreen surface,
+    downsampled by striding through a zero-copy view of its pixels.
+
+    Attributes:
+        simulation (Simulation): The simulated game.
+        observation (str): 'features' or 'pixels'.
+        frame_skip (int): Number of ticks every action is repeated for.
+        max_ticks (int): Ticks after which an episode is truncated, unlimited when None.
+        action_count (int): Number of actions, an action is an int below it.
+        observation_shape (tuple): Shape of the observations.
+    """
+
+    def __init__(self, seed=None, observation='features', frame_skip=1, downsample=4, max_ticks=None,
+                 render_mode=None, config=DEFAULT_CONFIG, **game_options):
+        """
+        Create the environment and its game.
+
+        Args:
+            seed (int): Seed of the first episode, random when omitted.
+            observation (str): 'features' for a feature vector, 'pixels' for downsampled frames.
+            frame_skip (int): Number of ticks every action is repeated for.
+            downsample (int): Pixel observations keep one pixel out of this many in both directions.
+            max_ticks (int): Ticks after which an episode is truncated, unlimited when omitted.
+            render_mode (str): 'human' to show the game in a window, 'rgb_array' to return frames
+                from render, None to not render.
+            config (Config): The layout and tuning of the game, see the config module.
+            **game_options: Extra keyword arguments passed to the Simulation.
+        """
+        if observation not in ('features', 'pixels'):
+            raise ValueError(f"observation must be 'features' or 'pixels', not {observation!r}")
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.downsample = downsample
+        self.max_ticks = max_ticks
+        self.render_mode = render_mode
+        self.action_count = len(ACTIONS)
+
+        # The screen comes first, so the sprite images are loaded in its pixel format.
+        self.screen = None
+        self._pixels = None
+        if observation == 'pixels' or render_mode is not None:
+            self._create_screen((config.screen_width + config.offset, config.screen_height + 2 * config.offset))
+        self.simulation = Simulation(seed, config, **game_options)
+        self.renderer = Renderer(self.screen, config.offset, config.font_size) if self.screen is not None else None
+
+        game = self.simulation.game
+        formation = game.formation
+        self._alive_size = formation.rows * formation.columns
+        self._bunker_cells = [obstacle.cells.count() for obstacle in game.obstacles]
+        size = (8 + self._alive_size + 2 * (PLAYER_LASER_SLOTS + ALIEN_LASER_SLOTS) + 3
+                + len(game.obstacles))
+        self._features = np.zeros(size, np.float32)
+        self.observation_shape = self._pixels.shape if observation == 'pixels' else self._features.shape
+
+    def _create_screen(self, size):
+        """
+        Creates the surface drawn on for pixel observations and rendering.
+
+        Without a window, every environment draws on a surface of its own, since
+        the dirty-rect renderer expects to be the only one drawing on its screen.
+        On SDL's dummy driver, a display mode is set once, in memory only, and
+        the surfaces are converted to its format: images converted to it draw
+        several times faster than unconverted ones.
+
+        Args:
+            size (tuple): Width and height of the screen.
+        """
+        if not pygame.display.get_init():
+            if self.render_mode != 'human':
+                os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            pygame.display.init()
+        pygame.font.init()
+        if self.render_mode == 'human':
+            self.screen = pygame.display.set_mode(size)
+        else:
+            if pygame.display.get_surface() is None and pygame.display.get_driver() == 'dummy':
+                pygame.display.set_mode(size)
+            self.screen = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.screen = self.screen.convert()
+        width, height = size
+        step = self.downsample
+        self._pixels = np.zeros(((height + step - 1) // step, (width + step - 1) // step, 3), np.uint8)
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode.
+
+        Args:
+            seed (int): Seed of the episode, the seed of the previous episode is kept when omitted.
+
+        Returns:
+            tuple: The first observation and an info dict.
+        """
+        self.simulation.reset(seed)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        return self._observe(), self._info()
+
+    def step(self, action):
+        """
+        Plays an action for frame_skip ticks.
+
+        Args:
+            action (int): Bit mask of LEFT, RIGHT and FIRE.
+
+        Returns:
+            tuple: The observation, the reward, whether the game is over, whether
+            the episode was truncated and an info dict.
+        """
+        simulation = self.simulation
+        game = simulation.game
+        inputs = ACTIONS[action]
+        score = game.score
+        for _ in range(self.frame_skip):
+            if not simulation.step(inputs):
+                break
+        terminated = not game.run
+        truncated = not terminated and self.max_ticks is not None and game.ticks >= self.max_ticks
+        return self._observe(), game.score - score, terminated, truncated, self._info()
+
+    def render(self):
+        """
+        Draws the current frame.
+
+        Returns:
+            numpy.ndarray: A copy of the frame shaped (height, width, 3) in 'rgb_array'
+            mode, None otherwise.
+        """
+        if self.renderer is None:
+            return None
+        dirty = self.renderer.draw(self.simulation.game)
+        if self.render_mode == 'human':
+            self.renderer.present(dirty)
+            return None
+        return pygame.surfarray.array3d(self.screen).transpose(1, 0, 2)
+
+    def close(self):
+        """Releases the window, if any."""
+        if self.render_mode == 'human':
+            pygame.display.quit()
+        self.screen = self.renderer = None
+
+    def _info(self):
+        """Returns the info dict of a step."""
+        game = self.simulation.game
+        return {'score': game.score, 'lives': game.lives, 'wave': game.wave, 'ticks': game.ticks}
+
+    def _observe(self):
+        """Writes the current observation into its buffer and returns it."""
+        if self.observation == 'pixels':
+            return self._observe_pixels()
+        return self._observe_features()
+
+    def _observe_pixels(self):
+        """Draws the frame and copies every downsample-th pixel into the observation buffer."""
+        self.renderer.draw(self.simulation.game)
+        # pixels3d is a view of the surface memory, indexed [x, y]: striding and
+        # transposing it are views too, so the only copy is into the buffer.
+        view = pygame.surfarray.pixels3d(self.screen)
+        step = self.downsample
+        np.copyto(self._pixels, view[::step, ::step].transpose(1, 0, 2))
+        # Release the view, which locks the surface, before the next frame is drawn.
+        del view
+        return self._pixels
+
+    def _observe_features(self):
+        """Fills the feature vector, every value is scaled to about [-1, 1]."""
+        game = self.simulation.game
+        width = game.screen_width + game.offset
+        height = game.screen_height
+        features = self._features
+        features[:] = 0
+        spaceship = game.spaceship_group.sprite
+        formation = game.formation
+
+        features[0] = spaceship.rect.centerx / width
+        features[1] = spaceship.laser_ready
+        features[2] = formation.x / width
+        features[3] = formation.y / height
+        features[4] = game.aliens_direction
+        features[5] = game.alien_speed() / 8
+        features[6] = game.lives / game.config.lives
+        features[7] = game.wave / 10
+        index = 8
+
+        columns = formation.columns
+        for alien in game.aliens_group:
+            features[index + alien.row * columns + alien.column] = 1
+        index += self._alive_size
+
+        for group, slots in ((spaceship.lasers_group, PLAYER_LASER_SLOTS),
+                             (game.alien_lasers_group, ALIEN_LASER_SLOTS)):
+            for slot, laser in zip(range(slots), group):
+                features[index + 2 * slot] = laser.rect.centerx / width
+                features[index + 2 * slot + 1] = laser.rect.centery / height
+            index += 2 * slots
+
+        ship = game.mystery_ship_group.sprite
+        if ship is not None:
+            features[index] = 1
+            features[index + 1] = ship.rect.centerx / width
+            features[index + 2] = ship.speed / game.config.mystery_ship_speed
+        index += 3
+
+        for obstacle, cells in zip(game.obstacles, self._bunker_cells):
+            features[index] = obstacle.cells.count() / cells
+            index += 1
+        return features
@@ -0,0 +1,192 @@
+import pygame
+
+from alien import Alien
+
+
+class AlienGroup(pygame.sprite.Group):
+    """
+    A sprite group that keeps its formation informed about killed aliens.
+
+    Attributes:
+        formation (Formation): The formation owning the aliens of this group.
+    """
+
+    def __init__(self, formation):
+        super().__init__()
+        self.formation = formation
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.formation.on_alien_removed(sprite)
+
+    def draw(self, surface, *args, **kwargs):
+        """Brings the alien rects up to date before drawing them."""
+        self.formation.sync()
+        return super().draw(surface, *args, **kwargs)
+
+
+class Formation:
+    """
+    The grid of aliens, moved as a whole through a single offset.
+
+    Aliens never move on their own: their position is the formation origin plus
+    their slot in the grid. Sprite rects are only written back by sync, when they
+    are needed for drawing or collisions. The horizontal extent of the live
+    columns is kept up to date as aliens die, so finding out whether the
+    formation touches a screen edge does not depend on the number of aliens.
+
+    Attributes:
+        rows (int): Number of rows in the formation.
+        columns (int): Number of columns in the formation.
+        spacing (int): Distance in pixels between two neighbouring slots.
+        start (tuple): The origin of the formation when it is reset.
+        x (int): Current x-coordinate of the formation origin.
+        y (int): Current y-coordinate of the formation origin.
+        aliens (list): Alien sprites indexed by [row][column].
+        alive (list): Liveness of each slot, indexed by [row][column].
+        group (AlienGroup): The sprite group holding the live aliens.
+        on_change (callable): Called without arguments after an alien died, None to not be told.
+    """
+
+    def __init__(self, x, y, rows=5, columns=11, spacing=55):
+        """
+        Create the aliens of the formation.
+
+        Args:
+            x (float): The x-coordinate of the top-left slot.
+            y (float): The y-coordinate of the top-left slot.
+            rows (int): Number of rows in the formation.
+            columns (int): Number of columns in the formation.
+            spacing (int): Distance in pixels between two neighbouring slots.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.spacing = spacing
+        # Round the origin the same way pygame rounds sprite positions.
+        self.start = pygame.Rect((0, 0), (0, 0))
+        self.start.topleft = (x, y)
+        self.start = self.start.topleft
+        self.aliens = [
+            [self.create_alien(row, column) for column in range(columns)]
+            for row in range(rows)
+        ]
+        self.group = AlienGroup(self)
+        self.on_change = None
+        self.alive = [[False] * columns for _ in range(rows)]
+        self.reset()
+
+    @staticmethod
+    def alien_type(row):
+        """Returns the alien type used for a row of the formation."""
+        if row == 0:
+            return 3
+        if row in (1, 2):
+            return 2
+        return 1
+
+    def create_alien(self, row, column):
+        """Creates the alien sprite for a slot of the formation."""
+        alien = Alien(self.alien_type(row), 0, 0)
+        alien.row = row
+        alien.column = column
+        return alien
+
+    def reset(self):
+        """Moves the formation back to its start and revives every alien."""
+        self.restore(*self.start, [[True] * self.columns for _ in range(self.rows)])
+
+    def restore(self, x, y, alive):
+        """
+        Moves the formation and sets which aliens are alive, reusing the existing sprites.
+
+        Args:
+            x (int): The x-coordinate of the formation origin.
+            y (int): The y-coordinate of the formation origin.
+            alive (list): Liveness of each slot, indexed by [row][column].
+        """
+        self.x, self.y = x, y
+        self._dirty = True
+        slots = [(row, column) for row in range(self.rows) for column in range(self.columns)
+                 if self.alive[row][column] != alive[row][column]]
+        if all(self.alive[row][column] for row, column in slots):
+            # Only aliens to remove, which keeps the order of the others in the group.
+            for row, column in slots:
+                self.group.remove(self.aliens[row][column])
+            return
+
+        # Mark every slot dead first so emptying the group skips the extent updates.
+        self.alive = [[False] * self.columns for _ in range(self.rows)]
+        self.group.empty()
+        self.alive = [list(row) for row in alive]
+        self._column_widths = [
+            max((self.aliens[row][column].rect.width
+                 for row in range(self.rows) if self.alive[row][column]), default=0)
+            for column in range(self.columns)
+        ]
+        self._update_extent()
+        # Add the aliens in slot order, the order the group had before any of them died.
+        for row in range(self.rows):
+            self.group.add(*(alien for alien, live in zip(self.aliens[row], self.alive[row]) if live))
+
+    def __len__(self):
+        return len(self.group)
+
+    @property
+    def left(self):
+        """int: The left edge of the leftmost live alien."""
+        return self.x + self._left_extent
+
+    @property
+    def right(self):
+        """int: The right edge of the rightmost live alien."""
+        return self.x + self._right_extent
+
+    def move(self, dx, dy=0):
+        """
+        Moves the whole formation.
+
+        Args:
+            dx (int): Horizontal distance in pixels.
+            dy (int): Vertical distance in pixels.
+        """
+        self.x += dx
+        self.y += dy
+        self._dirty = True
+
+    def sync(self):
+        """Writes the formation position back to the rects of the live aliens."""
+        if not self._dirty:
+            return
+        x, y, spacing = self.x, self.y, self.spacing
+        for alien in self.group:
+            alien.rect.topleft = (x + alien.column * spacing, y + alien.row * spacing)
+        self._dirty = False
+
+    def on_alien_removed(self, alien):
+        """
+        Marks the slot of a removed alien as dead and updates the live extent.
+
+        Args:
+            alien (Alien): The alien that left the group.
+        """
+        if not self.alive[alien.row][alien.column]:
+            return
+        self.alive[alien.row][alien.column] = False
+        column = alien.column
+        self._column_widths[column] = max(
+            (self.aliens[row][column].rect.width
+             for row in range(self.rows) if self.alive[row][column]),
+            default=0)
+        self._update_extent()
+        if self.on_change is not None:
+            self.on_change()
+
+    def _update_extent(self):
+        """Recomputes the horizontal extent of the live columns relative to the origin."""
+        live = [column for column, width in enumerate(self._column_widths) if width]
+        if not live:
+            self._left_extent = self._right_extent = 0
+            return
+        self._left_extent = live[0] * self.spacing
+        self._right_extent = max(
+            column * self.spacing + self._column_widths[column] for column in live)
@@ -1,12 +1,48 @@
-import itertools
 import random
+from collections import Counter
 
 import pygame
 
-from alien import Alien, MysteryShip
-from laser import Laser
-from obstacle import Obstacle, grid
-from spaceship import Spaceship
+import assets
+import snapshot
+from alien import MysteryShip
+from audio import NullVoiceManager, VoiceManager
+from config import DEFAULT_CONFIG
+from formation import Formation
+from laser import LaserPool
+from obstacle import Obstacle
+from profiler import NullProfiler
+from scheduler import Scheduler
+from scores import ScoreStore
+from spaceship import Inputs, Spaceship
+from spatial import SpatialGrid
+from waves import WAVES, get_wave, scale
+
+# Frames played per second, the game advances by a fixed step every frame.
+FRAME_RATE = 60
+
+# Range of the number of ticks before the next mystery ship.
+MYSTERY_SHIP_DELAY = (240, 480)
+
+
+def collide_sprites(left, right):
+    """
+    Tells whether the opaque pixels of two sprites overlap.
+
+    The rectangles are compared first and only overlapping pairs are tested
+    with the masks, which are shared per asset, so most pairs cost a single
+    rect test.
+
+    Args:
+        left (pygame.sprite.Sprite): A sprite with rect and mask attributes.
+        right (pygame.sprite.Sprite): Another sprite with rect and mask attributes.
+
+    Returns:
+        bool: True if the sprites touch.
+    """
+    if not left.rect.colliderect(right.rect):
+        return False
+    return left.mask.overlap(right.mask, (right.rect.x - left.rect.x, right.rect.y - left.rect.y)) is not None
 
 
 class Game:
@@ -14,203 +50,456 @@ class Game:
     Main Game class that controls game events, objects, and state.
 
     Attributes:
+        config (Config): The layout and tuning of the game.
         screen_width (int): The width of the game screen.
         screen_height (int): The height of the game screen.
         offset (int): An offset value meant to position elements on the screen.
         spaceship_group (pygame.sprite.GroupSingle): A group containing the player's spaceship sprite.
         obstacles (list): A list of Obstacle instances representing barriers.
+        formation (Formation): The grid of aliens, moved as a whole.
         aliens_group (pygame.sprite.Group): A group containing all alien sprites.
         aliens_direction (int): The current direction of alien movement, 1 means right, -1 means left.
         alien_lasers_group (pygame.sprite.Group): A group containing all lasers shot by aliens.
         mystery_ship_group (pygame.sprite.GroupSingle): A group containing the mystery ship sprite, if present.
         lives (int): The number of lives the player has.
+        waves (tuple): The Wave definitions, the last one repeats for every later wave.
+        quiet (bool): Whether the game over message is kept off the standard output.
+        wave (int): The number of the current wave, starting at 1.
         score (int): The current player score.
         highscore (int): The highest score achieved.
         run (bool): Boolean to determine if the game is running.
-        explosion_sound (pygame.mixer.Sound): Sound played when an explosion occurs.
+        audio (bool): Whether the sound effects and music are playing, see start_audio.
+        sounds (VoiceManager): Plays the sound effects and music, a NullVoiceManager when audio is disabled.
+        rng (random.Random): Random number generator used for every random decision of the game.
+        laser_pool (LaserPool): Pool recycling the lasers of the spaceship and the aliens.
+        profiler (FrameProfiler): Times the phases of update, records nothing by default.
+        ticks (int): Number of frames played since the last reset.
+        scheduler (Scheduler): Runs the timed events of the game: alien shots, mystery ships
+            and the laser cooldown.
+        kills (collections.Counter): Number of aliens killed since the last reset, by alien type.
+        scores (ScoreStore): The leaderboard, saved in the background.
+        player_name (str): Name the scores of the player are recorded under.
+        use_spatial_index (bool): Whether collisions are looked up through the spatial grid
+            instead of testing every pair of sprites.
+        alien_index (SpatialGrid): Broad phase grid of the alien slots, relative to the formation
+            origin. Aliens never leave their slot, so it is built once with the formation.
+        obstacle_area (pygame.Rect): The area covered by the obstacles, None without obstacles.
 
     Methods:
         create_obstacles: Creates and positions the obstacle objects.
-        create_aliens: Creates alien sprites and adds them to the aliens_group.
+        create_aliens: Creates the alien formation and its aliens_group.
         move_aliens: Moves the aliens horizontally and vertically if they hit screen edges.
         alien_move_down: Moves all aliens downwards by a specified distance.
+        killed_share: Returns the share of the formation killed in the current wave.
+        update_difficulty: Recomputes the alien speed and shot interval.
+        alien_speed: Returns the distance the formation moves per tick.
+        alien_shot_interval: Returns the number of ticks until the next alien shot.
         alien_shoot_laser: Randomly selects an alien to shoot a laser.
+        alien_shot_timer: Fires an alien laser and schedules the next shot.
+        next_wave: Starts the next wave, reusing the aliens and bunkers.
         create_mystery_ship: Creates the mystery ship at the top of the screen.
+        mystery_ship_timer: Creates the mystery ship and schedules the next one.
+        schedule_events: Schedules the first alien shot and mystery ship.
+        start_audio: Starts the sound effects and music.
         check_for_highscore: Updates the highscore if the current score is greater.
-        load_highscore: Loads the highscore from 'highscore.txt'.
+        submit_score: Records the score of the current game on the leaderboard.
+        aliens_near: Returns the live aliens whose slots overlap a rectangle.
+        collide_aliens: Returns the aliens whose opaque pixels touch a sprite, optionally killing them.
+        collide_obstacles: Erodes the obstacles touched by a sprite.
         check_for_collisions: Checks for collisions between lasers, aliens, obstacles, and the spaceship.
-        game_over: Ends the game and prints a game over message.
+        update: Advances the game by one frame.
+        snapshot: Captures the full state of the game as bytes.
+        restore: Puts the game back in a captured state.
+        game_over: Ends the game, records its score and prints a game over message.
         reset: Resets the game to its starting state.
 
     """
-    def __init__(self, screen_width, screen_height, offset):
+    def __init__(self, config=DEFAULT_CONFIG, use_spatial_index=True,
+                 rng=None, audio=True, highscore_file='highscores.json', laser_pool_size=64,
+                 player_name='PLAYER', waves=WAVES, quiet=False):
         """
-        Initializes the Game object with screen dimensions, offset, and loads resources.
+        Initializes the Game object from its configuration and loads resources.
 
         Args:
-            screen_width (int): Width of the game window.
-            screen_height (int): Height of the game window.
-            offset (int): Offset used for positioning elements.
+            config (Config): The screen dimensions, offset, formation, bunkers and speeds, see the config module.
+            use_spatial_index (bool): Look up the aliens near a sprite through a spatial grid. When False
+                every pair of sprites is tested, which is useful to compare both paths.
+            rng (random.Random): Random number generator, a new unseeded one is used when omitted.
+            audio (bool): Whether sounds and music are played. Disable it to run without a mixer.
+            highscore_file (str): File the leaderboard is kept in, or None to keep it in memory only.
+            laser_pool_size (int): Maximum number of idle lasers kept for reuse.
+            player_name (str): Name the scores of the player are recorded under.
+            waves (tuple): The Wave definitions, see the waves module.
+            quiet (bool): Whether to keep the game over message off the standard output, as headless runs do.
         """
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.offset = offset
+        self.config = config
+        self.screen_width = config.screen_width
+        self.screen_height = config.screen_height
+        self.offset = config.offset
+        self.use_spatial_index = use_spatial_index
+        self.rng = rng if rng is not None else random.Random()
+        self.audio = False
+        self.sounds = NullVoiceManager()
+        self.scores = ScoreStore(highscore_file)
+        self.player_name = player_name
+        self.quiet = quiet
+        self.ticks = 0
+        self.scheduler = Scheduler()
+        self.kills = Counter()
+        self.laser_pool = LaserPool(laser_pool_size)
+        self.profiler = NullProfiler()
         self.spaceship_group = pygame.sprite.GroupSingle()
-        self.spaceship_group.add(Spaceship(self.screen_width, self.screen_height, self.offset))
+        self.spaceship_group.add(
+            Spaceship(self.screen_width, self.screen_height, self.offset, self.scheduler, self.sounds, self.laser_pool,
+                      config.spaceship_speed, config.laser_speed, config.laser_delay))
+        self.waves = waves
+        self.wave = 1
         self.obstacles = self.create_obstacles()
-        self.aliens_group = pygame.sprite.Group()
         self.create_aliens()
         self.aliens_direction = 1
         self.alien_lasers_group = pygame.sprite.Group()
         self.mystery_ship_group = pygame.sprite.GroupSingle()
-        self.lives = 3
+        self.lives = config.lives
         self.score = 0
-        self.highscore = 0
+        self.highscore = self.scores.best
         self.run = True
-        self.load_highscore()
-        self.explosion_sound = pygame.mixer.Sound('Sounds/explosion.ogg')
-        pygame.mixer.music.load('Sounds/music.ogg')
-        pygame.mixer.music.play(-1)
+        self._submitted = False
+        self.scheduler.register('alien_shot', self.alien_shot_timer)
+        self.scheduler.register('mystery_ship', self.mystery_ship_timer)
+        self.schedule_events()
+        if audio:
+            self.start_audio()
+
+    def start_audio(self):
+        """
+        Starts the sound effects and the music, if they are not playing yet.
+
+        A game created without audio can start it later, e.g. once the first
+        frame is on screen, so opening the mixer and decoding the sounds do
+        not delay it.
+        """
+        if self.audio:
+            return
+        self.audio = True
+        self.sounds = self.spaceship_group.sprite.sounds = VoiceManager()
+        self.sounds.play_music(assets.path('Sounds', 'music.ogg'))
 
     def create_obstacles(self):
-        """Create and position the obstacles on the screen."""
-        obstacle_width = len(grid[0]) * 3
-        gap = (self.screen_width + self.offset - (4 * obstacle_width))/5
+        """Create and position the obstacles on the screen, with equal gaps around them."""
+        config = self.config
+        count = config.bunker_count
+        obstacle_width = len(config.bunker_grid[0]) * config.block_size
+        gap = (self.screen_width + self.offset - (count * obstacle_width))/(count + 1)
         obstacles = []
-        for i in range(4):
+        for i in range(count):
             offset_x = (i + 1) * gap + i * obstacle_width
-            obstacle = Obstacle(offset_x, self.screen_height - 100)
+            obstacle = Obstacle(offset_x, self.screen_height - config.bunker_height,
+                                config.bunker_grid, config.block_size)
             obstacles.append(obstacle)
+        self.obstacle_area = None
+        if obstacles:
+            self.obstacle_area = obstacles[0].rect.unionall([obstacle.rect for obstacle in obstacles])
         return obstacles
 
     def create_aliens(self):
-        """Creates aliens and adds them to the alien group."""
-        for row, column in itertools.product(range(5), range(11)):
-            x = 75 + column * 55
-            y = 110 + row * 55
-
-            if row == 0:
-                alien_type = 3
-            elif row in (1, 2):
-                alien_type = 2
-            else:
-                alien_type = 1
-
-            alien = Alien(alien_type, x + self.offset/2, y)
-            self.aliens_group.add(alien)
+        """Creates the alien formation and exposes its sprites as the alien group."""
+        config = self.config
+        self.formation = Formation(config.formation_x + self.offset/2, get_wave(self.waves, 1).start_y,
+                                   config.formation_rows, config.formation_columns, config.formation_spacing)
+        self.aliens_group = self.formation.group
+        self.formation.on_change = self.update_difficulty
+        self.alien_index = SpatialGrid(config.formation_spacing)
+        for row in self.formation.aliens:
+            for alien in row:
+                self.alien_index.insert(alien, pygame.Rect(
+                    (alien.column * config.formation_spacing, alien.row * config.formation_spacing), alien.rect.size))
+        self.update_difficulty()
 
     def move_aliens(self):
         """Moves the aliens horizontally and switch direction if they hit the edges."""
-        self.aliens_group.update(self.aliens_direction)
+        if not self.aliens_group:
+            return
+        self.formation.move(self.aliens_direction * self._alien_speed)
 
-        alien_sprites = self.aliens_group.sprites()
-        for alien in alien_sprites:
-            if alien.rect.right >= self.screen_width + self.offset:
-                self.aliens_direction = -1
-                self.alien_move_down(2)
-            elif alien.rect.left <= self.offset/2:
-                self.aliens_direction = 1
-                self.alien_move_down(2)
+        if self.formation.right >= self.screen_width + self.offset:
+            self.aliens_direction = -1
+            self.alien_move_down(2)
+        elif self.formation.left <= self.offset/2:
+            self.aliens_direction = 1
+            self.alien_move_down(2)
 
     def alien_move_down(self, distance):
         """Move all aliens down by a specified distance."""
         if self.aliens_group:
-            for alien in self.aliens_group.sprites():
-                alien.rect.y += distance
+            self.formation.move(0, distance)
+
+    def killed_share(self):
+        """Returns the share of the formation killed in the current wave, from 0 to 1."""
+        formation = self.formation
+        return 1 - len(self.aliens_group) / (formation.rows * formation.columns)
+
+    def update_difficulty(self):
+        """
+        Recomputes the alien speed and shot interval from the wave and the share of killed aliens.
+
+        Called when an alien dies and when the wave or formation is reset or
+        restored, so moving the formation every tick only reads the stored values.
+        """
+        wave = get_wave(self.waves, self.wave)
+        killed = self.killed_share()
+        self._alien_speed = scale(wave.speed, wave.max_speed, killed)
+        self._alien_shot_interval = scale(wave.shot_interval, wave.min_shot_interval, killed)
+
+    def alien_speed(self):
+        """Returns the distance the formation moves per tick, which grows as it thins out."""
+        return self._alien_speed
+
+    def alien_shot_interval(self):
+        """Returns the number of ticks until the next alien shot, which shrinks as the formation thins out."""
+        return self._alien_shot_interval
 
     def alien_shoot_laser(self):
         """Randomly selects an alien to shoot a laser."""
         if self.aliens_group.sprites():
-            random_alien = random.choice(self.aliens_group.sprites())
-            laser_sprite = Laser(random_alien.rect.center, -6, self.screen_height)
+            self.formation.sync()
+            random_alien = self.rng.choice(self.aliens_group.sprites())
+            laser_sprite = self.laser_pool.acquire(random_alien.rect.center, -self.config.alien_laser_speed, self.screen_height)
             self.alien_lasers_group.add(laser_sprite)
 
     def create_mystery_ship(self):
         """Creates the mystery ship and adds it to the game."""
-        self.mystery_ship_group.add(MysteryShip(self.screen_width, self.offset))
+        config = self.config
+        self.mystery_ship_group.add(MysteryShip(self.screen_width, self.offset, self.rng,
+                                                config.mystery_ship_speed, config.mystery_ship_y))
+
+    def alien_shot_timer(self):
+        """Fires an alien laser and schedules the next shot."""
+        self.alien_shoot_laser()
+        self.scheduler.schedule('alien_shot', self.alien_shot_interval())
+
+    def mystery_ship_timer(self):
+        """Creates the mystery ship and schedules the next one after a random delay."""
+        self.create_mystery_ship()
+        self.scheduler.schedule('mystery_ship', self.rng.randint(*MYSTERY_SHIP_DELAY))
+
+    def schedule_events(self):
+        """Schedules the first alien shot and mystery ship of a game, which then repeat."""
+        self.scheduler.schedule('alien_shot', self.alien_shot_interval())
+        self.scheduler.schedule('mystery_ship', self.rng.randint(*MYSTERY_SHIP_DELAY))
 
     def check_for_highscore(self):
         """
-        Updates the highscore if the current score is greater
-        and saves it to 'highscore.txt'.
+        Updates the highscore if the current score is greater.
+
+        Only the displayed value changes here, the score reaches the
+        leaderboard when the game ends, see submit_score.
         """
         if self.score > self.highscore:
             self.highscore = self.score
 
-            with open('highscore.txt', 'w') as file:
-                file.write(str(self.highscore))
+    def submit_score(self):
+        """
+        Records the score of the current game on the leaderboard, once per game.
+
+        The leaderboard is saved in the background, so this never waits for the disk.
+        """
+        if self._submitted or not self.score:
+            return
+        self._submitted = True
+        self.scores.submit(self.score, self.player_name, self.ticks / FRAME_RATE)
+
+    def aliens_near(self, rect):
+        """
+        Returns the live aliens whose slots overlap a rectangle, in the order of the aliens group.
+
+        Args:
+            rect (pygame.Rect): The area to look up.
+
+        Returns:
+            list: Candidate aliens, near the rectangle but not necessarily overlapping it.
+        """
+        formation = self.formation
+        return [alien for alien in self.alien_index.query(rect.move(-formation.x, -formation.y))
+                if alien in self.aliens_group]
+
+    def collide_aliens(self, sprite, dokill):
+        """
+        Returns the aliens whose opaque pixels overlap a sprite, in the order of the aliens group.
+
+        Args:
+            sprite (pygame.sprite.Sprite): The sprite to test, usually a laser.
+            dokill (bool): Whether the aliens that were hit are removed from the game.
+
+        Returns:
+            list: The aliens that were hit.
+        """
+        if not self.use_spatial_index:
+            return pygame.sprite.spritecollide(sprite, self.aliens_group, dokill, collide_sprites)
+
+        aliens_hit = [alien for alien in self.aliens_near(sprite.rect) if collide_sprites(sprite, alien)]
+        if dokill:
+            for alien in aliens_hit:
+                alien.kill()
+        return aliens_hit
 
-    def load_highscore(self):
-        """Loads the highscore from 'highscore.txt', if it exists."""
-        try:
-            with open('highscore.txt', 'r') as file:
-                self.highscore = int(file.read())
-        except FileNotFoundError:
-            self.highscore = 0
+    def collide_obstacles(self, sprite):
+        """
+        Erodes the cells of every obstacle touched by the opaque pixels of a sprite.
+
+        Args:
+            sprite (pygame.sprite.Sprite): The sprite to test, a laser or an alien.
+
+        Returns:
+            bool: True if any obstacle was hit.
+        """
+        hit = False
+        for obstacle in self.obstacles:
+            if obstacle.collide_mask(sprite.mask, sprite.rect):
+                hit = True
+        return hit
 
     def check_for_collisions(self):
         """
         Checks and handles collisions between lasers, aliens, obstacles, and the spaceship.
         Updates the score and plays explosion sounds upon hits.
         """
+        self.formation.sync()
+
         # Spaceship
         if self.spaceship_group.sprite.lasers_group:
             for laser_sprite in self.spaceship_group.sprite.lasers_group:
 
-                if aliens_hit := pygame.sprite.spritecollide(
-                    laser_sprite, self.aliens_group, True
-                ):
-                    self.explosion_sound.play()
+                if aliens_hit := self.collide_aliens(laser_sprite, True):
+                    self.sounds.play('explosion')
                     for alien in aliens_hit:
+                        self.kills[alien.type] += 1
                         self.score += alien.type * 100
                         self.check_for_highscore()
                         laser_sprite.kill()
 
-                if pygame.sprite.spritecollide(laser_sprite, self.mystery_ship_group, True):
-                    self.explosion_sound.play()
+                if pygame.sprite.spritecollide(laser_sprite, self.mystery_ship_group, True, collide_sprites):
+                    self.sounds.play('explosion')
                     self.score += 500
                     self.check_for_highscore()
                     laser_sprite.kill()
 
-                for obstacle in self.obstacles:
-                    if pygame.sprite.spritecollide(laser_sprite, obstacle.blocks_group, True):
-                        laser_sprite.kill()
+                if self.collide_obstacles(laser_sprite):
+                    laser_sprite.kill()
 
         # Aliens
         if self.alien_lasers_group:
             for laser_sprite in self.alien_lasers_group:
-                if pygame.sprite.spritecollide(laser_sprite, self.spaceship_group, False):
+                if pygame.sprite.spritecollide(laser_sprite, self.spaceship_group, False, collide_sprites):
                     laser_sprite.kill()
                     self.lives -= 1
                     if self.lives == 0:
                         self.game_over()
 
-                for obstacle in self.obstacles:
-                    if pygame.sprite.spritecollide(laser_sprite, obstacle.blocks_group, True):
-                        laser_sprite.kill()
+                if self.collide_obstacles(laser_sprite):
+                    laser_sprite.kill()
 
         if self.aliens_group:
-            for alien in self.aliens_group:
-                for obstacle in self.obstacles:
-                    pygame.sprite.spritecollide(alien, obstacle.blocks_group, True)
+            aliens = self.aliens_group
+            if self.use_spatial_index:
+                # Only the aliens down among the bunkers or by the spaceship can touch them.
+                area = self.spaceship_group.sprite.rect
+                if self.obstacle_area is not None:
+                    area = area.union(self.obstacle_area)
+                aliens = self.aliens_near(area)
+            for alien in aliens:
+                self.collide_obstacles(alien)
 
-                if pygame.sprite.spritecollide(alien, self.spaceship_group, False):
+                if pygame.sprite.spritecollide(alien, self.spaceship_group, False, collide_sprites):
                     self.game_over()
 
+    def update(self, inputs=Inputs.NONE):
+        """
+        Advances the game by one frame: runs the timed events that fall due,
+        moves every sprite and resolves collisions.
+
+        Args:
+            inputs (Inputs): The player controls for this frame, none pressed when omitted.
+        """
+        if not self.run:
+            return
+        self.ticks += 1
+        profiler = self.profiler
+        with profiler.phase('timers'):
+            self.scheduler.advance(self.ticks)
+        with profiler.phase('spaceship'):
+            self.spaceship_group.update(inputs)
+        with profiler.phase('move_aliens'):
+            self.move_aliens()
+        with profiler.phase('alien_lasers'):
+            self.alien_lasers_group.update()
+        with profiler.phase('mystery_ship'):
+            self.mystery_ship_group.update()
+        with profiler.phase('collisions'):
+            self.check_for_collisions()
+        if self.run and not self.aliens_group:
+            with profiler.phase('next_wave'):
+                self.next_wave()
+
+    def next_wave(self):
+        """
+        Starts the next wave: the formation comes back lower and the bunkers are repaired.
+
+        The existing alien sprites and bunkers are reused, so changing waves
+        does not allocate anything. The score, lives and player lasers carry over.
+        """
+        self.wave += 1
+        formation = self.formation
+        formation.restore(formation.start[0], get_wave(self.waves, self.wave).start_y,
+                          [[True] * formation.columns for _ in range(formation.rows)])
+        self.aliens_direction = 1
+        self.laser_pool.release_group(self.alien_lasers_group)
+        for obstacle in self.obstacles:
+            obstacle.reset()
+        self.update_difficulty()
+
+    def snapshot(self):
+        """
+        Captures the full state of the game, to branch from it or resume it later.
+
+        Returns:
+            bytes: A compact snapshot, see the snapshot module.
+        """
+        return snapshot.take(self)
+
+    def restore(self, data):
+        """
+        Puts the game back in a state captured by snapshot, reusing its sprites.
+
+        Args:
+            data (bytes): A snapshot of a game with the same layout.
+        """
+        snapshot.restore(self, data)
+        self.update_difficulty()
+
     def game_over(self):
-        """End the game and display the game over message."""
+        """End the game, record its score and display the game over message."""
         self.run = False
-        print("We're under their control now!")
+        self.submit_score()
+        if not self.quiet:
+            print("We're under their control now!")
 
     def reset(self):
         """Reset the game to the initial state, except for the high score."""
         self.run = True
-        self.lives = 3
+        self.lives = self.config.lives
         self.score = 0
+        self.wave = 1
+        self.ticks = 0
+        self.scheduler.clear()
+        self.kills.clear()
+        self.aliens_direction = 1
         self.spaceship_group.sprite.reset()
-        self.aliens_group.empty()
-        self.alien_lasers_group.empty()
+        self.formation.reset()
+        self.laser_pool.release_group(self.alien_lasers_group)
         self.mystery_ship_group.empty()
-        self.create_aliens()
-        self.obstacles = self.create_obstacles()
+        for obstacle in self.obstacles:
+            obstacle.reset()
+        self._submitted = False
+        self.update_difficulty()
+        self.schedule_events()
 
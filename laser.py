@@ -1,24 +1,51 @@
 import pygame
 
+import assets
+
 class Laser(pygame.sprite.Sprite):
     """
     Represents a laser beam in a game, which is a subclass of pygame's Sprite.
     """
 
-    def __init__(self, position, speed, screen_height):
+    def __init__(self, position, speed, screen_height, pool=None):
         """
         Initialize a new Laser instance.
 
         :param position: A tuple (x, y) representing the starting position of the laser.
         :param speed: An integer representing the speed of the laser.
         :param screen_height: An integer representing the height of the game screen, used to check if the laser is off-screen.
+        :param pool: The LaserPool the laser returns to when it is killed, if any.
         """
         super().__init__()  # Call to the parent class (Sprite) constructor.
-        self.image = pygame.Surface((4, 15))  # Create a surface for the laser image.
-        self.image.fill((243, 216, 63))  # Fill the surface with a color to represent the laser.
+        self.image = assets.image('laser')  # Shared image for every laser, a region of the atlas.
+        self.mask = assets.mask(self.image)  # Shared collision mask, every pixel is set.
         self.rect = self.image.get_rect(center=position)  # Get the rectangular area of the surface.
         self.speed = speed  # Set the speed of the laser.
         self.screen_height = screen_height  # Set the screen height to determine bounds.
+        self.pool = pool  # Pool to return to once the laser is killed.
+
+    def reset(self, position, speed, screen_height):
+        """
+        Reinitialize a recycled laser as if it had just been created.
+
+        :param position: A tuple (x, y) representing the starting position of the laser.
+        :param speed: An integer representing the speed of the laser.
+        :param screen_height: An integer representing the height of the game screen.
+        """
+        self.rect.center = position
+        self.speed = speed
+        self.screen_height = screen_height
+
+    def kill(self):
+        """
+        Remove the laser from all groups and hand it back to its pool.
+        """
+        # Lasers can be killed several times in one frame, only release them once.
+        if not self.alive():
+            return
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
 
     def update(self):
         """
@@ -33,4 +60,77 @@ class Laser(pygame.sprite.Sprite):
 
         # If the laser moves off the screen, remove it from all sprite groups.
         if self.rect.y > self.screen_height + 15 or self.rect.y < 0:
-            self.kill()  # Remove the sprite from all sprite groups to which it belongs.
\ No newline at end of file
+            self.kill()  # Remove the sprite from all sprite groups to which it belongs.
+
+
+class LaserPool:
+    """
+    Recycles Laser sprites instead of allocating a new one for every shot.
+
+    Killed lasers are kept in a free list, up to a cap, and handed out again by
+    acquire. Every laser shares the same image, so recycling one only moves its
+    rectangle.
+
+    Attributes:
+        capacity (int): Maximum number of idle lasers kept for reuse.
+        hits (int): Number of acquisitions served by a recycled laser.
+        misses (int): Number of acquisitions that had to create a new laser.
+        live (int): Number of lasers currently handed out and not yet killed.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initialize an empty pool.
+
+        :param capacity: Maximum number of idle lasers kept for reuse.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.live = 0
+        self._free = []
+
+    def acquire(self, position, speed, screen_height):
+        """
+        Return a laser ready to be added to a group, recycled when possible.
+
+        :param position: A tuple (x, y) representing the starting position of the laser.
+        :param speed: An integer representing the speed of the laser.
+        :param screen_height: An integer representing the height of the game screen.
+        :return: The Laser.
+        """
+        self.live += 1
+        if self._free:
+            self.hits += 1
+            laser = self._free.pop()
+            laser.reset(position, speed, screen_height)
+            return laser
+        self.misses += 1
+        return Laser(position, speed, screen_height, self)
+
+    def release(self, laser):
+        """
+        Take back a killed laser, keeping it for reuse if the pool is not full.
+
+        :param laser: The Laser that was killed.
+        """
+        self.live -= 1
+        if len(self._free) < self.capacity:
+            self._free.append(laser)
+
+    def release_group(self, group):
+        """
+        Kill every laser of a group, returning them to their pool.
+
+        :param group: The sprite group holding the lasers.
+        """
+        for laser in group.sprites():
+            laser.kill()
+
+    def stats(self):
+        """
+        Return the pool counters.
+
+        :return: A dict with the hits, misses, live and idle counts.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'live': self.live, 'idle': len(self._free)}
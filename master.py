@@ -1,112 +1,156 @@
-import random
-import sys
-
-import pygame
-
-from game import Game
-
-# Initialize the pygame library
-pygame.init()
-
-# Define screen dimensions and offset
-SCREEN_WIDTH = 750
-SCREEN_HEIGHT = 700
-OFFSET = 50
-
-# Define color constants
-GREY = (29, 29, 27)
-YELLOW = (243, 216, 63)
-
-# Load and set up fonts for rendering text
-font = pygame.font.Font('Font/monogram.ttf', 40)
-level_surface = font.render('BATTLE 01', False, YELLOW)
-game_over_surface = font.render('EARTH LOST', False, YELLOW)
-score_text_surface = font.render('SCORE', False, YELLOW)
-highscore_text_surface = font.render('HIGH-SCORE', False, YELLOW)
-
-# Initialize the game screen
-screen = pygame.display.set_mode(
-    (SCREEN_WIDTH + OFFSET, SCREEN_HEIGHT + 2*OFFSET))
-pygame.display.set_caption("Baelrin's Space Invaders")
+import time
+
+# Startup is timed from here, importing pygame is a good share of it
+started = time.perf_counter()
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import random  # noqa: E402
+import sys  # noqa: E402
+
+import pygame  # noqa: E402
+
+import assets  # noqa: E402
+import config  # noqa: E402
+import snapshot  # noqa: E402
+from game import FRAME_RATE, Game  # noqa: E402
+from profiler import FrameProfiler, StartupReport  # noqa: E402
+from renderer import BACKENDS, YELLOW, create_renderer  # noqa: E402
+from replay import Recorder, apply_frame, encode_frame  # noqa: E402
+from spaceship import Inputs  # noqa: E402
+from telemetry import TelemetryServer  # noqa: E402
+
+startup = StartupReport(started)
+startup.mark('imports')
+
+# Read the command line options
+parser = argparse.ArgumentParser(description="Baelrin's Space Invaders")
+parser.add_argument('--seed', type=int, help='seed of the game, random by default')
+parser.add_argument('--record', metavar='PATH', help='record the session to a replay log')
+parser.add_argument('--name', default='PLAYER', help='name your scores are recorded under on the leaderboard')
+parser.add_argument('--resume', metavar='PATH',
+                    help='continue the game saved in this file, where it is saved again on exit')
+parser.add_argument('--telemetry', metavar='[HOST:]PORT',
+                    help='stream the game state to spectators, see telemetry.py for a headless client')
+parser.add_argument('--startup-report', action='store_true',
+                    help='print how long each phase of the startup took, once the game is running')
+parser.add_argument('--renderer', choices=BACKENDS, default='software',
+                    help='draw with the CPU (software) or the GPU through SDL (sdl2)')
+config.add_arguments(parser)
+args = parser.parse_args()
+settings = config.from_args(parser, args)
+if args.record and args.resume:
+    parser.error('a resumed game cannot be recorded, replays start from a fresh game')
+seed = args.seed if args.seed is not None else random.randrange(2**32)
+telemetry = None
+if args.telemetry:
+    host, _, port = args.telemetry.rpartition(':')
+    if not port.isdigit():
+        parser.error(f'--telemetry expects [HOST:]PORT, not {args.telemetry!r}')
+    telemetry = TelemetryServer(host or '127.0.0.1', int(port))
+startup.mark('arguments')
+
+# Initialize only the pygame modules the first frame needs, audio is started once it is shown
+pygame.display.init()
+pygame.font.init()
+startup.mark('pygame_init')
+
+# Open the window, sized by the configuration, with the renderer that draws in it
+renderer = create_renderer(args.renderer,
+                           (settings.screen_width + settings.offset, settings.screen_height + 2*settings.offset),
+                           settings.offset, settings.font_size, "Baelrin's Space Invaders")
+startup.mark('window')
+
+# Build and convert the image atlas once, before any sprite needs it
+assets.preload(sounds=False)
+startup.mark('assets')
 
 # Set up the clock for controlling frame rate
 clock = pygame.time.Clock()
 
-# Create a new game instance
-game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, OFFSET)
-
-# Define custom events for shooting lasers and spawning mystery ships
-SHOOT_LASER = pygame.USEREVENT
-pygame.time.set_timer(SHOOT_LASER, 300)
-
-MYSTERYSHIP = pygame.USEREVENT + 1
-pygame.time.set_timer(MYSTERYSHIP, random.randint(4000, 8000))
+# Create a new game instance, its timed events count played frames so sessions can be replayed
+game = Game(settings, rng=random.Random(seed), audio=False, player_name=args.name)
+recorder = Recorder(args.record, seed, settings) if args.record else None
+if args.resume and os.path.exists(args.resume):
+    # A save that cannot be read starts a fresh game instead of failing on every start.
+    try:
+        with open(args.resume, 'rb') as file:
+            game.restore(file.read())
+    except (OSError, ValueError) as error:
+        print(f'Could not resume the game saved in {args.resume}, starting a new one: {error}', file=sys.stderr)
+startup.mark('game')
+
+# Show the first frame, then start what it does not need: the mixer, sounds and music, and the telemetry server
+renderer.present(renderer.draw(game))
+startup.mark('first_frame')
+startup.frame_shown()
+game.start_audio()
+startup.mark('audio')
+if telemetry is not None:
+    try:
+        telemetry.start()
+    except OSError as error:
+        parser.error(f'cannot start the telemetry server: {error}')
+    startup.mark('telemetry')
+if args.startup_report:
+    print(startup.format())
+
+# Time every phase of the loop: F3 toggles the overlay, F4 exports the timings
+profiler = FrameProfiler()
+game.profiler = renderer.profiler = profiler
+show_profiler = False
+profiler_font = assets.font('monogram', 20)
 
 # Main game loop
 while True:
     # Event handling loop
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if event.type == SHOOT_LASER and game.run:
-            game.alien_shoot_laser()
-
-        if event.type == MYSTERYSHIP and game.run:
-            game.create_mystery_ship()
-            pygame.time.set_timer(MYSTERYSHIP, random.randint(4000, 8000))
-
-        # Process key presses
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE] and game.run is False:
-            game.reset()
-
-    # Update game state
-    if game.run:
-        game.spaceship_group.update()
-        game.move_aliens()
-        game.alien_lasers_group.update()
-        game.mystery_ship_group.update()
-        game.check_for_collisions()
-
-    # Clear screen and draw UI elements
-    screen.fill(GREY)
-
-    # Draw the UI elements on the screen
-    pygame.draw.rect(screen, YELLOW, (10, 10, 780, 780), 2, 0, 60, 60, 60)
-    pygame.draw.line(screen, YELLOW, (25, 730), (775, 730), 3)
-
-    # Display the current level or game over text
-    if game.run:
-        screen.blit(level_surface, (570, 740, 50, 50))
-    else:
-        screen.blit(game_over_surface, (570, 740, 50, 50))
-
-    # Display player lives
-    x = 50
-    for _ in range(game.lives):
-        screen.blit(game.spaceship_group.sprite.image, (x, 745))
-        x += 50
-
-    # Render and display the score and highscore
-    formatted_score = str(game.score).zfill(5)
-    formatted_highscore = str(game.highscore).zfill(5)
-    score_surface = font.render(formatted_score, False, YELLOW)
-    highscore_surface = font.render(formatted_highscore, False, YELLOW)
-    screen.blit(score_text_surface, (50, 15, 50, 50))
-    screen.blit(score_surface, (50, 40, 50, 50))
-    screen.blit(highscore_text_surface, (550, 15, 50, 50))
-    screen.blit(highscore_surface, (625, 40, 50, 50))
-
-    # Draw game entities on the screen
-    game.spaceship_group.draw(screen)
-    game.spaceship_group.sprite.lasers_group.draw(screen)
-    for obstacle in game.obstacles:
-        obstacle.blocks_group.draw(screen)
-    game.aliens_group.draw(screen)
-    game.alien_lasers_group.draw(screen)
-    game.mystery_ship_group.draw(screen)
-
-    # Update the display and maintain frame rate
-    pygame.display.update()
-    clock.tick(60)
+    with profiler.phase('events'):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                if recorder is not None:
+                    recorder.close(game)
+                if args.resume:
+                    try:
+                        snapshot.save(game, args.resume)
+                    except OSError as error:
+                        print(f'Could not save the game to {args.resume}: {error}', file=sys.stderr)
+                # Record the game in progress, unless it is resumed later, and wait for the leaderboard to be saved
+                if not args.resume:
+                    game.submit_score()
+                game.scores.close()
+                if telemetry is not None:
+                    telemetry.close()
+                pygame.quit()
+                sys.exit()
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_profiler = not show_profiler
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                profiler.export_json('profile.json')
+                profiler.export_csv('profile.csv')
+
+        # Process key presses, space restarts the game once it is over
+        inputs = Inputs.from_keyboard()
+        frame = encode_frame(inputs, reset=inputs.fire and not game.run)
+        if recorder is not None:
+            recorder.record(frame)
+        inputs = apply_frame(game, frame)
+
+    # Update game state, and hand it over to the spectators without waiting for them
+    game.update(inputs)
+    if telemetry is not None:
+        telemetry.publish(game)
+
+    # Draw the parts of the frame that changed and push only those to the display
+    dirty = renderer.draw(game)
+    if show_profiler:
+        renderer.draw_overlay(profiler.overlay(profiler_font, YELLOW), (20, 80), dirty)
+    renderer.present(dirty)
+
+    profiler.count('aliens', len(game.aliens_group))
+    profiler.count('player_lasers', len(game.spaceship_group.sprite.lasers_group))
+    profiler.count('alien_lasers', len(game.alien_lasers_group))
+    profiler.count('dirty_rects', len(dirty))
+    profiler.end_frame()
+    clock.tick(FRAME_RATE)
@@ -1,29 +1,10 @@
-import itertools
-import pygame
-
-class Block(pygame.sprite.Sprite):
-    """A Block is a sprite for representing objects in a game.
-
-    It inherits from pygame's Sprite class. It is displayed as a small square
-    with a specified color filled in it.
+import functools
 
-    Attributes:
-        image (pygame.Surface): The surface drawn as the sprite's image.
-        rect (pygame.Rect): The rectangle defining the position and size of the image.
-    """
-
-    def __init__(self, x, y):
-        """Initializes a Block instance with specified top-left corner position.
-
-        Args:
-            x (int): The x-coordinate of the top-left corner of the block.
-            y (int): The y-coordinate of the top-left corner of the block.
-        """
-        super().__init__()
-        self.image = pygame.Surface((3, 3))  # Size of the block
-        self.image.fill((243, 216, 63))  # Yellow color
-        self.rect = self.image.get_rect(topleft=(x, y))  # Positioned at (x, y)
+import pygame
 
+# Size in pixels of a single bunker cell.
+BLOCK_SIZE = 3
+BLOCK_COLOR = (243, 216, 63)  # Yellow color
 
 # Define a 2D array to represent the presence (1) or absence (0) of blocks.
 grid = [
@@ -41,30 +22,138 @@ grid = [
     [1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1],
     [1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1]]
 
+
+@functools.lru_cache(maxsize=None)
+def _grid_mask(pattern):
+    """Returns the cells of an intact bunker, built once per pattern."""
+    mask = pygame.mask.Mask((len(pattern[0]), len(pattern)))
+    for row, values in enumerate(pattern):
+        for column, value in enumerate(values):
+            if value == 1:
+                mask.set_at((column, row))
+    return mask
+
+
+@functools.lru_cache(maxsize=None)
+def _footprint(shape, block_size, phase_x, phase_y):
+    """Returns the cells touched by the set pixels of a mask, computed once per mask and alignment.
+
+    Args:
+        shape (pygame.mask.Mask): A shared sprite mask.
+        block_size (int): Size in pixels of a cell.
+        phase_x (int): Horizontal position of the mask within its first cell, below block_size.
+        phase_y (int): Vertical position of the mask within its first cell, below block_size.
+
+    Returns:
+        pygame.mask.Mask: One bit per cell covered by the mask, the first cell at (0, 0).
+    """
+    width, height = shape.get_size()
+    footprint = pygame.mask.Mask(((phase_x + width + block_size - 1) // block_size,
+                                  (phase_y + height + block_size - 1) // block_size))
+    for y in range(height):
+        for x in range(width):
+            if shape.get_at((x, y)):
+                footprint.set_at(((phase_x + x) // block_size, (phase_y + y) // block_size))
+    return footprint
+
+
 class Obstacle:
-    """An Obstacle represents a collection of blocks arranged in a specific pattern.
+    """An Obstacle represents a bunker made of cells arranged in a specific pattern.
 
-    It creates a group of Block instances forming the shape defined in a grid.
+    The state of every cell is kept in a single pygame Mask, one bit per cell,
+    instead of one sprite per cell. Hits clear the affected cells directly and
+    the bunker is drawn from one cached surface that is only rebuilt after it
+    has been damaged.
 
     Attributes:
-        blocks_group (pygame.sprite.Group): A group containing all Block sprites of the obstacle.
+        rect (pygame.Rect): The area covered by the obstacle on the screen.
+        pattern (tuple): Rows of the intact bunker, 1 for a cell and 0 for a hole.
+        block_size (int): Size in pixels of a cell.
+        cells (pygame.mask.Mask): One bit per cell, set while the cell is intact.
+        version (int): Incremented every time cells are eroded.
     """
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, pattern=None, block_size=BLOCK_SIZE):
         """Initializes an Obstacle instance at a specified location.
 
-        Reads a grid pattern, and creates Block instances for each occupied cell
-        (where grid value is 1). It uses the given (x, y) top-left corner coordinate
-        as the starting point for placing the blocks.
+        Every occupied cell of the pattern (where its value is 1) starts
+        intact. It uses the given (x, y) top-left corner coordinate as the
+        starting point for placing the cells.
 
         Args:
             x (int): The x-coordinate of the top-left corner of the obstacle.
             y (int): The y-coordinate of the top-left corner of the obstacle.
+            pattern (tuple): Rows of the intact bunker, the module's grid when omitted.
+            block_size (int): Size in pixels of a cell.
+        """
+        self.pattern = tuple(tuple(row) for row in (pattern if pattern is not None else grid))
+        self.block_size = block_size
+        columns, rows = len(self.pattern[0]), len(self.pattern)
+        self.rect = pygame.Rect(0, 0, columns * block_size, rows * block_size)
+        self.rect.topleft = (x, y)
+        self.cells = _grid_mask(self.pattern).copy()
+        self._image = pygame.Surface(self.rect.size)
+        self._image.set_colorkey((0, 0, 0))
+        self._dirty = True
+        self.version = 0
+
+    def collide_mask(self, shape, rect):
+        """Checks a sprite mask against the obstacle and erodes every cell its opaque pixels touch.
+
+        The rectangles are compared first, so sprites away from the obstacle
+        cost a single rect test. The cells covered by the mask are cached per
+        mask and alignment within a cell, so a hit costs a single mask
+        overlap and erase.
+
+        Args:
+            shape (pygame.mask.Mask): The mask of the sprite, shared per asset.
+            rect (pygame.Rect): The position of the sprite, the size of the mask.
+
+        Returns:
+            bool: True if at least one intact cell was hit and removed.
+        """
+        if not self.rect.colliderect(rect):
+            return False
+
+        size = self.block_size
+        x, y = rect.x - self.rect.x, rect.y - self.rect.y
+        footprint = _footprint(shape, size, x % size, y % size)
+        position = (x // size, y // size)
+        if self.cells.overlap(footprint, position) is None:
+            return False
+
+        self.cells.erase(footprint, position)
+        self._dirty = True
+        self.version += 1
+        return True
+
+    def reset(self):
+        """Makes every cell of the pattern intact again, reusing the obstacle."""
+        self.restore(memoryview(_grid_mask(self.pattern)).cast('B'))
+
+    def restore(self, cells):
+        """Sets the state of every cell, e.g. from a game snapshot.
+
+        Args:
+            cells (bytes): The buffer of a mask of the same size, as returned by bytes(memoryview(mask)).
+        """
+        memoryview(self.cells).cast('B')[:] = cells
+        self._dirty = True
+        self.version += 1
+
+    @property
+    def image(self):
+        """pygame.Surface: The rendered obstacle, rebuilt only after it changed."""
+        if self._dirty:
+            self.cells.scale(self.rect.size).to_surface(
+                self._image, setcolor=BLOCK_COLOR, unsetcolor=(0, 0, 0))
+            self._dirty = False
+        return self._image
+
+    def draw(self, surface):
+        """Draws the obstacle onto the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
         """
-        self.blocks_group = pygame.sprite.Group()
-        for row, column in itertools.product(range(len(grid)), range(len(grid[0]))):
-            if grid[row][column] == 1:
-                pos_x = x + column * 3  # X position of the block
-                pos_y = y + row * 3    # Y position of the block
-                block = Block(pos_x, pos_y)
-                self.blocks_group.add(block)  # Add the block to the group
\ No newline at end of file
+        surface.blit(self.image, self.rect)
@@ -0,0 +1,77 @@
+import importlib
+
+from spaceship import Inputs
+
+
+def idle_policy(rng):
+    """
+    Never moves nor fires. Useful as a baseline.
+
+    Args:
+        rng (random.Random): Random number generator of the episode.
+
+    Returns:
+        callable: Maps a Simulation to the Inputs of the next step.
+    """
+    return lambda simulation: Inputs.NONE
+
+
+def random_policy(rng):
+    """
+    Presses every control at random, independently on every step.
+
+    Args:
+        rng (random.Random): Random number generator of the episode.
+
+    Returns:
+        callable: Maps a Simulation to the Inputs of the next step.
+    """
+    return lambda simulation: Inputs(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.5)
+
+
+def sweep_policy(rng):
+    """
+    Fires continuously while sweeping the spaceship from one side to the other.
+
+    Args:
+        rng (random.Random): Random number generator of the episode, picks the first direction.
+
+    Returns:
+        callable: Maps a Simulation to the Inputs of the next step.
+    """
+    state = {'right': rng.random() < 0.5}
+
+    def policy(simulation):
+        spaceship = simulation.game.spaceship_group.sprite
+        if spaceship.rect.right >= spaceship.screen_width:
+            state['right'] = False
+        elif spaceship.rect.left <= spaceship.offset:
+            state['right'] = True
+        return Inputs(not state['right'], state['right'], True)
+
+    return policy
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'random': random_policy,
+    'sweep': sweep_policy,
+}
+
+
+def resolve_policy(name):
+    """
+    Returns the policy factory registered under a name.
+
+    Args:
+        name (str): A name from POLICIES, or 'module:function' to import a custom factory.
+
+    Returns:
+        callable: Takes a random.Random and returns a policy.
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, attribute = name.partition(':')
+    if not attribute:
+        raise ValueError(f"Unknown policy {name!r}, expected one of {sorted(POLICIES)} or 'module:function'")
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,265 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+
+class _Phase:
+    """Context manager timing one phase of the current frame."""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        timings = self.profiler._current
+        timings[self.name] = timings.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _NullPhase:
+    """Context manager that does nothing, used when profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler:
+    """A profiler that records nothing, the default of Game and Renderer."""
+
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        """Returns a context manager that does nothing."""
+        return self._phase
+
+    def count(self, name, value):
+        """Ignores an entity count."""
+
+
+class FrameProfiler:
+    """
+    Times each phase of the main loop and keeps rolling statistics.
+
+    Wrap every phase of a frame in phase(name) and call end_frame once the
+    frame is done. The durations of the last frames are kept per phase, along
+    with entity counts recorded through count, so percentiles can be shown on
+    screen or exported for analysis.
+
+    Attributes:
+        window (int): Number of frames kept for the statistics and exports.
+        frames (collections.deque): Per-frame records, oldest first.
+        frame_index (int): Number of frames recorded since the profiler was created.
+    """
+
+    def __init__(self, window=600):
+        """
+        Initialize an empty profiler.
+
+        Args:
+            window (int): Number of frames kept for the statistics and exports.
+        """
+        self.window = window
+        self.frames = deque(maxlen=window)
+        self.frame_index = 0
+        self._current = {}
+        self._counts = {}
+        self._frame_start = time.perf_counter()
+        self._overlay = None
+        self._overlay_frame = -1
+
+    def phase(self, name):
+        """
+        Returns a context manager adding the time spent in its block to a phase.
+
+        Args:
+            name (str): Name of the phase, e.g. 'move_aliens'.
+        """
+        return _Phase(self, name)
+
+    def count(self, name, value):
+        """
+        Records an entity count for the current frame.
+
+        Args:
+            name (str): Name of the count, e.g. 'aliens'.
+            value (int): The count.
+        """
+        self._counts[name] = value
+
+    def end_frame(self):
+        """Closes the current frame and stores its timings and counts."""
+        now = time.perf_counter()
+        self._current['frame'] = now - self._frame_start
+        self.frames.append({
+            'index': self.frame_index,
+            'timings': self._current,
+            'counts': self._counts,
+        })
+        self.frame_index += 1
+        self._current = {}
+        self._counts = {}
+        self._frame_start = now
+
+    def phases(self):
+        """Returns the names of every phase seen in the window, in first-seen order."""
+        names = {}
+        for frame in self.frames:
+            names.update(dict.fromkeys(frame['timings']))
+        return list(names)
+
+    def percentiles(self, name, quantiles=(50, 95, 99)):
+        """
+        Computes percentiles of a phase duration over the window.
+
+        Args:
+            name (str): Name of the phase.
+            quantiles (tuple): Percentiles to compute.
+
+        Returns:
+            dict: Duration in milliseconds for each percentile, e.g. {'p50': 0.4}.
+        """
+        samples = sorted(frame['timings'].get(name, 0.0) for frame in self.frames)
+        if not samples:
+            return {f'p{quantile}': 0.0 for quantile in quantiles}
+        last = len(samples) - 1
+        return {f'p{quantile}': samples[round(last * quantile / 100)] * 1000 for quantile in quantiles}
+
+    def summary(self):
+        """Returns the percentiles of every phase and the latest entity counts."""
+        return {
+            'frames': len(self.frames),
+            'phases': {name: self.percentiles(name) for name in self.phases()},
+            'counts': self.frames[-1]['counts'] if self.frames else {},
+        }
+
+    def export_json(self, path):
+        """
+        Writes the summary and every frame of the window to a JSON file.
+
+        Args:
+            path (str): Destination file.
+        """
+        with open(path, 'w') as file:
+            json.dump({'summary': self.summary(), 'frames': list(self.frames)}, file, indent=1)
+
+    def export_csv(self, path):
+        """
+        Writes one row per frame of the window, with a column per phase (in ms) and per count.
+
+        Args:
+            path (str): Destination file.
+        """
+        phases = self.phases()
+        counts = {}
+        for frame in self.frames:
+            counts.update(dict.fromkeys(frame['counts']))
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['frame'] + [f'{name}_ms' for name in phases] + list(counts))
+            for frame in self.frames:
+                writer.writerow(
+                    [frame['index']]
+                    + [round(frame['timings'].get(name, 0.0) * 1000, 4) for name in phases]
+                    + [frame['counts'].get(name, '') for name in counts])
+
+    def overlay(self, font, color, refresh=30):
+        """
+        Returns a surface listing the percentiles of every phase and the entity counts.
+
+        The surface is only rendered again every few frames to keep its own cost low.
+
+        Args:
+            font (pygame.font.Font): Font of the overlay text.
+            color (tuple): RGB text color.
+            refresh (int): Number of frames between two renders.
+
+        Returns:
+            pygame.Surface: The overlay.
+        """
+        if self._overlay is not None and self.frame_index - self._overlay_frame < refresh:
+            return self._overlay
+        lines = ['phase            p50    p95    p99 ms']
+        for name in self.phases():
+            values = self.percentiles(name)
+            lines.append(f"{name:<15}{values['p50']:>6.2f} {values['p95']:>6.2f} {values['p99']:>6.2f}")
+        if self.frames:
+            lines.append('  '.join(f'{name} {value}' for name, value in self.frames[-1]['counts'].items()))
+        rendered = [font.render(line, False, color) for line in lines]
+        height = font.get_linesize()
+        self._overlay = pygame.Surface(
+            (max(line.get_width() for line in rendered) + 8, height * len(rendered) + 8))
+        for index, line in enumerate(rendered):
+            self._overlay.blit(line, (4, 4 + index * height))
+        self._overlay_frame = self.frame_index
+        return self._overlay
+
+
+class StartupReport:
+    """
+    Times the phases of starting the game, from the first line of the program.
+
+    Call mark at the end of every phase, the time since the previous mark is
+    recorded under the name of the phase. Call frame_shown once the first
+    frame is on screen: the phases marked after it were deferred and do not
+    count towards the time to the first frame.
+
+    Attributes:
+        started (float): When the program started, in time.perf_counter seconds.
+        phases (list): Name and duration in seconds of every phase, in order.
+        first_frame (float): Seconds from the start to the first frame, None until it is shown.
+    """
+
+    def __init__(self, started=None):
+        """
+        Start timing.
+
+        Args:
+            started (float): When the program started, in time.perf_counter seconds, now when omitted.
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []
+        self.first_frame = None
+        self._last = self.started
+
+    def mark(self, name):
+        """
+        Ends a phase.
+
+        Args:
+            name (str): Name of the phase, e.g. 'window'.
+        """
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def frame_shown(self):
+        """Records that the first frame is on screen, the phases marked later are deferred ones."""
+        self.first_frame = time.perf_counter() - self.started
+
+    def format(self):
+        """
+        Lays the report out as text, one phase per line.
+
+        Returns:
+            str: The report.
+        """
+        lines = [f'{name:<16}{duration * 1000:8.1f} ms' for name, duration in self.phases]
+        if self.first_frame is not None:
+            lines.append(f"{'to first frame':<16}{self.first_frame * 1000:8.1f} ms")
+        lines.append(f"{'total':<16}{(self._last - self.started) * 1000:8.1f} ms")
+        return '\n'.join(lines)
@@ -0,0 +1,367 @@
+from collections import namedtuple
+
+import pygame
+
+import assets
+from profiler import NullProfiler
+
+# Define color constants
+GREY = (29, 29, 27)
+YELLOW = (243, 216, 63)
+
+# Rendering backends accepted by create_renderer.
+BACKENDS = ('software', 'sdl2')
+
+HudLayout = namedtuple('HudLayout', 'frame line score_label highscore_label score highscore level lives life_spacing')
+HudLayout.__doc__ = """
+Where the frame and HUD items are drawn on the screen.
+
+Attributes:
+    frame (pygame.Rect): The rounded frame around the screen.
+    line (tuple): Start and end points of the line above the bottom HUD.
+    score_label (tuple): Top-left corner of the SCORE label.
+    highscore_label (tuple): Top-left corner of the HIGH-SCORE label.
+    score (tuple): Top-left corner of the score.
+    highscore (tuple): Top-left corner of the highscore.
+    level (tuple): Top-left corner of the wave label.
+    lives (tuple): Top-left corner of the first life icon.
+    life_spacing (int): Horizontal distance between two life icons.
+"""
+
+
+def hud_layout(width, height, offset, font_size=40):
+    """
+    Lays the HUD out along the edges of the screen.
+
+    The line above the bottom HUD stays just below the game area, and the
+    distances of the texts from the edges grow with the font size. Larger
+    fonts need a larger offset to fit in the margins.
+
+    Args:
+        width (int): Width of the screen.
+        height (int): Height of the screen.
+        offset (int): Offset used for positioning elements.
+        font_size (int): Size of the HUD font.
+
+    Returns:
+        HudLayout: The positions of the HUD items.
+    """
+    def scaled(value):
+        return round(value * font_size / 40)
+
+    bottom = height - 2 * offset + 30
+    return HudLayout(
+        frame=pygame.Rect(10, 10, width - 20, height - 20),
+        line=((25, bottom), (width - 25, bottom)),
+        score_label=(offset, 15),
+        highscore_label=(width - scaled(250), 15),
+        score=(offset, 15 + scaled(25)),
+        highscore=(width - scaled(175), 15 + scaled(25)),
+        level=(width - scaled(230), bottom + scaled(10)),
+        lives=(offset, bottom + scaled(15)),
+        life_spacing=scaled(50),
+    )
+
+
+class BaseRenderer:
+    """
+    The interface of the rendering backends and the HUD they share.
+
+    A backend draws a Game without the game knowing about it: it reads the
+    sprites, bunkers and HUD values and keeps whatever it needs to draw them
+    (surfaces, textures) to itself. Backends implement draw, present,
+    draw_overlay and invalidate, and are created by create_renderer.
+
+    Attributes:
+        size (tuple): Width and height of the frame.
+        offset (int): Offset used for positioning elements.
+        layout (HudLayout): Where the HUD items are drawn.
+        font (pygame.font.Font): Font of the HUD texts.
+        profiler (FrameProfiler): Times the drawing phases, records nothing by default.
+    """
+
+    def __init__(self, size, offset, font_size=40):
+        """
+        Prepare the HUD.
+
+        Args:
+            size (tuple): Width and height of the frame.
+            offset (int): Offset used for positioning elements.
+            font_size (int): Size of the HUD font, the HUD is laid out from it and the frame size.
+        """
+        self.size = tuple(size)
+        self.offset = offset
+        self.layout = hud_layout(*self.size, offset, font_size)
+        self.font = assets.font('monogram', font_size)
+        self.game_over_surface = self.font.render('EARTH LOST', False, YELLOW)
+        self._texts = {}
+        self._levels = {}
+        self.profiler = NullProfiler()
+
+    def create_background(self):
+        """Renders the frame and the labels that never change."""
+        background = pygame.Surface(self.size)
+        layout = self.layout
+        background.fill(GREY)
+        pygame.draw.rect(background, YELLOW, layout.frame, 2, 0, 60, 60, 60)
+        pygame.draw.line(background, YELLOW, *layout.line, 3)
+        background.blit(self.font.render('SCORE', False, YELLOW), layout.score_label)
+        background.blit(self.font.render('HIGH-SCORE', False, YELLOW), layout.highscore_label)
+        return background
+
+    def text(self, value):
+        """Returns the rendered text of a score, rasterizing it only the first time it is needed."""
+        surface = self._texts.get(value)
+        if surface is None:
+            if len(self._texts) > 16:
+                self._texts.clear()
+            surface = self._texts[value] = self.font.render(str(value).zfill(5), False, YELLOW)
+        return surface
+
+    def level(self, wave):
+        """Returns the rendered label of a wave, rasterizing it only the first time it is needed."""
+        surface = self._levels.get(wave)
+        if surface is None:
+            surface = self._levels[wave] = self.font.render(f'BATTLE {wave:02}', False, YELLOW)
+        return surface
+
+    def static_items(self, game):
+        """
+        Lists the items that only need drawing when they change or get uncovered.
+
+        Yields:
+            tuple: A slot name, a key that changes whenever the item must be
+            redrawn, the surface to draw (or None) and its position.
+        """
+        for index, obstacle in enumerate(game.obstacles):
+            yield ('obstacle', index), (obstacle, obstacle.version), obstacle.image, obstacle.rect
+        layout = self.layout
+        yield 'score', game.score, self.text(game.score), pygame.Rect(layout.score, (0, 0))
+        yield 'highscore', game.highscore, self.text(game.highscore), pygame.Rect(layout.highscore, (0, 0))
+        level = self.level(game.wave) if game.run else self.game_over_surface
+        yield 'level', level, level, pygame.Rect(layout.level, (0, 0))
+        life = game.spaceship_group.sprite.image
+        x, y = layout.lives
+        for index in range(max(game.lives, game.config.lives)):
+            icon = life if index < game.lives else None
+            yield ('life', index), icon, icon, pygame.Rect(x + layout.life_spacing * index, y, 0, 0)
+
+    def moving_sprites(self, game):
+        """Returns every sprite that may move between two frames."""
+        game.formation.sync()
+        sprites = game.spaceship_group.sprites()
+        sprites += game.spaceship_group.sprite.lasers_group.sprites()
+        sprites += game.aliens_group.sprites()
+        sprites += game.alien_lasers_group.sprites()
+        sprites += game.mystery_ship_group.sprites()
+        return sprites
+
+    def invalidate(self):
+        """Forces the next frame to be drawn entirely, e.g. after the window was exposed."""
+
+    def draw(self, game):
+        """
+        Draws a frame of the game.
+
+        Args:
+            game (Game): The game to draw.
+
+        Returns:
+            list: The rectangles of the frame that changed.
+        """
+        raise NotImplementedError
+
+    def present(self, dirty):
+        """
+        Shows the frame.
+
+        Args:
+            dirty (list): Rectangles returned by draw.
+        """
+        raise NotImplementedError
+
+    def draw_overlay(self, surface, position, dirty):
+        """
+        Draws a surface above the frame, such as the profiler overlay.
+
+        Args:
+            surface (pygame.Surface): The surface to draw.
+            position (tuple): Top-left corner of the surface on the frame.
+            dirty (list): Rectangles returned by draw, the overlay area is added to it.
+        """
+        raise NotImplementedError
+
+
+class Renderer(BaseRenderer):
+    """
+    Software backend: draws the game onto a surface, redrawing only what changed since the last frame.
+
+    The background frame and the static HUD labels are rendered once. Every
+    frame the renderer restores the background under the sprites drawn in the
+    previous frame. It then redraws the bunkers and HUD items that changed or
+    were uncovered, and draws the moving sprites on top. Score texts are only
+    rasterized again when the score or highscore changes. draw returns the
+    list of screen areas that changed, ready for pygame.display.update.
+
+    All of this, life icons included, is collected into one list and drawn
+    with a single Surface.blits call per frame. The sprite images are regions
+    of the assets atlas, so most of the list draws from the same surface.
+
+    Attributes:
+        screen (pygame.Surface): The surface drawn on, usually the display.
+        background (pygame.Surface): The frame and static labels, drawn once.
+    """
+
+    def __init__(self, screen, offset, font_size=40):
+        """
+        Prepare the static parts of the frame.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            offset (int): Offset used for positioning elements.
+            font_size (int): Size of the HUD font, the HUD is laid out from it and the screen size.
+        """
+        super().__init__(screen.get_size(), offset, font_size)
+        self.screen = screen
+        self.background = self.create_background().convert(screen)
+        self._areas = {}
+        self._drawn = {}
+        self._previous = []
+        self._full = True
+
+    def invalidate(self):
+        """Forces the next frame to be drawn entirely, e.g. after the window was exposed."""
+        self._full = True
+
+    def area(self, image):
+        """
+        Returns the surface to draw an image from and the area of it to copy.
+
+        Images of the atlas are drawn as their region of the atlas, which is
+        cheaper than blitting them as subsurfaces.
+
+        Args:
+            image (pygame.Surface): The image to draw.
+
+        Returns:
+            tuple: The source surface and its area, None for the whole surface.
+        """
+        found = self._areas.get(image)
+        if found is None:
+            parent = image.get_parent()
+            if parent is not None:
+                found = (parent, pygame.Rect(image.get_offset(), image.get_size()))
+            else:
+                found = (image, None)
+            if len(self._areas) > 64:
+                self._areas.clear()
+            self._areas[image] = found
+        return found
+
+    def draw(self, game):
+        """
+        Draws a frame of the game.
+
+        Args:
+            game (Game): The game to draw.
+
+        Returns:
+            list: The rectangles of the screen that changed.
+        """
+        screen = self.screen
+        background = self.background
+        profiler = self.profiler
+        with profiler.phase('draw_batch'):
+            if self._full:
+                self._drawn.clear()
+                self._previous = []
+                batch = [(background, (0, 0))]
+                dirty = [screen.get_rect()]
+            else:
+                # Uncover what the moving sprites hid in the previous frame.
+                batch = [(background, rect, rect) for rect in self._previous]
+                dirty = list(self._previous)
+
+            # Redraw the static items that changed or were uncovered.
+            for slot, key, surface, rect in self.static_items(game):
+                drawn = self._drawn.get(slot)
+                changed = drawn is None or drawn[0] != key
+                if changed and drawn is not None:
+                    batch.append((background, drawn[1], drawn[1]))
+                    dirty.append(drawn[1])
+                if surface is not None:
+                    rect = surface.get_rect(topleft=rect.topleft)
+                if changed or rect.collidelist(self._previous) != -1:
+                    if surface is not None:
+                        source, area = self.area(surface)
+                        batch.append((source, rect, area))
+                    dirty.append(rect)
+                self._drawn[slot] = (key, rect)
+
+            sprites = []
+            for sprite in self.moving_sprites(game):
+                source, area = self.area(sprite.image)
+                sprites.append((source, sprite.rect, area))
+            batch += sprites
+
+        with profiler.phase('draw_blits'):
+            drawn = screen.blits(batch)
+        # The sprites come last, their drawn areas are uncovered on the next frame.
+        current = drawn[len(drawn) - len(sprites):]
+        dirty.extend(current)
+        self._previous = current
+        self._full = False
+        return dirty
+
+    def present(self, dirty):
+        """
+        Pushes the changed areas of the screen to the display.
+
+        Args:
+            dirty (list): Rectangles returned by draw.
+        """
+        with self.profiler.phase('display_update'):
+            pygame.display.update(dirty)
+
+    def draw_overlay(self, surface, position, dirty):
+        """
+        Draws a surface above the frame, such as the profiler overlay.
+
+        The area is restored from the background on the next frame.
+
+        Args:
+            surface (pygame.Surface): The surface to draw.
+            position (tuple): Top-left corner of the surface on the screen.
+            dirty (list): Rectangles returned by draw, the overlay area is added to it.
+        """
+        rect = self.screen.blit(surface, position)
+        self._previous.append(rect)
+        dirty.append(rect)
+
+
+def create_renderer(backend, size, offset, font_size=40, caption=''):
+    """
+    Opens the window of a rendering backend and returns the renderer drawing in it.
+
+    'software' draws with the CPU on the display surface, redrawing only what
+    changed. 'sdl2' draws with the GPU through pygame._sdl2, which is only
+    imported when selected. Both run headless with SDL's dummy video driver.
+
+    Args:
+        backend (str): One of BACKENDS.
+        size (tuple): Width and height of the window.
+        offset (int): Offset used for positioning elements.
+        font_size (int): Size of the HUD font.
+        caption (str): Title of the window.
+
+    Returns:
+        BaseRenderer: The renderer.
+    """
+    if backend == 'software':
+        screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+        return Renderer(screen, offset, font_size)
+    if backend == 'sdl2':
+        from sdl2_renderer import TextureRenderer
+        return TextureRenderer(size, offset, font_size, caption)
+    raise ValueError(f'unknown rendering backend {backend!r}, expected one of {", ".join(BACKENDS)}')
@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import os
+import random
+import struct
+import sys
+import zlib
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import config  # noqa: E402
+from game import Game  # noqa: E402
+from spaceship import Inputs  # noqa: E402
+
+# Bits of the byte recorded for every frame.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+RESET = 8
+
+MAGIC = b'SIRL'
+VERSION = 3
+# Magic, version, seed, frame count, final score, state hash and length of the configuration that follows.
+HEADER = struct.Struct('<4sBQIq32sH')
+
+
+def encode_frame(inputs, reset=False):
+    """
+    Packs the inputs of one frame into a single byte.
+
+    Timed events are scheduled in ticks by the game itself, from its seeded
+    generator, so they do not need to be recorded.
+
+    Args:
+        inputs (Inputs): The player controls of the frame.
+        reset (bool): Whether a restart was requested during the frame.
+
+    Returns:
+        int: The recorded frame.
+    """
+    return ((LEFT if inputs.left else 0) | (RIGHT if inputs.right else 0) | (FIRE if inputs.fire else 0)
+            | (RESET if reset else 0))
+
+
+def apply_frame(game, frame):
+    """
+    Applies the restart of a recorded frame to a game.
+
+    The interactive loop and the replay both go through this function, so a
+    frame is always handled the same way.
+
+    Args:
+        game (Game): The game to drive.
+        frame (int): The recorded frame.
+
+    Returns:
+        Inputs: The controls to update the game with.
+    """
+    if frame & RESET and not game.run:
+        game.reset()
+    return Inputs(bool(frame & LEFT), bool(frame & RIGHT), bool(frame & FIRE))
+
+
+def state_hash(game):
+    """
+    Computes a digest of the game state, used to check that a replay ends like the original game.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        bytes: A SHA-256 digest.
+    """
+    game.formation.sync()
+    digest = hashlib.sha256()
+    digest.update(repr((
+        game.score, game.lives, game.run, game.ticks, game.wave, game.aliens_direction, game.scheduler.pending(),
+        game.spaceship_group.sprite.laser_ready,
+        game.formation.x, game.formation.y, game.formation.alive,
+        tuple(game.spaceship_group.sprite.rect),
+        [tuple(laser.rect) for laser in game.spaceship_group.sprite.lasers_group],
+        [tuple(laser.rect) for laser in game.alien_lasers_group],
+        [tuple(ship.rect) for ship in game.mystery_ship_group],
+    )).encode())
+    for obstacle in game.obstacles:
+        digest.update(bytes(memoryview(obstacle.cells)))
+    return digest.digest()
+
+
+class Recorder:
+    """
+    Records the frames of a game to a compact binary log.
+
+    The log holds the seed and configuration of the game, one byte per frame
+    with the controls, and the final score and state hash used to verify replays.
+
+    Attributes:
+        path (str): Destination file.
+        seed (int): Seed of the recorded game.
+        settings (Config): Configuration of the recorded game.
+        frames (bytearray): The recorded frames.
+    """
+
+    def __init__(self, path, seed, settings=config.DEFAULT_CONFIG):
+        """
+        Start a recording.
+
+        Args:
+            path (str): Destination file, written by close.
+            seed (int): Seed of the game's random number generator.
+            settings (Config): Configuration of the recorded game.
+        """
+        self.path = path
+        self.seed = seed
+        self.settings = settings
+        self.frames = bytearray()
+
+    def record(self, frame):
+        """
+        Appends a frame to the recording.
+
+        Args:
+            frame (int): The frame, as returned by encode_frame.
+        """
+        self.frames.append(frame)
+
+    def close(self, game):
+        """
+        Writes the log, ending with the final state of the game.
+
+        Args:
+            game (Game): The recorded game.
+        """
+        settings = config.dumps(self.settings).encode()
+        header = HEADER.pack(MAGIC, VERSION, self.seed, len(self.frames), game.score, state_hash(game),
+                             len(settings))
+        with open(self.path, 'wb') as file:
+            file.write(header + settings + zlib.compress(bytes(self.frames), 9))
+
+
+def load(path):
+    """
+    Reads a recording.
+
+    Args:
+        path (str): The log file.
+
+    Returns:
+        tuple: The seed, the configuration, the frames, the final score and the final state hash.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, seed, count, score, digest, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is not a version {VERSION} replay log')
+    settings = config.loads(data[HEADER.size:HEADER.size + length].decode())
+    frames = zlib.decompress(data[HEADER.size + length:])
+    if len(frames) != count:
+        raise ValueError(f'{path} is truncated: {len(frames)} of {count} frames')
+    return seed, settings, frames, score, digest
+
+
+def replay(seed, frames, settings=config.DEFAULT_CONFIG):
+    """
+    Plays recorded frames again on a headless game, as fast as possible.
+
+    Args:
+        seed (int): Seed of the recorded game.
+        frames (bytes): The recorded frames.
+        settings (Config): Configuration of the recorded game.
+
+    Returns:
+        Game: The game in its final state.
+    """
+    game = Game(settings, rng=random.Random(seed), audio=False, highscore_file=None, quiet=True)
+    for frame in frames:
+        game.update(apply_frame(game, frame))
+    return game
+
+
+def verify(path):
+    """
+    Replays a log and compares the final score and state with the recorded ones.
+
+    Args:
+        path (str): The log file.
+
+    Returns:
+        tuple: Whether the replay matched, the recorded score and the replayed score.
+    """
+    seed, settings, frames, score, digest = load(path)
+    game = replay(seed, frames, settings)
+    return game.score == score and state_hash(game) == digest, score, game.score
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded games headless and verify their outcome.')
+    parser.add_argument('paths', nargs='+', help='replay logs, or directories of .sirl logs')
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.sirl'))
+        else:
+            paths.append(path)
+
+    failures = 0
+    for path in paths:
+        matched, expected, actual = verify(path)
+        failures += not matched
+        print(f"{'ok  ' if matched else 'FAIL'} {path}: score {actual} (recorded {expected})")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import random
+import statistics
+import sys
+from collections import namedtuple
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import config  # noqa: E402
+from policies import resolve_policy  # noqa: E402
+from simulation import Simulation  # noqa: E402
+
+# Message sent by a worker once its whole episode budget is done.
+_DONE = 'done'
+
+
+class EpisodeResult(namedtuple('EpisodeResult', [
+        'worker', 'episode', 'seed', 'score', 'lives_lost', 'ticks', 'kills'])):
+    """
+    The outcome of one headless episode.
+
+    Attributes:
+        worker (int): Index of the worker that played the episode.
+        episode (int): Index of the episode within its worker.
+        seed (int): Seed of the episode, enough to replay it with the same policy.
+        score (int): Final score.
+        lives_lost (int): Number of lives lost during the episode.
+        ticks (int): Number of frames survived.
+        kills (dict): Number of aliens killed, keyed by alien type.
+    """
+    __slots__ = ()
+
+
+def play_episode(simulation, policy_factory, seed, max_ticks=None):
+    """
+    Plays one episode on a simulation.
+
+    Args:
+        simulation (Simulation): The simulation to reuse, it is reset with the seed.
+        policy_factory (callable): Takes a random.Random and returns a policy.
+        seed (int): Seed of the episode.
+        max_ticks (int): Maximum number of frames, unlimited when omitted.
+
+    Returns:
+        tuple: The score, lives lost, ticks survived and kills by alien type.
+    """
+    simulation.reset(seed)
+    game = simulation.game
+    start_lives = game.lives
+    simulation.run(policy_factory(random.Random(seed)), max_ticks)
+    return game.score, start_lives - game.lives, game.ticks, dict(game.kills)
+
+
+def _worker(worker_id, seed, policy, episodes, max_ticks, settings, connection):
+    """Plays an episode budget and sends every result as soon as it is known.
+
+    Results are written to the pipe before the next episode starts, with no
+    buffering thread in between, so a worker killed at any point has already
+    delivered every episode it finished.
+    """
+    policy_factory = resolve_policy(policy)
+    seeds = random.Random(seed)
+    simulation = Simulation(seed, settings)
+    for episode in range(episodes):
+        episode_seed = seeds.randrange(2**32)
+        outcome = play_episode(simulation, policy_factory, episode_seed, max_ticks)
+        connection.send(EpisodeResult(worker_id, episode, episode_seed, *outcome))
+    connection.send((_DONE, worker_id))
+    connection.close()
+
+
+def run_episodes(episodes, workers=None, seed=0, policy='random', max_ticks=None, failures=None,
+                 settings=config.DEFAULT_CONFIG):
+    """
+    Fans episodes out across worker processes and yields results as they arrive.
+
+    Each worker gets its own seed, derived from the base seed, and its share of
+    the episodes, and sends its results through a pipe of its own. A worker
+    that crashes only loses the episode it was playing: every result it sent
+    before is still yielded. A worker whose pipe closes before it reported
+    being done has crashed.
+
+    Args:
+        episodes (int): Total number of episodes to play.
+        workers (int): Number of worker processes, one per CPU when omitted.
+        seed (int): Base seed of the run.
+        policy (str): Name of the policy, see policies.resolve_policy.
+        max_ticks (int): Maximum number of frames per episode, unlimited when omitted.
+        failures (list): If given, receives the index and exit code of every crashed worker.
+        settings (Config): The layout and tuning of the games, see the config module.
+
+    Yields:
+        EpisodeResult: The result of each finished episode, in completion order.
+    """
+    resolve_policy(policy)
+    workers = max(1, min(workers or os.cpu_count() or 1, episodes))
+    # Maps the reading end of each worker's pipe to the worker index and process.
+    workers_by_pipe = {}
+    for worker_id in range(workers):
+        budget = episodes // workers + (worker_id < episodes % workers)
+        reader, writer = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_worker, args=(worker_id, seed + worker_id, policy, budget, max_ticks, settings, writer),
+            daemon=True)
+        process.start()
+        # Only the worker keeps the writing end, so the pipe closes when the worker exits.
+        writer.close()
+        workers_by_pipe[reader] = (worker_id, process)
+
+    try:
+        while workers_by_pipe:
+            for reader in multiprocessing.connection.wait(list(workers_by_pipe)):
+                worker_id, process = workers_by_pipe[reader]
+                try:
+                    message = reader.recv()
+                except EOFError:
+                    del workers_by_pipe[reader]
+                    reader.close()
+                    process.join()
+                    if failures is not None:
+                        failures.append((worker_id, process.exitcode))
+                    print(f'Worker {worker_id} stopped with exit code {process.exitcode}', file=sys.stderr)
+                    continue
+                if isinstance(message, EpisodeResult):
+                    yield message
+                else:
+                    del workers_by_pipe[reader]
+                    reader.close()
+                    process.join()
+    finally:
+        for reader, (_, process) in workers_by_pipe.items():
+            reader.close()
+            process.terminate()
+
+
+def summarize(results):
+    """
+    Aggregates episode results into summary statistics.
+
+    Args:
+        results (list): EpisodeResult instances.
+
+    Returns:
+        dict: Number of episodes, score statistics, mean lives lost and ticks, and kills by alien type.
+    """
+    if not results:
+        return {'episodes': 0}
+    scores = [result.score for result in results]
+    kills = {}
+    for result in results:
+        for alien_type, count in result.kills.items():
+            kills[alien_type] = kills.get(alien_type, 0) + count
+    return {
+        'episodes': len(results),
+        'score_mean': statistics.fmean(scores),
+        'score_stdev': statistics.pstdev(scores),
+        'score_median': statistics.median(scores),
+        'score_min': min(scores),
+        'score_max': max(scores),
+        'lives_lost_mean': statistics.fmean(result.lives_lost for result in results),
+        'ticks_mean': statistics.fmean(result.ticks for result in results),
+        'kills': {str(alien_type): kills[alien_type] for alien_type in sorted(kills)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play headless episodes across a process pool.')
+    parser.add_argument('--episodes', type=int, default=100, help='total number of episodes')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, one per CPU by default')
+    parser.add_argument('--seed', type=int, default=0, help='base seed of the run')
+    parser.add_argument('--policy', default='random', help="policy name or 'module:function'")
+    parser.add_argument('--max-ticks', type=int, default=None, help='frame budget of an episode')
+    parser.add_argument('--output', help='file receiving one JSON line per episode as they finish')
+    config.add_arguments(parser)
+    args = parser.parse_args(argv)
+    settings = config.from_args(parser, args)
+
+    output = open(args.output, 'a') if args.output else None
+    results = []
+    failures = []
+    try:
+        for result in run_episodes(args.episodes, args.workers, args.seed, args.policy, args.max_ticks,
+                                   failures, settings):
+            results.append(result)
+            if output is not None:
+                output.write(json.dumps(result._asdict()) + '\n')
+                output.flush()
+    finally:
+        if output is not None:
+            output.close()
+    print(json.dumps(summarize(results), indent=2))
+    # Crashed workers are reported on the standard error, the exit status tells scripts about them.
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
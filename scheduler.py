@@ -0,0 +1,114 @@
+import heapq
+import itertools
+
+
+class Scheduler:
+    """
+    Runs named events at given game ticks, in place of wall-clock timers.
+
+    Events are kept in a priority queue ordered by due tick, then by the order
+    they were scheduled in, so events due on the same tick always run in the
+    same order. Time only moves when the game advances a tick, which makes
+    timed events independent of the frame rate: they can run faster than real
+    time, and dropped frames never make them skip or bunch up.
+
+    Handlers are registered by name rather than stored with each event, so the
+    pending events can be captured in a snapshot and restored in another game.
+
+    Attributes:
+        tick (int): The tick the scheduler was last advanced to.
+    """
+
+    def __init__(self):
+        """Create an empty scheduler at tick 0."""
+        self.tick = 0
+        self._handlers = {}
+        self._queue = []
+        self._sequence = itertools.count()
+
+    def register(self, name, handler):
+        """
+        Sets the function called when events of a name fall due.
+
+        Args:
+            name (str): Name of the events.
+            handler (callable): Called without arguments.
+        """
+        self._handlers[name] = handler
+
+    def is_registered(self, name):
+        """
+        Tells whether events of a name have a handler.
+
+        Args:
+            name (str): Name of the events.
+
+        Returns:
+            bool: True if a handler was registered for the name.
+        """
+        return name in self._handlers
+
+    def schedule(self, name, delay, interval=0):
+        """
+        Schedules an event.
+
+        Args:
+            name (str): Name of the event, its handler must be registered before it falls due.
+            delay (int): Number of ticks from now until the event runs, at least 1.
+            interval (int): Number of ticks between repetitions, 0 to run the event once.
+        """
+        heapq.heappush(self._queue, (self.tick + max(delay, 1), next(self._sequence), name, interval))
+
+    def cancel(self, name):
+        """
+        Removes every pending event of a name.
+
+        Args:
+            name (str): Name of the events.
+        """
+        self._queue[:] = [event for event in self._queue if event[2] != name]
+        heapq.heapify(self._queue)
+
+    def clear(self):
+        """Removes every pending event and moves back to tick 0."""
+        self._queue.clear()
+        self.tick = 0
+
+    def advance(self, tick):
+        """
+        Moves to a tick and runs every event due by then, in due order.
+
+        Repeating events are scheduled again before their handler runs, so a
+        handler can cancel its own event.
+
+        Args:
+            tick (int): The tick to move to.
+        """
+        self.tick = tick
+        queue = self._queue
+        while queue and queue[0][0] <= tick:
+            due, _, name, interval = heapq.heappop(queue)
+            if interval:
+                heapq.heappush(queue, (due + interval, next(self._sequence), name, interval))
+            self._handlers[name]()
+
+    def pending(self):
+        """
+        Lists the pending events, in the order they will run.
+
+        Returns:
+            list: (due tick, name, interval) of every event.
+        """
+        return [(due, name, interval) for due, _, name, interval in sorted(self._queue)]
+
+    def restore(self, tick, events):
+        """
+        Replaces the pending events, e.g. from a game snapshot.
+
+        Args:
+            tick (int): The current tick.
+            events (list): (due tick, name, interval) of every event, as returned by pending.
+        """
+        self.tick = tick
+        self._queue[:] = [(due, next(self._sequence), name, interval) for due, name, interval in events]
+        heapq.heapify(self._queue)
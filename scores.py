@@ -0,0 +1,197 @@
+import json
+import os
+import tempfile
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+# File the highscore was kept in by older versions, next to the leaderboard, as a bare number.
+LEGACY_FILE = 'highscore.txt'
+
+ScoreEntry = namedtuple('ScoreEntry', 'score name date duration')
+ScoreEntry.__doc__ = """
+A finished game on the leaderboard.
+
+Attributes:
+    score (int): Final score.
+    name (str): Name of the player.
+    date (str): When the game ended, as an ISO 8601 timestamp.
+    duration (float): Length of the game in seconds.
+"""
+
+
+class ScoreStore:
+    """
+    Keeps the leaderboard in memory and saves it to disk in the background.
+
+    Submitting a score only updates the in-memory leaderboard and wakes a
+    writer thread. The writer waits for the interval to pass so a burst of
+    updates results in a single write, then replaces the file atomically so
+    a crash never leaves a truncated leaderboard behind.
+
+    Attributes:
+        path (str): JSON file the leaderboard is kept in, or None to keep it in memory only.
+        size (int): Number of entries kept on the leaderboard.
+        interval (float): Seconds to wait for more updates before writing.
+        entries (list): The leaderboard, best score first.
+    """
+
+    def __init__(self, path, size=10, interval=1.0):
+        """
+        Create a store and load the leaderboard from its file.
+
+        Args:
+            path (str): JSON file the leaderboard is kept in, or None to keep it in memory only.
+            size (int): Number of entries kept on the leaderboard.
+            interval (float): Seconds to wait for more updates before writing.
+        """
+        self.path = path
+        self.size = size
+        self.interval = interval
+        self.entries = []
+        self._pending = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self.load()
+
+    @property
+    def best(self):
+        """The best score on the leaderboard, 0 when it is empty."""
+        return self.entries[0].score if self.entries else 0
+
+    def load(self):
+        """
+        Reads the leaderboard from the file, replacing the entries in memory.
+
+        When the file is missing, the highscore of older versions is
+        imported from LEGACY_FILE next to it, if there is one, and saved to
+        the file in the background. A file holding a bare number becomes a
+        single entry. A corrupt file is reported and gives an empty
+        leaderboard.
+
+        Returns:
+            list: The leaderboard, best score first.
+        """
+        entries = []
+        imported = False
+        if self.path is not None:
+            try:
+                with open(self.path, 'r') as file:
+                    data = json.load(file)
+            except FileNotFoundError:
+                data = self._read_legacy()
+                imported = data is not None
+            except (json.JSONDecodeError, UnicodeDecodeError) as error:
+                print(f'Could not read the scores from {self.path}: {error}')
+                data = None
+            if isinstance(data, int) and not isinstance(data, bool):
+                data = [{'score': data, 'name': '???', 'date': '', 'duration': 0.0}]
+            try:
+                entries = sorted((ScoreEntry(**entry) for entry in data or []), key=lambda entry: -entry.score)
+            except TypeError as error:
+                print(f'Could not read the scores from {self.path}: {error}')
+                entries = []
+        with self._condition:
+            self.entries = entries[:self.size]
+            self._pending = imported
+            if imported:
+                self._start()
+                self._condition.notify()
+        return self.entries
+
+    def _read_legacy(self):
+        """Returns the highscore kept in LEGACY_FILE by older versions, None if there is none."""
+        path = os.path.join(os.path.dirname(self.path), LEGACY_FILE)
+        try:
+            with open(path, 'r') as file:
+                return int(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def submit(self, score, name, duration, date=None):
+        """
+        Adds a finished game to the leaderboard and schedules a background save.
+
+        Args:
+            score (int): Final score.
+            name (str): Name of the player.
+            duration (float): Length of the game in seconds.
+            date (str): When the game ended, now by default.
+
+        Returns:
+            int: The rank of the game on the leaderboard starting at 0, or None if it did not make it.
+        """
+        if date is None:
+            date = datetime.now().isoformat(timespec='seconds')
+        entry = ScoreEntry(score, name, date, round(duration, 2))
+        with self._condition:
+            rank = next((index for index, other in enumerate(self.entries) if score > other.score),
+                        len(self.entries))
+            if rank >= self.size:
+                return None
+            self.entries.insert(rank, entry)
+            del self.entries[self.size:]
+            if self.path is not None:
+                self._pending = True
+                self._start()
+                self._condition.notify()
+        return rank
+
+    def save(self):
+        """Writes the pending changes now, without waiting for the writer thread."""
+        with self._write_lock:
+            with self._condition:
+                entries = self._take()
+            if entries is not None:
+                self._write(entries)
+
+    def close(self):
+        """Stops the writer thread after it has saved the pending changes."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def _start(self):
+        """Starts the writer thread on the first change, called with the condition held."""
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name='ScoreStore', daemon=True)
+            self._thread.start()
+
+    def _take(self):
+        """Returns a copy of the entries if they need saving, called with the condition held."""
+        if not self._pending:
+            return None
+        self._pending = False
+        return list(self.entries)
+
+    def _run(self):
+        """Body of the writer thread, saves the leaderboard once updates settle."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                self._condition.wait_for(lambda: self._closed, self.interval)
+                closed = self._closed
+            self.save()
+            if closed:
+                return
+
+    def _write(self, entries):
+        """Replaces the file atomically with the given entries."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temporary = tempfile.mkstemp(prefix='.scores-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(handle, 'w') as file:
+                json.dump([entry._asdict() for entry in entries], file, indent=1)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.path)
+        except OSError as error:
+            print(f'Could not save the scores to {self.path}: {error}')
+            if os.path.exists(temporary):
+                os.remove(temporary)
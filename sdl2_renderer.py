@@ -0,0 +1,138 @@
+import pygame
+from pygame._sdl2 import video
+
+from renderer import BaseRenderer
+
+
+class TextureRenderer(BaseRenderer):
+    """
+    Hardware backend: draws the game with the GPU through SDL's render API.
+
+    The images live in GPU memory as textures: the assets atlas and the
+    background are uploaded once, and every frame is drawn by copying regions
+    of them, so no pixels go through the CPU. Every frame is drawn entirely,
+    which costs the GPU little and needs no bookkeeping of what moved. Bunker
+    and HUD textures are only uploaded again when their key from static_items
+    changes, e.g. when a bunker is eroded or the score changes.
+
+    SDL picks an accelerated renderer when the platform has one and falls back
+    to its software renderer otherwise, which is how the backend runs
+    headless with the dummy video driver.
+
+    Attributes:
+        window (pygame._sdl2.video.Window): The window drawn in.
+        renderer (pygame._sdl2.video.Renderer): The SDL renderer of the window.
+        background (pygame._sdl2.video.Texture): The frame and static labels, uploaded once.
+    """
+
+    def __init__(self, size, offset, font_size=40, caption='', hidden=False):
+        """
+        Open the window and upload the static parts of the frame.
+
+        Args:
+            size (tuple): Width and height of the window.
+            offset (int): Offset used for positioning elements.
+            font_size (int): Size of the HUD font, the HUD is laid out from it and the window size.
+            caption (str): Title of the window.
+            hidden (bool): Whether to keep the window hidden, e.g. to draw frames for to_surface only.
+        """
+        super().__init__(size, offset, font_size)
+        self.window = video.Window(caption, size=self.size, hidden=hidden)
+        self.renderer = video.Renderer(self.window, accelerated=-1)
+        self.background = video.Texture.from_surface(self.renderer, self.create_background())
+        self._textures = {}
+        self._drawn = {}
+
+    def texture(self, image):
+        """
+        Returns the texture to draw an image from and the area of it to copy.
+
+        Images of the atlas are drawn as their region of the atlas texture,
+        which is uploaded the first time it is needed. Other images get a
+        texture of their own.
+
+        Args:
+            image (pygame.Surface): The image to draw.
+
+        Returns:
+            tuple: The texture and its area, None for the whole texture.
+        """
+        found = self._textures.get(image)
+        if found is None:
+            parent = image.get_parent()
+            if parent is not None:
+                found = (self.texture(parent)[0], pygame.Rect(image.get_offset(), image.get_size()))
+            else:
+                found = (video.Texture.from_surface(self.renderer, image), None)
+            self._textures[image] = found
+        return found
+
+    def draw(self, game):
+        """
+        Draws a frame of the game.
+
+        Args:
+            game (Game): The game to draw.
+
+        Returns:
+            list: The rectangle of the whole window, every frame is drawn entirely.
+        """
+        with self.profiler.phase('draw_batch'):
+            items = []
+            for slot, key, surface, rect in self.static_items(game):
+                drawn = self._drawn.get(slot)
+                if drawn is None or drawn[0] != key:
+                    # Bunkers keep drawing on the same surface, so only atlas regions can be looked up.
+                    if surface is None:
+                        found = (None, None)
+                    elif surface.get_parent() is None:
+                        found = (video.Texture.from_surface(self.renderer, surface), None)
+                    else:
+                        found = self.texture(surface)
+                    drawn = self._drawn[slot] = (key, *found)
+                if drawn[1] is not None:
+                    items.append((drawn[1], drawn[2], rect.topleft))
+            for sprite in self.moving_sprites(game):
+                texture, area = self.texture(sprite.image)
+                items.append((texture, area, sprite.rect.topleft))
+
+        with self.profiler.phase('draw_blits'):
+            self.background.draw()
+            for texture, area, (x, y) in items:
+                if area is None:
+                    texture.draw(dstrect=(x, y))
+                else:
+                    texture.draw(srcrect=area, dstrect=(x, y, area.width, area.height))
+        return [pygame.Rect((0, 0), self.size)]
+
+    def present(self, dirty):
+        """
+        Shows the frame in the window.
+
+        Args:
+            dirty (list): Rectangles returned by draw.
+        """
+        with self.profiler.phase('display_update'):
+            self.renderer.present()
+
+    def draw_overlay(self, surface, position, dirty):
+        """
+        Draws a surface above the frame, such as the profiler overlay.
+
+        The surface is uploaded to a texture that is only used for this frame.
+
+        Args:
+            surface (pygame.Surface): The surface to draw.
+            position (tuple): Top-left corner of the surface in the window.
+            dirty (list): Rectangles returned by draw, left as they are since the whole window is redrawn.
+        """
+        video.Texture.from_surface(self.renderer, surface).draw(dstrect=position)
+
+    def to_surface(self):
+        """
+        Reads the frame back from the GPU, e.g. to compare it with the software backend.
+
+        Returns:
+            pygame.Surface: A copy of the frame drawn since the last present.
+        """
+        return self.renderer.to_surface()
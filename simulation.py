@@ -0,0 +1,138 @@
+import random
+
+from config import DEFAULT_CONFIG
+from game import FRAME_RATE, Game
+from spaceship import Inputs
+
+# Duration of one frame of the interactive game, in milliseconds.
+FRAME_MS = 1000 / FRAME_RATE
+
+# Share of a frame that rounding errors of summed durations may miss a whole frame by.
+_TOLERANCE = 1e-9
+
+
+class Simulation:
+    """
+    Headless, fixed-timestep driver around a Game.
+
+    Every timed event of the game is scheduled in ticks by the game itself,
+    so a game can be advanced with step as fast as the CPU allows, without a
+    display, a mixer or an event queue. The timestep is fixed: the game
+    always advances by whole frames of the interactive game, FRAME_MS
+    milliseconds each, however long the steps are. Every random decision is
+    taken from a seeded generator, which makes a run fully reproducible from
+    its seed and its inputs.
+
+    Attributes:
+        seed (int): The seed of the random number generator.
+        rng (random.Random): The random number generator shared with the game.
+        game (Game): The simulated game.
+    """
+
+    def __init__(self, seed=None, config=DEFAULT_CONFIG, **game_options):
+        """
+        Create a simulation and its game.
+
+        Args:
+            seed (int): Seed of the random number generator, a random seed is drawn when omitted.
+            config (Config): The layout and tuning of the game, see the config module.
+            **game_options: Extra keyword arguments passed to Game. Audio, highscore
+                persistence and the game over message are disabled unless given here.
+        """
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        game_options.setdefault('audio', False)
+        game_options.setdefault('highscore_file', None)
+        game_options.setdefault('quiet', True)
+        self.game = Game(config, rng=self.rng, **game_options)
+        self._frames = 0.0
+
+    @property
+    def tick(self):
+        """int: Number of frames played since the last reset."""
+        return self.game.ticks
+
+    @property
+    def time(self):
+        """float: Simulated time since the last reset, in milliseconds."""
+        return self.game.ticks * FRAME_MS
+
+    def reset(self, seed=None):
+        """
+        Restart the game, optionally with a new seed.
+
+        Args:
+            seed (int): New seed of the random number generator. The current seed is kept when omitted.
+        """
+        if seed is not None:
+            self.seed = seed
+        self.rng.seed(self.seed)
+        self.game.reset()
+        self._frames = 0.0
+
+    def snapshot(self):
+        """
+        Captures the state of the simulation, its pending timed events included.
+
+        Returns:
+            bytes: The snapshot, restore it with restore.
+        """
+        return self.game.snapshot()
+
+    def restore(self, data):
+        """
+        Puts the simulation back in a state captured by snapshot.
+
+        The part of a frame carried over by step is dropped, so every branch
+        restored from a snapshot starts on a frame boundary.
+
+        Args:
+            data (bytes): A snapshot of a simulation with the same layout.
+        """
+        self.game.restore(data)
+        self._frames = 0.0
+
+    def step(self, inputs=Inputs.NONE, dt=FRAME_MS):
+        """
+        Advance the simulation by a duration, one frame by default.
+
+        The duration is played as whole frames with the same controls held
+        during all of them. What is left of it, less than a frame, is carried
+        over to the next step, so e.g. two steps of half a frame play one frame.
+
+        Args:
+            inputs (Inputs): The player controls during the step.
+            dt (float): Duration of the step in milliseconds.
+
+        Returns:
+            bool: True while the game is running, False once it is over.
+
+        Raises:
+            ValueError: If dt is negative.
+        """
+        if dt < 0:
+            raise ValueError(f'dt must not be negative, not {dt} ms')
+        self._frames += dt / FRAME_MS
+        frames = int(self._frames + _TOLERANCE)
+        self._frames = max(self._frames - frames, 0.0)
+        game = self.game
+        for _ in range(frames):
+            if not game.run:
+                break
+            game.update(inputs)
+        return game.run
+
+    def run(self, policy, max_ticks=None):
+        """
+        Play until the game is over or the tick budget is spent.
+
+        Args:
+            policy (callable): Called with the simulation before every step, returns the Inputs to use.
+            max_ticks (int): Maximum number of steps, unlimited when omitted.
+
+        Returns:
+            int: The final score.
+        """
+        while self.game.run and (max_ticks is None or self.tick < max_ticks):
+            self.step(policy(self))
+        return self.game.score
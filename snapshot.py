@@ -0,0 +1,186 @@
+import os
+import struct
+import tempfile
+
+from alien import MysteryShip
+from bits import pack_bits, unpack_bits
+
+MAGIC = b'SISS'
+VERSION = 4
+
+# Magic and version, formation geometry and position, wave, game state, spaceship,
+# mystery ship, then the number of player lasers, alien lasers and obstacles, the
+# bytes of cells per obstacle and the number of timed events.
+HEADER = struct.Struct('<4sBHHiiHb?hqqIIII?ii??iiiHHHIH')
+# Center and speed of a laser.
+LASER = struct.Struct('<iii')
+# Due tick, interval and name length of a timed event, followed by its name.
+EVENT = struct.Struct('<IIB')
+# State words and index of the Mersenne Twister, then the cached gaussian if any.
+RNG = struct.Struct('<625I?d')
+
+
+def take(game):
+    """
+    Captures the full state of a game as bytes.
+
+    The snapshot holds the formation and wave, bunker cells, lasers, mystery ship,
+    lives, score, alien direction, pending timed events (the laser cooldown
+    among them) and random generator state.
+
+    Args:
+        game (Game): The game to capture.
+
+    Returns:
+        bytes: The snapshot, see restore.
+    """
+    formation = game.formation
+    spaceship = game.spaceship_group.sprite
+    player_lasers = spaceship.lasers_group.sprites()
+    alien_lasers = game.alien_lasers_group.sprites()
+    ship = game.mystery_ship_group.sprite
+    events = game.scheduler.pending()
+    version, words, gauss = game.rng.getstate()
+
+    parts = [HEADER.pack(
+        MAGIC, VERSION,
+        formation.rows, formation.columns, formation.x, formation.y, game.wave,
+        game.aliens_direction, game.run, game.lives, game.score, game.highscore, game.ticks,
+        game.kills[1], game.kills[2], game.kills[3], game._submitted,
+        spaceship.rect.x, spaceship.rect.y, spaceship.laser_ready,
+        ship is not None, ship.rect.x if ship else 0, ship.rect.y if ship else 0, ship.speed if ship else 0,
+        len(player_lasers), len(alien_lasers), len(game.obstacles),
+        memoryview(game.obstacles[0].cells).nbytes if game.obstacles else 0, len(events))]
+    parts.append(pack_bits(formation.alive))
+    parts.extend(LASER.pack(*laser.rect.center, laser.speed) for laser in player_lasers + alien_lasers)
+    parts.extend(bytes(memoryview(obstacle.cells)) for obstacle in game.obstacles)
+    for due, name, interval in events:
+        name = name.encode()
+        parts.append(EVENT.pack(due, interval, len(name)) + name)
+    parts.append(RNG.pack(*words, gauss is not None, gauss or 0.0))
+    return b''.join(parts)
+
+
+def restore(game, data):
+    """
+    Puts a game back in the state captured by take.
+
+    Sprites already owned by the game are reused, and lasers come from its
+    pool, so restoring does not rebuild the formation or the bunkers. The
+    whole snapshot is checked before the game is touched: a snapshot that is
+    rejected leaves the game as it was.
+
+    Args:
+        game (Game): The game to restore, with the same formation and bunker layout as the captured one.
+        data (bytes): A snapshot returned by take.
+
+    Raises:
+        ValueError: If the data is not a snapshot of a game with the same layout.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError('truncated snapshot')
+    (magic, version, rows, columns, x, y, wave,
+     direction, run, lives, score, highscore, ticks, kills_1, kills_2, kills_3, submitted,
+     ship_x, ship_y, laser_ready,
+     has_mystery, mystery_x, mystery_y, mystery_speed,
+     player_count, alien_count, obstacle_count, obstacle_size, event_count) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'not a version {VERSION} game snapshot')
+    formation = game.formation
+    cell_sizes = {memoryview(obstacle.cells).nbytes for obstacle in game.obstacles}
+    if ((rows, columns) != (formation.rows, formation.columns) or obstacle_count != len(game.obstacles)
+            or cell_sizes - {obstacle_size}):
+        raise ValueError('the snapshot was taken from a game with a different layout')
+
+    alive_offset = HEADER.size
+    laser_offset = alive_offset + (rows * columns + 7) // 8
+    cells_offset = laser_offset + LASER.size * (player_count + alien_count)
+    offset = cells_offset + obstacle_size * obstacle_count
+    events = []
+    for _ in range(event_count):
+        if offset + EVENT.size > len(data):
+            raise ValueError('truncated snapshot')
+        due, interval, length = EVENT.unpack_from(data, offset)
+        offset += EVENT.size
+        try:
+            name = data[offset:offset + length].decode()
+        except UnicodeDecodeError:
+            raise ValueError('corrupt timed event in snapshot') from None
+        if not game.scheduler.is_registered(name):
+            raise ValueError(f'unknown timed event {name!r} in snapshot')
+        events.append((due, name, interval))
+        offset += length
+    if len(data) != offset + RNG.size:
+        raise ValueError('truncated snapshot' if len(data) < offset + RNG.size else 'trailing data after snapshot')
+    *words, has_gauss, gauss = RNG.unpack_from(data, offset)
+    if words[-1] > len(words) - 1:
+        raise ValueError('corrupt random generator state in snapshot')
+
+    formation.restore(x, y, unpack_bits(data[alive_offset:laser_offset], rows, columns))
+
+    spaceship = game.spaceship_group.sprite
+    groups = (spaceship.lasers_group, game.alien_lasers_group)
+    offset = laser_offset
+    for group, count in zip(groups, (player_count, alien_count)):
+        game.laser_pool.release_group(group)
+        for _ in range(count):
+            center_x, center_y, speed = LASER.unpack_from(data, offset)
+            offset += LASER.size
+            group.add(game.laser_pool.acquire((center_x, center_y), speed, game.screen_height))
+
+    offset = cells_offset
+    for obstacle in game.obstacles:
+        obstacle.restore(data[offset:offset + obstacle_size])
+        offset += obstacle_size
+
+    game.mystery_ship_group.empty()
+    if has_mystery:
+        ship = MysteryShip(game.screen_width, game.offset, game.rng)
+        ship.rect.topleft = (mystery_x, mystery_y)
+        ship.speed = mystery_speed
+        game.mystery_ship_group.add(ship)
+
+    spaceship.rect.topleft = (ship_x, ship_y)
+    spaceship.laser_ready = laser_ready
+
+    game.wave = wave
+    game.aliens_direction = direction
+    game.run = run
+    game.lives = lives
+    game.score = score
+    game.highscore = highscore
+    game.ticks = ticks
+    game.kills.clear()
+    game.kills.update({kind: count for kind, count in ((1, kills_1), (2, kills_2), (3, kills_3)) if count})
+    game._submitted = submitted
+    game.scheduler.restore(ticks, events)
+
+    # Last, as creating the mystery ship above draws from the generator.
+    game.rng.setstate((3, tuple(words), gauss if has_gauss else None))
+
+
+def save(game, path):
+    """
+    Writes a snapshot of a game to a file, replacing it atomically.
+
+    A crash while saving leaves the previous file intact, never a partial snapshot.
+
+    Args:
+        game (Game): The game to capture.
+        path (str): Destination file.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(prefix='.snapshot-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(take(game))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
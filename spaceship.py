@@ -1,6 +1,32 @@
+from collections import namedtuple
+
 import pygame
 
-from laser import Laser
+import assets
+from audio import NullVoiceManager
+from laser import LaserPool
+from scheduler import Scheduler
+
+
+class Inputs(namedtuple('Inputs', ['left', 'right', 'fire'])):
+    """
+    The state of the player controls for one frame.
+
+    Attributes:
+        left (bool): Whether the spaceship should move left.
+        right (bool): Whether the spaceship should move right.
+        fire (bool): Whether the spaceship should fire a laser.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_keyboard(cls):
+        """Reads the controls from the keyboard state."""
+        keys = pygame.key.get_pressed()
+        return cls(bool(keys[pygame.K_LEFT]), bool(keys[pygame.K_RIGHT]), bool(keys[pygame.K_SPACE]))
+
+
+Inputs.NONE = Inputs(False, False, False)
 
 class Spaceship(pygame.sprite.Sprite):
     """
@@ -11,59 +37,70 @@ class Spaceship(pygame.sprite.Sprite):
         screen_width (int): The width of the screen.
         screen_height (int): The height of the screen.
         image (Surface): The surface object representing the spaceship image.
+        mask (Mask): The opaque pixels of the image, used for collisions.
         rect (Rect): The rectangular area of the spaceship image.
         speed (int): The speed at which the spaceship moves left or right.
         lasers_group (Group): Group containing all the lasers fired by the spaceship.
         laser_ready (bool): Boolean indicating if the spaceship is ready to fire a laser.
-        laser_time (int): Timestamp of the last fired laser.
-        laser_delay (int): Delay before the spaceship can fire another laser.
-        laser_sound (Sound): Sound object that plays when a laser is fired.
+        laser_delay (int): Number of ticks before the spaceship can fire another laser.
+        sounds (VoiceManager): Plays the laser sound when a laser is fired.
+        scheduler (Scheduler): The game scheduler, which recharges the laser once the delay is over.
+        laser_pool (LaserPool): Pool the lasers are taken from.
+        laser_speed (int): The speed of the lasers fired by the spaceship.
     """
-    def __init__(self, screen_width, screen_height, offset):
+    def __init__(self, screen_width, screen_height, offset, scheduler=None, sounds=None, laser_pool=None,
+                 speed=6, laser_speed=5, laser_delay=18):
         super().__init__()
         self.offset = offset
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.image = pygame.image.load('Graphics/spaceship.png')
+        self.image = assets.image('spaceship')
+        self.mask = assets.mask(self.image)
         self.rect = self.image.get_rect(
             midbottom=((self.screen_width + self.offset)/2, self.screen_height))
-        self.speed = 6
+        self.speed = speed
         self.lasers_group = pygame.sprite.Group()
         self.laser_ready = True
-        self.laser_time = 0
-        self.laser_delay = 300
-        self.laser_sound = pygame.mixer.Sound('Sounds/laser.ogg')
+        self.laser_speed = laser_speed
+        self.laser_delay = laser_delay
+        self.sounds = sounds if sounds is not None else NullVoiceManager()
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.scheduler.register('recharge_laser', self.recharge_laser)
+        self.laser_pool = laser_pool if laser_pool is not None else LaserPool()
 
-    def get_user_input(self):
+    def get_user_input(self, inputs=Inputs.NONE):
         """
         Processes the user input to control the spaceship and fire lasers.
-        """
-        keys = pygame.key.get_pressed()
 
-        if keys[pygame.K_RIGHT] and self.rect is not None:
+        Args:
+            inputs (Inputs): The controls for this frame, none pressed when omitted.
+        """
+        if inputs.right and self.rect is not None:
             self.rect.x += self.speed
 
-        if keys[pygame.K_LEFT] and self.rect is not None:
+        if inputs.left and self.rect is not None:
             self.rect.x -= self.speed
 
-        if keys[pygame.K_SPACE] and self.laser_ready:
+        if inputs.fire and self.laser_ready:
             self.laser_ready = False
             if self.rect is not None:
-                laser = Laser(self.rect.center, 5, self.screen_height)
+                laser = self.laser_pool.acquire(self.rect.center, self.laser_speed, self.screen_height)
                 self.lasers_group.add(laser)
-                self.laser_time = pygame.time.get_ticks()
             else:
                 print("Warning: self.rect is None")
-            self.laser_sound.play()
+            self.scheduler.schedule('recharge_laser', self.laser_delay)
+            self.sounds.play('laser')
 
-    def update(self):
+    def update(self, inputs=Inputs.NONE):
         """
         Updates the spaceship's movement and actions every frame.
+
+        Args:
+            inputs (Inputs): The controls for this frame, none pressed when omitted.
         """
-        self.get_user_input()
+        self.get_user_input(inputs)
         self.constrain_movement()
         self.lasers_group.update()
-        self.recharge_laser()
 
     def constrain_movement(self):
         """
@@ -77,12 +114,11 @@ class Spaceship(pygame.sprite.Sprite):
 
     def recharge_laser(self):
         """
-        Recharges the laser, allowing the spaceship to fire again after a delay.
+        Recharges the laser, allowing the spaceship to fire again.
+
+        Scheduled laser_delay ticks after every shot.
         """
-        if not self.laser_ready:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.laser_time >= self.laser_delay:
-                self.laser_ready = True
+        self.laser_ready = True
 
     def reset(self):
         """
@@ -90,6 +126,8 @@ class Spaceship(pygame.sprite.Sprite):
         """
         if self.image is not None:
             self.rect = self.image.get_rect(midbottom = ((self.screen_width + self.offset)/2, self.screen_height))
-            self.lasers_group.empty()
+            self.laser_pool.release_group(self.lasers_group)
+            self.scheduler.cancel('recharge_laser')
+            self.laser_ready = True
         else:
             print('Error: Image not loaded')
\ No newline at end of file
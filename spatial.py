@@ -0,0 +1,85 @@
+class SpatialGrid:
+    """
+    A uniform grid used as a broad phase for collision checks.
+
+    Items are bucketed by the grid cells their rectangles cover, so a query only
+    has to look at the items stored in the cells around the queried rectangle.
+    Queries return items in the order they were inserted, which keeps collision
+    results identical to iterating over the original sprite group.
+
+    Attributes:
+        cell_size (int): The width and height of a grid cell in pixels.
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_size (int): The width and height of a grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        """Removes every item from the grid."""
+        self._cells.clear()
+        self._count = 0
+
+    def _cell_range(self, rect):
+        """Returns the column and row ranges of the cells covered by a rectangle."""
+        size = self.cell_size
+        columns = range(rect.left // size, (rect.right - 1) // size + 1)
+        rows = range(rect.top // size, (rect.bottom - 1) // size + 1)
+        return columns, rows
+
+    def insert(self, item, rect):
+        """
+        Adds an item to every cell covered by its rectangle.
+
+        Args:
+            item: The object to store, usually a sprite.
+            rect (pygame.Rect): The area covered by the item.
+        """
+        entry = (self._count, item)
+        self._count += 1
+        columns, rows = self._cell_range(rect)
+        for column in columns:
+            for row in rows:
+                self._cells.setdefault((column, row), []).append(entry)
+
+    def build(self, items):
+        """
+        Clears the grid and inserts every item using its own rect attribute.
+
+        Args:
+            items (iterable): Objects with a rect attribute, in the order they should be reported.
+        """
+        self.clear()
+        for item in items:
+            self.insert(item, item.rect)
+
+    def query(self, rect):
+        """
+        Returns the items stored in the cells covered by a rectangle.
+
+        The result is a candidate list: items are near the rectangle but do not
+        necessarily overlap it.
+
+        Args:
+            rect (pygame.Rect): The area to look up.
+
+        Returns:
+            list: Candidate items without duplicates, in insertion order.
+        """
+        found = {}
+        columns, rows = self._cell_range(rect)
+        for column in columns:
+            for row in rows:
+                for order, item in self._cells.get((column, row), ()):
+                    found[order] = item
+        return [found[order] for order in sorted(found)]
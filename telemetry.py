@@ -0,0 +1,495 @@
+import argparse
+import asyncio
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from bits import pack_bits, unpack_bits
+
+MAGIC = b'SITM'
+VERSION = 1
+
+# Sent once to every client when it connects: magic and protocol version.
+HELLO = struct.Struct('<4sB')
+# Kind, tick and payload length of a message, the payload follows.
+MESSAGE = struct.Struct('<BII')
+KEYFRAME = 0
+DELTA = 1
+# Tick and length of a state written to the server process, the state follows.
+FRAME = struct.Struct('<II')
+
+# Tick, score, highscore, lives, wave, run, formation geometry, position and direction,
+# spaceship x, mystery ship presence and x, then the number of obstacles, bytes per
+# obstacle, player lasers and alien lasers.
+STATE = struct.Struct('<Iqqbh?HHiibi?iHHHH')
+# Center of a laser.
+LASER = struct.Struct('<ii')
+
+TelemetryState = namedtuple('TelemetryState', [
+    'tick', 'score', 'highscore', 'lives', 'wave', 'run',
+    'formation', 'direction', 'alive', 'spaceship_x', 'mystery_x',
+    'bunkers', 'player_lasers', 'alien_lasers',
+])
+TelemetryState.__doc__ = """
+The state of a game as seen by a spectator.
+
+Attributes:
+    tick (int): Frames played since the game started.
+    score (int): Current score.
+    highscore (int): Best score on the leaderboard.
+    lives (int): Lives left.
+    wave (int): Current wave, from 1.
+    run (bool): Whether the game is running, False once it is over.
+    formation (tuple): The x and y-coordinates of the formation.
+    direction (int): Direction of the formation, 1 for right and -1 for left.
+    alive (list): Liveness of each formation slot, indexed by [row][column].
+    spaceship_x (int): The x-coordinate of the spaceship.
+    mystery_x (int): The x-coordinate of the mystery ship, None when there is none.
+    bunkers (list): The cells of each bunker, as the bytes of its cell mask.
+    player_lasers (list): Centers of the player lasers.
+    alien_lasers (list): Centers of the alien lasers.
+"""
+
+
+def encode(game):
+    """
+    Packs the state of a game that spectators see into bytes.
+
+    The parts that keep their size come first and the lasers last, so two
+    consecutive states mostly line up byte for byte and their delta is
+    mostly zeros.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        bytes: The state, see decode.
+    """
+    formation = game.formation
+    spaceship = game.spaceship_group.sprite
+    player_lasers = spaceship.lasers_group.sprites()
+    alien_lasers = game.alien_lasers_group.sprites()
+    ship = game.mystery_ship_group.sprite
+    cells = [memoryview(obstacle.cells).cast('B') for obstacle in game.obstacles]
+    parts = [STATE.pack(
+        game.ticks, game.score, game.highscore, game.lives, game.wave, game.run,
+        formation.rows, formation.columns, int(formation.x), int(formation.y), game.aliens_direction,
+        spaceship.rect.x, ship is not None, ship.rect.x if ship else 0,
+        len(cells), cells[0].nbytes if cells else 0, len(player_lasers), len(alien_lasers))]
+    parts.append(pack_bits(formation.alive))
+    parts.extend(cells)
+    parts.extend(LASER.pack(*laser.rect.center) for laser in player_lasers + alien_lasers)
+    return b''.join(parts)
+
+
+def decode(data):
+    """
+    Unpacks a state packed by encode.
+
+    Args:
+        data (bytes): The state.
+
+    Returns:
+        TelemetryState: The state.
+    """
+    (tick, score, highscore, lives, wave, run, rows, columns, x, y, direction, spaceship_x,
+     has_mystery, mystery_x, obstacle_count, obstacle_size, player_count, alien_count) = STATE.unpack_from(data)
+    offset = STATE.size
+    alive_size = (rows * columns + 7) // 8
+    alive = unpack_bits(data[offset:offset + alive_size], rows, columns)
+    offset += alive_size
+    bunkers = []
+    for _ in range(obstacle_count):
+        bunkers.append(data[offset:offset + obstacle_size])
+        offset += obstacle_size
+    lasers = [LASER.unpack_from(data, offset + LASER.size * index) for index in range(player_count + alien_count)]
+    return TelemetryState(tick, score, highscore, lives, wave, run, (x, y), direction, alive, spaceship_x,
+                          mystery_x if has_mystery else None, bunkers, lasers[:player_count], lasers[player_count:])
+
+
+def xor(previous, current):
+    """
+    Returns the delta between two states, or applies a delta to the previous state.
+
+    The previous state is cut or padded with zeros to the length of the
+    current one, so applying the delta gives back a state of that length.
+
+    Args:
+        previous (bytes): The state the delta is relative to.
+        current (bytes): The new state, or a delta returned by this function.
+
+    Returns:
+        bytes: The delta, or the new state.
+    """
+    size = len(current)
+    previous = previous[:size].ljust(size, b'\0')
+    return (int.from_bytes(previous, 'little') ^ int.from_bytes(current, 'little')).to_bytes(size, 'little')
+
+
+def pack_message(kind, tick, payload):
+    """Frames a message, the payload compressed."""
+    payload = zlib.compress(payload, 1)
+    return MESSAGE.pack(kind, tick, len(payload)) + payload
+
+
+class Broadcaster:
+    """
+    Sends the states of a game to every connected client, as keyframes and deltas.
+
+    Runs in the event loop of the server process. Every state is compressed
+    into one message, whose bytes are written to every client, so the cost
+    of a tick barely grows with the number of spectators.
+
+    Clients receive a keyframe holding the full state when they connect and
+    every keyframe_interval ticks, and in between the XOR of each state with
+    the previous one, compressed. A client that does not read fast enough
+    stops receiving messages until its buffer drains, then starts again from
+    a keyframe.
+
+    Attributes:
+        keyframe_interval (int): Ticks between two keyframes.
+        max_buffer (int): Bytes a client may leave unread before it is skipped.
+        sent (int): Bytes of messages sent, over every client.
+    """
+
+    def __init__(self, keyframe_interval=60, max_buffer=1 << 18):
+        """
+        Create a broadcaster without clients.
+
+        Args:
+            keyframe_interval (int): Ticks between two keyframes.
+            max_buffer (int): Bytes a client may leave unread before it is skipped.
+        """
+        self.keyframe_interval = keyframe_interval
+        self.max_buffer = max_buffer
+        self.sent = 0
+        self._writers = {}
+        self._state = None
+        self._keyframe = None
+
+    @property
+    def clients(self):
+        """Number of connected clients."""
+        return len(self._writers)
+
+    async def connected(self, reader, writer):
+        """Greets a client, sends it the current state and keeps it until it disconnects."""
+        writer.write(HELLO.pack(MAGIC, VERSION))
+        # Until it got a keyframe, a client cannot apply deltas.
+        self._writers[writer] = False
+        if self._state is not None:
+            self._write(writer, self._current_keyframe())
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            del self._writers[writer]
+            writer.close()
+
+    def broadcast(self, tick, state):
+        """
+        Sends a state to every client, as a keyframe or as a delta.
+
+        Args:
+            tick (int): Tick of the state.
+            state (bytes): The state, as returned by encode.
+        """
+        previous = self._state
+        self._state = (tick, state)
+        self._keyframe = None
+        if previous is None or tick % self.keyframe_interval == 0:
+            message = self._current_keyframe()
+        else:
+            message = pack_message(DELTA, tick, xor(previous[1], state))
+        for writer, synced in list(self._writers.items()):
+            if writer.transport.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                # Too slow to keep up: skip it, and resynchronize it with a keyframe later.
+                self._writers[writer] = False
+            elif synced:
+                self._write(writer, message)
+            else:
+                self._write(writer, self._current_keyframe())
+
+    def _current_keyframe(self):
+        """Returns the keyframe message of the latest state, packed once per state."""
+        if self._keyframe is None:
+            tick, state = self._state
+            self._keyframe = pack_message(KEYFRAME, tick, state)
+        return self._keyframe
+
+    def _write(self, writer, message):
+        """Queues a message to a client."""
+        writer.write(message)
+        self._writers[writer] = True
+        self.sent += len(message)
+
+
+def _read_frame(source):
+    """Reads a state written by TelemetryServer to the server process, None at the end of the stream."""
+    header = source.read(FRAME.size)
+    if len(header) < FRAME.size:
+        return None
+    tick, length = FRAME.unpack(header)
+    return tick, source.read(length)
+
+
+async def serve(host, port, keyframe_interval=60, max_buffer=1 << 18, source=None, output=None):
+    """
+    Runs the server process: broadcasts the states read from a stream until it ends.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 for any free port.
+        keyframe_interval (int): Ticks between two keyframes.
+        max_buffer (int): Bytes a client may leave unread before it is skipped.
+        source (file): Binary stream of the states, the standard input by default.
+        output (file): Where the port is printed once the server listens, the standard output by default.
+    """
+    source = source or sys.stdin.buffer
+    output = output or sys.stdout
+    broadcaster = Broadcaster(keyframe_interval, max_buffer)
+    server = await asyncio.start_server(broadcaster.connected, host, port)
+    print(server.sockets[0].getsockname()[1], file=output, flush=True)
+    loop = asyncio.get_running_loop()
+    while True:
+        frame = await loop.run_in_executor(None, _read_frame, source)
+        if frame is None:
+            break
+        broadcaster.broadcast(*frame)
+    server.close()
+    tasks = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await server.wait_closed()
+
+
+class TelemetryServer:
+    """
+    Streams the game state to spectators over TCP, without slowing the game down.
+
+    The network side runs in a process of its own, an asyncio server that
+    is fed the packed states through a pipe, so compressing and sending
+    never compete with the game loop for the interpreter. The process does
+    not import pygame, which keeps it quick to start. publish only packs
+    the state and queues it for a thread writing to the pipe; when the queue
+    is full, the state is dropped instead of waiting, and spectators see the
+    next one.
+
+    Attributes:
+        host (str): Interface the server listens on.
+        port (int): Port the server listens on, chosen by the system when 0 was requested.
+        keyframe_interval (int): Ticks between two keyframes.
+        max_buffer (int): Bytes a client may leave unread before it is skipped.
+        dropped (int): States dropped because the server process was behind.
+    """
+
+    def __init__(self, host='127.0.0.1', port=7878, keyframe_interval=60, max_buffer=1 << 18, backlog=64):
+        """
+        Configure the server, which listens once started.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 for any free port.
+            keyframe_interval (int): Ticks between two keyframes.
+            max_buffer (int): Bytes a client may leave unread before it is skipped.
+            backlog (int): States queued for the server process before new ones are dropped.
+        """
+        self.host = host
+        self.port = port
+        self.keyframe_interval = keyframe_interval
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._queue = queue.Queue(backlog)
+        self._process = None
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the server process.
+
+        Returns once the server accepts connections.
+
+        Raises:
+            OSError: If the server cannot listen on the host and port.
+        """
+        self._process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve', '--host', self.host, '--port', str(self.port),
+             '--keyframe-interval', str(self.keyframe_interval), '--max-buffer', str(self.max_buffer)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        line = self._process.stdout.readline()
+        if not line.strip().isdigit():
+            self._process.wait()
+            self._process = None
+            raise OSError(f'the telemetry server could not listen on {self.host}:{self.port}')
+        self.port = int(line)
+        self._thread = threading.Thread(target=self._feed, name='telemetry', daemon=True)
+        self._thread.start()
+
+    def publish(self, game):
+        """
+        Sends the state of a game to every client.
+
+        Only packs the state in the calling thread, and never waits.
+
+        Args:
+            game (Game): The game, usually just updated.
+        """
+        if self._process is not None:
+            try:
+                self._queue.put_nowait((game.ticks, encode(game)))
+            except queue.Full:
+                self.dropped += 1
+
+    def close(self):
+        """
+        Disconnects the clients and stops the server process.
+
+        Never blocks for long, even when the server process died and the queue is full.
+        """
+        if self._process is not None:
+            if self._thread.is_alive():
+                # The stop marker makes room for itself: states still queued are dropped.
+                while True:
+                    try:
+                        self._queue.put_nowait(None)
+                        break
+                    except queue.Full:
+                        try:
+                            self._queue.get_nowait()
+                            self.dropped += 1
+                        except queue.Empty:
+                            pass
+                self._thread.join(5)
+            try:
+                self._process.wait(5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            # Killing the process breaks the pipe a stuck write was waiting on.
+            self._thread.join(1)
+            self._process = self._thread = None
+
+    def _feed(self):
+        """Writes the queued states to the server process, until close."""
+        pipe = self._process.stdin
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                tick, state = item
+                pipe.write(FRAME.pack(tick, len(state)) + state)
+                pipe.flush()
+        except OSError:
+            # The server process is gone, publish keeps queueing until the queue is full
+            # and close no longer waits for this thread.
+            pass
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+async def receive(host='127.0.0.1', port=7878):
+    """
+    Connects to a telemetry server and yields the states it streams.
+
+    Args:
+        host (str): Host of the server.
+        port (int): Port of the server.
+
+    Yields:
+        tuple: The state as a TelemetryState, and the size of the message it came in.
+
+    Raises:
+        ValueError: If the server does not speak this protocol.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        magic, version = HELLO.unpack(await reader.readexactly(HELLO.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'not a version {VERSION} telemetry server')
+        state = None
+        while True:
+            try:
+                header = await reader.readexactly(MESSAGE.size)
+            except asyncio.IncompleteReadError:
+                return
+            kind, tick, length = MESSAGE.unpack(header)
+            payload = zlib.decompress(await reader.readexactly(length))
+            if kind == KEYFRAME:
+                state = payload
+            elif state is not None:
+                state = xor(state, payload)
+            else:
+                continue
+            yield decode(state), MESSAGE.size + length
+    finally:
+        writer.close()
+
+
+async def spectate(host, port, frames=None, output=sys.stdout):
+    """
+    Headless client: prints the streamed game once per second, with the bandwidth it used.
+
+    Args:
+        host (str): Host of the server.
+        port (int): Port of the server.
+        frames (int): Number of states to receive before returning, unlimited when None.
+        output (file): Where to print.
+
+    Returns:
+        int: Number of states received.
+    """
+    count = size = 0
+    last = time.perf_counter()
+    async for state, message_size in receive(host, port):
+        count += 1
+        size += message_size
+        now = time.perf_counter()
+        if now - last >= 1 or count == frames:
+            aliens = sum(map(sum, state.alive))
+            print(f'tick {state.tick:6} score {state.score:6} lives {state.lives} wave {state.wave:2} '
+                  f'aliens {aliens:3} lasers {len(state.player_lasers) + len(state.alien_lasers):2} '
+                  f'{size / count:7.1f} bytes/state', file=output, flush=True)
+            last = now
+        if count == frames:
+            break
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Watch a game streamed by master.py --telemetry, headless.')
+    parser.add_argument('--host', default='127.0.0.1', help='host of the telemetry server')
+    parser.add_argument('--port', type=int, default=7878, help='port of the telemetry server')
+    parser.add_argument('--frames', type=int, help='stop after receiving this many states')
+    parser.add_argument('--serve', action='store_true',
+                        help='run the server process instead, broadcasting the states written to the standard input')
+    parser.add_argument('--keyframe-interval', type=int, default=60, help='with --serve, ticks between two keyframes')
+    parser.add_argument('--max-buffer', type=int, default=1 << 18,
+                        help='with --serve, bytes a client may leave unread before it is skipped')
+    args = parser.parse_args(argv)
+    try:
+        if args.serve:
+            asyncio.run(serve(args.host, args.port, args.keyframe_interval, args.max_buffer))
+        else:
+            asyncio.run(spectate(args.host, args.port, args.frames))
+    except (ConnectionError, OSError) as error:
+        sys.exit(f'telemetry: {error}')
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
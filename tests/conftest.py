@@ -0,0 +1,23 @@
+import os
+import random
+import sys
+
+import pytest
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# The game modules live at the root of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spaceship import Inputs  # noqa: E402
+
+
+@pytest.fixture
+def random_inputs():
+    """Returns a function making a reproducible sequence of controls that moves and fires a lot."""
+    def make(seed, count, fire=0.3):
+        rng = random.Random(seed)
+        return [Inputs(rng.random() < 0.5, rng.random() < 0.5, rng.random() < fire) for _ in range(count)]
+    return make
@@ -0,0 +1,61 @@
+import pygame
+import pytest
+
+import assets
+import audio
+
+
+@pytest.fixture
+def clock():
+    """Returns a manual clock, a list holding the current time in seconds."""
+    return [0.0]
+
+
+@pytest.fixture
+def voices(clock):
+    manager = audio.VoiceManager(clock=lambda: clock[0])
+    yield manager
+    manager.stop()
+    pygame.mixer.quit()
+    # The loaded sounds belong to the mixer that was shut down.
+    assets.clear()
+
+
+def test_requests_within_the_interval_are_coalesced(voices, clock):
+    assert voices.play('explosion')
+    clock[0] += audio.EFFECTS['explosion'].interval / 2
+    assert not voices.play('explosion')
+    # Another effect has its own interval.
+    assert voices.play('laser')
+    clock[0] += audio.EFFECTS['explosion'].interval
+    assert voices.play('explosion')
+    assert voices.stats == {'played': 3, 'coalesced': 1}
+
+
+def test_busy_category_steals_its_oldest_voice(clock):
+    effects = {'laser': audio.Effect('shared', interval=0), 'explosion': audio.Effect('shared', interval=0)}
+    voices = audio.VoiceManager(effects, {'shared': 2}, clock=lambda: clock[0])
+    laser, explosion = assets.sound('laser'), assets.sound('explosion')
+    first, second = pygame.mixer.Channel(0), pygame.mixer.Channel(1)
+    try:
+        for name in ('laser', 'explosion', 'explosion', 'laser'):
+            clock[0] += 1
+            assert voices.play(name)
+        assert (first.get_sound(), second.get_sound()) == (explosion, laser)
+        assert voices.stats == {'played': 4, 'stolen': 2}
+    finally:
+        voices.stop()
+        pygame.mixer.quit()
+        assets.clear()
+
+
+def test_categories_keep_their_own_channels(voices, clock):
+    assert voices.play('laser')
+    for _ in range(audio.CHANNELS['explosions'] + 2):
+        clock[0] += 1
+        assert voices.play('explosion')
+
+    assert voices.stats['stolen'] == 2
+    # The burst of explosions stays on its own channels and leaves the laser playing.
+    assert pygame.mixer.Channel(0).get_sound() == assets.sound('laser')
+    assert not pygame.mixer.Channel(1).get_busy()
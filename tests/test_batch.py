@@ -0,0 +1,94 @@
+import random
+import statistics
+
+import pytest
+
+from config import DEFAULT_CONFIG
+from game import Game
+from simulation import Simulation
+from spaceship import Inputs
+from waves import Wave
+
+np = pytest.importorskip('numpy')
+from batch import BatchSimulation  # noqa: E402
+
+TICKS = 300
+
+
+def summary(values):
+    """Returns the mean of the values and its standard error."""
+    values = [float(value) for value in values]
+    return statistics.fmean(values), statistics.pstdev(values) / len(values) ** 0.5
+
+
+def test_batch_outcomes_match_scalar_simulation():
+    scalar = {'score': [], 'lives': [], 'aliens': []}
+    simulation = Simulation()
+    for seed in range(80):
+        simulation.reset(seed)
+        rng = random.Random(1000 + seed)
+        for _ in range(TICKS):
+            if not simulation.step(Inputs(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.5)):
+                break
+        scalar['score'].append(simulation.game.score)
+        scalar['lives'].append(simulation.game.lives)
+        scalar['aliens'].append(len(simulation.game.aliens_group))
+
+    batch = BatchSimulation(320, seed=1)
+    rng = np.random.default_rng(2)
+    for _ in range(TICKS):
+        batch.step(rng.random((batch.n, 3)) < 0.5)
+    vector = {'score': batch.score, 'lives': batch.lives, 'aliens': batch.alive.sum(axis=(1, 2))}
+
+    assert statistics.fmean(scalar['score']) > 0
+    for name in scalar:
+        scalar_mean, scalar_error = summary(scalar[name])
+        batch_mean, batch_error = summary(vector[name])
+        # Different random sequences, so only the distributions can be compared.
+        assert abs(scalar_mean - batch_mean) < 4 * (scalar_error ** 2 + batch_error ** 2) ** 0.5, name
+
+
+def bunker_cells(game):
+    """Returns the cells of every bunker of a scalar game as a boolean array."""
+    cells = []
+    for obstacle in game.obstacles:
+        columns, rows = obstacle.cells.get_size()
+        cells.append([[bool(obstacle.cells.get_at((column, row))) for column in range(columns)]
+                      for row in range(rows)])
+    return np.array(cells)
+
+
+def test_formation_at_bunker_height_erodes_bunkers_like_scalar_game():
+    bunker_y = DEFAULT_CONFIG.screen_height - DEFAULT_CONFIG.bunker_height
+    # The last row starts on the bunkers, and the aliens never fire so the run is deterministic.
+    start_y = bunker_y - (DEFAULT_CONFIG.formation_rows - 1) * DEFAULT_CONFIG.formation_spacing
+    waves = (Wave(start_y, 1, 3, 10**6, 10**6),)
+    batch = BatchSimulation(2, seed=0, waves=waves)
+    game = Game(rng=random.Random(0), audio=False, highscore_file=None, quiet=True, waves=waves)
+    for tick in range(1, 401):
+        batch.step(np.zeros((batch.n, 3), bool))
+        game.update(Inputs.NONE)
+        if tick % 50 == 0:
+            assert (batch.cells[0] == bunker_cells(game)).all(), tick
+    assert not batch.cells.any()
+
+
+def test_narrow_screen_formation_reaching_bunkers():
+    batch = BatchSimulation(8, seed=0, config=DEFAULT_CONFIG._replace(screen_width=100))
+    rng = np.random.default_rng(0)
+    for _ in range(1000):
+        batch.step(rng.random((batch.n, 3)) < 0.5)
+    assert (batch.origin_y + batch.rows * batch.spacing > batch.bunker_y).all()
+
+
+def test_game_without_bunkers_ends_when_aliens_reach_the_spaceship():
+    settings = DEFAULT_CONFIG._replace(bunker_count=0)
+    bunker_y = settings.screen_height - settings.bunker_height
+    waves = (Wave(bunker_y - (settings.formation_rows - 1) * settings.formation_spacing, 1, 3, 10**6, 10**6),)
+    batch = BatchSimulation(2, seed=0, config=settings, waves=waves)
+    game = Game(settings, rng=random.Random(0), audio=False, highscore_file=None, quiet=True, waves=waves)
+    while game.run and game.ticks < 5000:
+        game.update(Inputs.NONE)
+        batch.step(np.zeros((batch.n, 3), bool))
+        assert batch.run[0] == game.run, game.ticks
+    assert not game.run
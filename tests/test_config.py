@@ -0,0 +1,43 @@
+import argparse
+
+import pytest
+
+import config
+from config import DEFAULT_CONFIG
+
+
+@pytest.mark.parametrize('values', [
+    {'formation_rows': 0},
+    {'formation_columns': -1},
+    {'block_size': 0},
+    {'laser_speed': 0},
+    {'offset': -1},
+    {'lives': 128},
+    {'bunker_grid': [[0, 2]]},
+    {'bunker_grid': [[True]]},
+    {'bunker_grid': [[]]},
+    {'bunker_grid': [[1, 0], [1]]},
+    {'lives': 2.5},
+    {'lives': True},
+    {'speed': 3},
+])
+def test_override_rejects_invalid_values(values):
+    with pytest.raises(ValueError):
+        config.override(DEFAULT_CONFIG, values)
+
+
+def test_override_accepts_edge_values():
+    settings = config.override(DEFAULT_CONFIG, {
+        'offset': 0, 'bunker_count': 0, 'lives': 127, 'laser_speed': 300, 'bunker_grid': [[1, 0], [0, 1]]})
+    assert settings.bunker_grid == ((1, 0), (0, 1))
+    assert config.loads(config.dumps(settings)) == settings
+
+
+def test_from_args_reports_a_parser_error(capsys):
+    parser = argparse.ArgumentParser(prog='game')
+    config.add_arguments(parser)
+    args = parser.parse_args(['--set', 'formation_rows=0'])
+    with pytest.raises(SystemExit) as exit_info:
+        config.from_args(parser, args)
+    assert exit_info.value.code == 2
+    assert 'formation_rows must be at least 1' in capsys.readouterr().err
@@ -0,0 +1,34 @@
+import numpy as np
+import pygame
+
+from env import SpaceInvadersEnv
+from renderer import Renderer
+
+
+def true_frame(env):
+    """Returns the frame of an environment's game drawn from scratch on a fresh surface."""
+    screen = pygame.Surface(env.screen.get_size())
+    renderer = Renderer(screen, env.simulation.game.offset, env.simulation.game.config.font_size)
+    renderer.draw(env.simulation.game)
+    return pygame.surfarray.array3d(screen).transpose(1, 0, 2)
+
+
+def test_two_pixel_envs_keep_their_own_frames():
+    first = SpaceInvadersEnv(seed=1, observation='pixels', downsample=1)
+    second = SpaceInvadersEnv(seed=2, observation='pixels', downsample=1)
+    first.reset()
+    second.reset()
+    for step in range(50):
+        first_observation = first.step(step % 8)[0]
+        second_observation = second.step(7 - step % 8)[0]
+    assert first.screen is not second.screen
+    assert np.array_equal(first_observation, true_frame(first))
+    assert np.array_equal(second_observation, true_frame(second))
+
+
+def test_feature_observation_shape():
+    env = SpaceInvadersEnv(seed=0)
+    observation, info = env.reset()
+    assert observation.shape == env.observation_shape
+    observation, reward, terminated, truncated, info = env.step(5)
+    assert observation.dtype == np.float32 and not terminated and info['ticks'] == 1
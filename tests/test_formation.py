@@ -0,0 +1,43 @@
+import random
+
+from game import Game
+
+
+def create_game():
+    return Game(rng=random.Random(0), audio=False, highscore_file=None, quiet=True)
+
+
+def move_to_right_edge(game):
+    """Moves the aliens until they turn at the right edge, returns where the formation origin turned."""
+    while game.aliens_direction == 1:
+        game.move_aliens()
+    return game.formation.x
+
+
+def test_formation_moves_down_once_at_the_edge():
+    game = create_game()
+    formation = game.formation
+    y = formation.y
+    move_to_right_edge(game)
+    assert formation.y == y + 2
+    assert formation.right >= game.screen_width + game.offset
+
+    # Leaving the edge does not move the formation down again.
+    for _ in range(5):
+        game.move_aliens()
+    assert formation.y == y + 2
+    assert game.aliens_direction == -1
+
+    formation.sync()
+    for alien in game.aliens_group:
+        assert alien.rect.topleft == (formation.x + alien.column * formation.spacing,
+                                      formation.y + alien.row * formation.spacing)
+
+
+def test_killing_the_outer_column_moves_the_edge():
+    turn = move_to_right_edge(create_game())
+    game = create_game()
+    formation = game.formation
+    for row in range(formation.rows):
+        formation.aliens[row][formation.columns - 1].kill()
+    assert move_to_right_edge(game) >= turn + formation.spacing
@@ -0,0 +1,45 @@
+import pygame
+
+from laser import LaserPool
+
+
+def fire(pool, group, count, speed=5):
+    for index in range(count):
+        group.add(pool.acquire((10 * index, 300), speed, 600))
+
+
+def test_pool_recycles_killed_lasers():
+    pool = LaserPool()
+    group = pygame.sprite.Group()
+    fire(pool, group, 3)
+    assert pool.stats() == {'hits': 0, 'misses': 3, 'live': 3, 'idle': 0}
+
+    laser = group.sprites()[0]
+    laser.kill()
+    # Killing a laser twice, e.g. hitting two targets on the same frame, releases it once.
+    laser.kill()
+    assert pool.stats() == {'hits': 0, 'misses': 3, 'live': 2, 'idle': 1}
+
+    recycled = pool.acquire((50, 100), -6, 600)
+    assert recycled is laser
+    assert recycled.rect.center == (50, 100) and recycled.speed == -6
+    assert pool.stats() == {'hits': 1, 'misses': 3, 'live': 3, 'idle': 0}
+
+
+def test_pool_keeps_at_most_its_capacity():
+    pool = LaserPool(capacity=2)
+    group = pygame.sprite.Group()
+    fire(pool, group, 5)
+    pool.release_group(group)
+    assert not group
+    assert pool.stats() == {'hits': 0, 'misses': 5, 'live': 0, 'idle': 2}
+
+
+def test_lasers_leaving_the_screen_return_to_the_pool():
+    pool = LaserPool()
+    group = pygame.sprite.Group()
+    fire(pool, group, 2, speed=200)
+    group.update()
+    group.update()
+    assert not group
+    assert pool.stats()['idle'] == 2
@@ -0,0 +1,54 @@
+import pygame
+
+from obstacle import BLOCK_COLOR, BLOCK_SIZE, Obstacle
+
+
+def test_collide_mask_ignores_transparent_pixels():
+    obstacle = Obstacle(0, 0)
+    # Column 3 of the pattern is a hole in the first row and a cell in the second.
+    rect = pygame.Rect(3 * BLOCK_SIZE, 0, BLOCK_SIZE, 2 * BLOCK_SIZE)
+    top_half = pygame.mask.Mask(rect.size)
+    top_half.draw(pygame.mask.Mask((BLOCK_SIZE, BLOCK_SIZE), fill=True), (0, 0))
+    cells = obstacle.cells.count()
+
+    assert not obstacle.collide_mask(top_half, rect)
+    assert obstacle.cells.count() == cells
+    assert obstacle.version == 0
+    assert obstacle.collide_mask(pygame.mask.Mask(rect.size, fill=True), rect)
+    assert not obstacle.cells.get_at((3, 1))
+
+
+def test_collide_mask_erodes_only_the_cells_under_opaque_pixels():
+    obstacle = Obstacle(0, 0)
+    shape = pygame.mask.Mask((1, 5), fill=True)
+    rect = shape.get_rect(topleft=(4 * BLOCK_SIZE + 1, 5 * BLOCK_SIZE))
+    cells = obstacle.cells.count()
+
+    assert obstacle.collide_mask(shape, rect)
+    assert obstacle.cells.count() == cells - 2
+    assert not obstacle.cells.get_at((4, 5))
+    assert not obstacle.cells.get_at((4, 6))
+    assert obstacle.cells.get_at((3, 5)) and obstacle.cells.get_at((5, 5))
+    # The same pixels find nothing left to erode.
+    assert not obstacle.collide_mask(shape, rect)
+
+    obstacle.reset()
+    assert obstacle.cells.count() == cells
+
+
+def test_image_draws_the_intact_cells():
+    obstacle = Obstacle(10, 20, pattern=((1, 0), (1, 1)), block_size=2)
+    assert obstacle.rect == pygame.Rect(10, 20, 4, 4)
+    assert obstacle.cells.count() == 3
+
+    surface = pygame.Surface((20, 30))
+    obstacle.draw(surface)
+    assert surface.get_at((10, 20)) == BLOCK_COLOR
+    assert surface.get_at((13, 21)) == (0, 0, 0)
+
+    # A cell eroded after drawing once disappears from the next image.
+    obstacle.collide_mask(pygame.mask.Mask((1, 1), fill=True), pygame.Rect(11, 23, 1, 1))
+    surface.fill((0, 0, 0))
+    obstacle.draw(surface)
+    assert surface.get_at((10, 22)) == (0, 0, 0)
+    assert surface.get_at((10, 20)) == BLOCK_COLOR
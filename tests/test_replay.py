@@ -0,0 +1,22 @@
+import random
+
+import pytest
+
+import replay
+from game import Game
+
+
+def test_replay_verify_passes_on_recorded_log(tmp_path, random_inputs):
+    path = str(tmp_path / 'game.sirl')
+    game = Game(rng=random.Random(5), audio=False, highscore_file=None, quiet=True)
+    recorder = replay.Recorder(path, 5)
+    for inputs in random_inputs(6, 800):
+        frame = replay.encode_frame(inputs)
+        recorder.record(frame)
+        game.update(replay.apply_frame(game, frame))
+    recorder.close(game)
+
+    assert replay.verify(path) == (True, game.score, game.score)
+    with pytest.raises(SystemExit) as exit_info:
+        replay.main([str(tmp_path)])
+    assert exit_info.value.code == 0
@@ -0,0 +1,30 @@
+import os
+
+import runner
+from policies import resolve_policy
+
+_episodes = [0]
+
+
+def crash_on_third_episode(rng):
+    """Policy factory that kills its worker, without any cleanup, when the third episode starts."""
+    _episodes[0] += 1
+    if _episodes[0] == 3:
+        os._exit(3)
+    return resolve_policy('random')(rng)
+
+
+def test_results_arrive_with_distinct_seeds():
+    results = list(runner.run_episodes(6, workers=2, max_ticks=50))
+    assert sorted((result.worker, result.episode) for result in results) == [
+        (worker, episode) for worker in range(2) for episode in range(3)]
+    assert len({result.seed for result in results}) == 6
+    assert runner.summarize(results)['episodes'] == 6
+
+
+def test_crashed_worker_keeps_finished_episodes():
+    failures = []
+    results = list(runner.run_episodes(6, workers=2, policy='test_runner:crash_on_third_episode', max_ticks=50,
+                                       failures=failures))
+    assert sorted((result.worker, result.episode) for result in results) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert sorted(failures) == [(0, 3), (1, 3)]
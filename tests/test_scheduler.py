@@ -0,0 +1,58 @@
+from scheduler import Scheduler
+
+
+def recording_scheduler(*names):
+    """Returns a scheduler with handlers for the names, and the list they append their name to."""
+    scheduler = Scheduler()
+    calls = []
+    for name in names:
+        scheduler.register(name, lambda name=name: calls.append((scheduler.tick, name)))
+    return scheduler, calls
+
+
+def test_events_run_by_due_tick_then_scheduling_order():
+    scheduler, calls = recording_scheduler('a', 'b', 'c')
+    scheduler.schedule('b', 3)
+    scheduler.schedule('c', 2)
+    scheduler.schedule('a', 3)
+    scheduler.schedule('c', 0)  # Runs on the next tick at the earliest.
+
+    scheduler.advance(0)
+    assert calls == []
+    # Jumping several ticks at once runs the missed events in due order.
+    scheduler.advance(5)
+    assert calls == [(5, 'c'), (5, 'c'), (5, 'b'), (5, 'a')]
+
+
+def test_repeating_event_and_cancel():
+    scheduler, calls = recording_scheduler('shoot', 'stop')
+    scheduler.register('stop', lambda: scheduler.cancel('shoot'))
+    scheduler.schedule('shoot', 2, interval=3)
+    scheduler.schedule('stop', 9)
+    for tick in range(1, 15):
+        scheduler.advance(tick)
+
+    assert calls == [(2, 'shoot'), (5, 'shoot'), (8, 'shoot')]
+    assert scheduler.pending() == []
+
+
+def test_handler_can_cancel_its_own_repeating_event():
+    scheduler, calls = recording_scheduler()
+    scheduler.register('once', lambda: (calls.append(scheduler.tick), scheduler.cancel('once')))
+    scheduler.schedule('once', 1, interval=1)
+    for tick in range(1, 4):
+        scheduler.advance(tick)
+    assert calls == [1]
+
+
+def test_restore_keeps_the_pending_events():
+    scheduler, _ = recording_scheduler('a', 'b')
+    scheduler.schedule('a', 4, interval=2)
+    scheduler.schedule('b', 1)
+    scheduler.advance(1)
+    other, calls = recording_scheduler('a', 'b')
+    other.restore(scheduler.tick, scheduler.pending())
+
+    assert other.pending() == [(4, 'a', 2)]
+    other.advance(7)
+    assert calls == [(7, 'a'), (7, 'a')]
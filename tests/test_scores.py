@@ -0,0 +1,58 @@
+import json
+
+import scores
+from scores import ScoreEntry, ScoreStore
+
+
+def test_submit_ranks_and_saves_in_the_background(tmp_path):
+    path = tmp_path / 'highscores.json'
+    store = ScoreStore(str(path), size=2, interval=0.01)
+    assert store.submit(100, 'ann', 12.345, date='d1') == 0
+    assert store.submit(300, 'bob', 20, date='d2') == 0
+    assert store.submit(50, 'cid', 5, date='d3') is None
+    assert store.best == 300
+    store.close()
+
+    assert json.loads(path.read_text()) == [
+        {'score': 300, 'name': 'bob', 'date': 'd2', 'duration': 20},
+        {'score': 100, 'name': 'ann', 'date': 'd1', 'duration': 12.35},
+    ]
+    # The file is replaced, no temporary file is left next to it.
+    assert [file.name for file in tmp_path.iterdir()] == ['highscores.json']
+    assert ScoreStore(str(path)).entries == [ScoreEntry(300, 'bob', 'd2', 20), ScoreEntry(100, 'ann', 'd1', 12.35)]
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / 'highscores.json'
+    path.write_text('[{"score": 10, "name": "ann", "date": "", "duration": 1.0}]')
+    store = ScoreStore(str(path))
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(scores.json, 'dump', fail)
+    store.submit(20, 'bob', 2)
+    store.close()
+
+    assert json.loads(path.read_text())[0]['score'] == 10
+    assert [file.name for file in tmp_path.iterdir()] == ['highscores.json']
+
+
+def test_legacy_highscore_is_imported(tmp_path):
+    (tmp_path / scores.LEGACY_FILE).write_text('1234\n')
+    path = tmp_path / 'highscores.json'
+    store = ScoreStore(str(path))
+    assert store.entries == [ScoreEntry(1234, '???', '', 0.0)]
+    store.close()
+
+    assert json.loads(path.read_text())[0]['score'] == 1234
+
+
+def test_corrupt_file_gives_an_empty_leaderboard(tmp_path, capsys):
+    path = tmp_path / 'highscores.json'
+    path.write_text('{not json')
+    store = ScoreStore(str(path))
+    assert store.entries == [] and store.best == 0
+    assert 'Could not read the scores' in capsys.readouterr().out
+    store.close()
+    # Nothing changed, so the corrupt file is left for inspection.
+    assert path.read_text() == '{not json'
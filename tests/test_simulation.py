@@ -0,0 +1,44 @@
+import pytest
+
+import replay
+from simulation import FRAME_MS, Simulation
+from spaceship import Inputs
+
+
+def test_step_plays_whole_frames_and_carries_the_rest():
+    sim = Simulation(seed=1)
+    for _ in range(60):
+        sim.step()
+    assert sim.tick == 60
+
+    sim.step(dt=FRAME_MS / 3)
+    sim.step(dt=FRAME_MS / 3)
+    assert sim.tick == 60
+    sim.step(dt=FRAME_MS / 3)
+    assert sim.tick == 61
+    sim.step(dt=2.5 * FRAME_MS)
+    sim.step(dt=FRAME_MS / 2)
+    assert sim.tick == 64
+
+    with pytest.raises(ValueError):
+        sim.step(dt=-1)
+
+
+def test_long_step_matches_single_frames():
+    inputs = Inputs(left=False, right=True, fire=True)
+    frames = Simulation(seed=3)
+    for _ in range(120):
+        frames.step(inputs)
+    duration = Simulation(seed=3)
+    duration.step(inputs, dt=120 * FRAME_MS)
+    assert duration.tick == 120
+    assert replay.state_hash(duration.game) == replay.state_hash(frames.game)
+
+
+def test_update_without_inputs_presses_nothing():
+    idle = Simulation(seed=4)
+    released = Simulation(seed=4)
+    while idle.game.run:
+        idle.game.update()
+        released.game.update(Inputs.NONE)
+    assert replay.state_hash(idle.game) == replay.state_hash(released.game)
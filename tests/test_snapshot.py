@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+import replay
+import snapshot
+from config import DEFAULT_CONFIG
+from game import Game
+from simulation import Simulation
+
+
+def played_game(settings=DEFAULT_CONFIG, ticks=300, seed=1, inputs=None):
+    """Returns a headless game played for a while, with lasers in flight and eroded bunkers."""
+    game = Game(settings, rng=random.Random(seed), audio=False, highscore_file=None, quiet=True)
+    for frame in inputs or ():
+        game.update(frame)
+    return game
+
+
+def test_snapshot_restore_step_gives_same_state(random_inputs):
+    simulation = Simulation(seed=7)
+    for inputs in random_inputs(8, 400):
+        simulation.step(inputs)
+    data = simulation.snapshot()
+    later = random_inputs(9, 400)
+
+    for inputs in later:
+        simulation.step(inputs)
+    expected = replay.state_hash(simulation.game), simulation.game.score
+
+    simulation.restore(data)
+    for inputs in later:
+        simulation.step(inputs)
+    assert (replay.state_hash(simulation.game), simulation.game.score) == expected
+
+    # A fresh simulation with the same layout continues the same way.
+    other = Simulation(seed=0)
+    other.restore(data)
+    for inputs in later:
+        other.step(inputs)
+    assert (replay.state_hash(other.game), other.game.score) == expected
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data: data[:-1],
+    lambda data: data[:snapshot.HEADER.size + 3],
+    lambda data: data[:10],
+    lambda data: data + b'\0',
+])
+def test_rejected_snapshot_leaves_game_untouched(random_inputs, corrupt):
+    data = played_game(inputs=random_inputs(2, 300)).snapshot()
+    game = played_game(inputs=random_inputs(3, 200))
+    before = replay.state_hash(game)
+    with pytest.raises(ValueError):
+        game.restore(corrupt(data))
+    assert replay.state_hash(game) == before
+
+
+def test_snapshot_of_other_bunker_grid_is_rejected(random_inputs):
+    other = DEFAULT_CONFIG._replace(bunker_grid=((1, 1, 1), (1, 0, 1)))
+    data = played_game(other, inputs=random_inputs(2, 100)).snapshot()
+    game = played_game(inputs=random_inputs(3, 100))
+    before = replay.state_hash(game)
+    with pytest.raises(ValueError, match='different layout'):
+        game.restore(data)
+    assert replay.state_hash(game) == before
+
+
+def test_fast_lasers_survive_a_snapshot(random_inputs):
+    settings = DEFAULT_CONFIG._replace(laser_speed=300, alien_laser_speed=200, mystery_ship_speed=150)
+    game = played_game(settings)
+    for frame in random_inputs(4, 500, fire=0.9):
+        game.update(frame)
+        if game.spaceship_group.sprite.lasers_group and game.alien_lasers_group:
+            break
+    assert game.spaceship_group.sprite.lasers_group and game.alien_lasers_group
+    data = game.snapshot()
+    copy = played_game(settings)
+    copy.restore(data)
+    assert replay.state_hash(copy) == replay.state_hash(game)
+
+
+def test_save_replaces_the_file(tmp_path, random_inputs):
+    path = tmp_path / 'game.sav'
+    path.write_bytes(b'an older save')
+    game = played_game(inputs=random_inputs(5, 200))
+    snapshot.save(game, str(path))
+    assert path.read_bytes() == game.snapshot()
+    assert [entry.name for entry in tmp_path.iterdir()] == ['game.sav']
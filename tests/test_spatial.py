@@ -0,0 +1,52 @@
+import random
+
+import pygame
+import pytest
+
+import replay
+from config import DEFAULT_CONFIG
+from game import Game
+from spatial import SpatialGrid
+from waves import Wave
+
+
+def play_both(settings, inputs, waves=None, seed=3):
+    """Plays the same inputs with and without the spatial index, checking the states match along the way."""
+    options = dict(audio=False, highscore_file=None, quiet=True)
+    if waves is not None:
+        options['waves'] = waves
+    indexed = Game(settings, use_spatial_index=True, rng=random.Random(seed), **options)
+    brute = Game(settings, use_spatial_index=False, rng=random.Random(seed), **options)
+    for tick, frame in enumerate(inputs):
+        indexed.update(frame)
+        brute.update(frame)
+        if tick % 50 == 0:
+            assert replay.state_hash(indexed) == replay.state_hash(brute), tick
+    assert (indexed.score, indexed.lives, indexed.run) == (brute.score, brute.lives, brute.run)
+    assert replay.state_hash(indexed) == replay.state_hash(brute)
+    return indexed
+
+
+def test_spatial_index_matches_brute_force(random_inputs):
+    game = play_both(DEFAULT_CONFIG, random_inputs(4, 1500))
+    assert game.score > 0
+
+
+@pytest.mark.parametrize('bunker_count', [0, 4])
+def test_spatial_index_matches_brute_force_among_the_bunkers(random_inputs, bunker_count):
+    # The formation starts down among the bunkers, and a short laser delay keeps many lasers in flight.
+    settings = DEFAULT_CONFIG._replace(laser_delay=2, lives=20, bunker_count=bunker_count)
+    bunker_y = settings.screen_height - settings.bunker_height
+    start_y = bunker_y - (settings.formation_rows - 1) * settings.formation_spacing - 20
+    game = play_both(settings, random_inputs(5, 600, fire=0.8), waves=(Wave(start_y, 1, 3, 6, 3),))
+    assert game.kills
+
+
+def test_spatial_grid_returns_candidates_in_insertion_order():
+    grid = SpatialGrid(cell_size=10)
+    items = ['a', 'b', 'c']
+    for item, rect in zip(items, [(25, 0, 30, 5), (0, 0, 5, 5), (12, 0, 5, 5)]):
+        grid.insert(item, pygame.Rect(rect))
+    assert grid.query(pygame.Rect(0, 0, 60, 5)) == items
+    assert grid.query(pygame.Rect(20, 0, 5, 5)) == ['a']
+    assert grid.query(pygame.Rect(100, 100, 5, 5)) == []
@@ -0,0 +1,67 @@
+import asyncio
+import random
+import threading
+import time
+
+import telemetry
+from game import Game
+from spaceship import Inputs
+
+
+def create_game(seed=0):
+    return Game(rng=random.Random(seed), audio=False, highscore_file=None, quiet=True)
+
+
+def test_encode_decode_round_trip():
+    game = create_game()
+    rng = random.Random(1)
+    for _ in range(300):
+        game.update(Inputs(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.3))
+    state = telemetry.decode(telemetry.encode(game))
+    assert (state.tick, state.score, state.lives) == (game.ticks, game.score, game.lives)
+    assert state.alive == [list(row) for row in game.formation.alive]
+    assert len(state.player_lasers) == len(game.spaceship_group.sprite.lasers_group)
+
+
+def test_headless_client_receives_published_states():
+    server = telemetry.TelemetryServer(port=0, keyframe_interval=20)
+    server.start()
+    received = []
+
+    async def watch():
+        async for state, _ in telemetry.receive(port=server.port):
+            received.append(state)
+            if len(received) == 100:
+                return
+
+    client = threading.Thread(target=asyncio.run, args=(watch(),), daemon=True)
+    client.start()
+    game = create_game()
+    rng = random.Random(2)
+    expected = {}
+    try:
+        # Keep playing until the client, which joins at the next keyframe, has seen enough states.
+        while client.is_alive() and game.ticks < 2000:
+            game.update(Inputs(rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.3))
+            server.publish(game)
+            expected[game.ticks] = telemetry.decode(telemetry.encode(game))
+            time.sleep(0.002)
+        client.join(10)
+    finally:
+        server.close()
+    assert len(received) == 100
+    assert all(state == expected[state.tick] for state in received)
+
+
+def test_close_returns_when_server_process_died():
+    server = telemetry.TelemetryServer(port=0, backlog=8)
+    server.start()
+    server._process.kill()
+    server._process.wait()
+    game = create_game()
+    for _ in range(200):
+        game.update(Inputs.NONE)
+        server.publish(game)
+    start = time.monotonic()
+    server.close()
+    assert time.monotonic() - start < 5
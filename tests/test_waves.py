@@ -0,0 +1,45 @@
+import random
+
+import pygame
+
+from game import Game
+from spaceship import Inputs
+from waves import WAVES, get_wave, scale
+
+
+def test_scale_reaches_the_limit_with_the_last_alien():
+    assert [scale(1, 3, killed) for killed in (0, 0.3, 0.5, 0.7, 1)] == [1, 1, 2, 3, 3]
+    assert [scale(18, 8, killed) for killed in (0, 0.5, 54 / 55)] == [18, 13, 8]
+    assert get_wave(WAVES, 1) == WAVES[0]
+    assert get_wave(WAVES, 99) == WAVES[-1]
+
+
+def test_difficulty_follows_the_killed_share():
+    game = Game(rng=random.Random(0), audio=False, highscore_file=None, quiet=True)
+    wave = WAVES[0]
+    assert (game.alien_speed(), game.alien_shot_interval()) == (wave.speed, wave.shot_interval)
+    aliens = game.aliens_group.sprites()
+    for alien in aliens[1:]:
+        alien.kill()
+    assert (game.alien_speed(), game.alien_shot_interval()) == (wave.max_speed, wave.min_shot_interval)
+
+
+def test_next_wave_reuses_the_aliens_and_bunkers():
+    game = Game(rng=random.Random(0), audio=False, highscore_file=None, quiet=True)
+    aliens = game.aliens_group.sprites()
+    obstacles = list(game.obstacles)
+    cells = obstacles[0].cells.count()
+    assert obstacles[0].collide_mask(pygame.mask.Mask((9, 9), fill=True), obstacles[0].rect.move(0, 12))
+    game.alien_lasers_group.add(game.laser_pool.acquire((100, 100), -6, game.screen_height))
+    game.score = 700
+    for alien in aliens:
+        alien.kill()
+
+    game.update(Inputs.NONE)
+    assert game.wave == 2
+    assert game.score == 700
+    assert game.aliens_group.sprites() == aliens
+    assert game.obstacles == obstacles and obstacles[0].cells.count() == cells
+    assert not game.alien_lasers_group and game.laser_pool.live == 0
+    assert game.formation.y == WAVES[1].start_y
+    assert (game.alien_speed(), game.alien_shot_interval()) == (WAVES[1].speed, WAVES[1].shot_interval)
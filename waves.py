@@ -0,0 +1,57 @@
+from collections import namedtuple
+
+Wave = namedtuple('Wave', 'start_y speed max_speed shot_interval min_shot_interval')
+Wave.__doc__ = """
+The difficulty of a wave of aliens.
+
+The formation speeds up and fires faster as it thins out: the speed and the
+shot interval move from their starting value to their limit in equal steps
+as the share of killed aliens grows.
+
+Attributes:
+    start_y (int): The y-coordinate the formation starts at.
+    speed (int): Pixels the full formation moves per tick.
+    max_speed (int): Pixels the last aliens move per tick.
+    shot_interval (int): Ticks between two alien shots of the full formation.
+    min_shot_interval (int): Ticks between two shots of the last aliens.
+"""
+
+# Every wave starts lower than the previous one, the last definition is used for every later wave.
+WAVES = (
+    Wave(110, 1, 3, 18, 8),
+    Wave(130, 1, 3, 16, 7),
+    Wave(150, 2, 4, 14, 6),
+    Wave(170, 2, 4, 12, 5),
+    Wave(190, 2, 5, 10, 4),
+)
+
+
+def get_wave(waves, number):
+    """
+    Returns the definition of a wave.
+
+    Args:
+        waves (tuple): The wave definitions, the first one is wave 1.
+        number (int): The wave number, starting at 1.
+
+    Returns:
+        Wave: The definition, the last one for numbers past the end.
+    """
+    return waves[min(number, len(waves)) - 1]
+
+
+def scale(start, limit, killed):
+    """
+    Moves a value from its start to its limit in equal steps as the formation thins out.
+
+    Args:
+        start (int): The value for the full formation.
+        limit (int): The value reached when the last alien is left.
+        killed (float): Share of killed aliens, from 0 to 1.
+
+    Returns:
+        int: The scaled value.
+    """
+    steps = abs(limit - start)
+    step = min(int((steps + 1) * killed), steps)
+    return start + step if limit >= start else start - step